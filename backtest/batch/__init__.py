@@ -1,4 +1,4 @@
-from .runner import run_scan_day, run_scan_range
+from .runner import iter_scan_range, run_scan_day, run_scan_range
 from .scheduler import trading_days
 
-__all__ = ["trading_days", "run_scan_range", "run_scan_day"]
+__all__ = ["trading_days", "run_scan_range", "run_scan_day", "iter_scan_range"]
@@ -1,13 +1,50 @@
 from __future__ import annotations
 
+import json
+import operator
+import os
+from functools import reduce
 from pathlib import Path
+from typing import Iterable, List, Set
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 from backtest.logging_conf import get_logger
 
 logger = get_logger("output_writer")
 
+SIGNAL_COLUMNS = ["date", "symbol", "filter_code"]
+SIGNAL_FORMATS = ("csv", "parquet", "both")
+_SIGNAL_SCHEMA = pa.schema(
+    [
+        ("date", pa.date32()),
+        ("symbol", pa.dictionary(pa.int32(), pa.string())),
+        ("filter_code", pa.dictionary(pa.int32(), pa.string())),
+    ]
+)
+# Taranan günler (isabetsiz günler dahil) bölüm dosyasının şema metadatasında
+_DAYS_KEY = b"scanned_days"
+
+
+def stored_signal_days(path: str | Path) -> Set[str]:
+    """Return the ``YYYY-MM-DD`` days a ``part-YYYYMM.parquet`` file covers.
+
+    Files written by :class:`SignalStore` record every scanned day, with or
+    without hits; for older files only the days that have rows are known.
+    Missing files cover no days.
+    """
+    path = Path(path)
+    if not path.exists():
+        return set()
+    meta = pq.read_schema(path).metadata or {}
+    if _DAYS_KEY in meta:
+        return set(json.loads(meta[_DAYS_KEY]))
+    dates = pq.read_table(path, columns=["date"]).column("date").to_pandas()
+    return {str(d) for d in pd.to_datetime(dates).dt.date.unique()}
+
 
 class OutputWriter:
     def __init__(self, out_dir: str | Path):
@@ -29,3 +66,146 @@ class OutputWriter:
         df.to_csv(p, index=False, encoding="utf-8")
         logger.info("wrote=%d path=%s", len(df), p)
         return p
+
+    def close(self) -> None:
+        """CSV dosyaları gün gün yazıldığından yapılacak iş yok."""
+
+
+class SignalStore:
+    """Month-partitioned Parquet signal dataset under ``<out_dir>/signals``.
+
+    ``write_day`` buffers rows per month; a month is written as one
+    ``part-YYYYMM.parquet`` file (``symbol``/``filter_code`` dictionary
+    encoded) when the next month starts or on :meth:`close`. Days written
+    again replace their previous rows, so re-running a range is idempotent.
+    The file also records which days were scanned (see
+    :func:`stored_signal_days`), so days without hits are told apart from
+    days never scanned.
+    With ``csv=True`` the legacy per-day CSV files are written as well.
+    """
+
+    def __init__(self, out_dir: str | Path, *, csv: bool = False):
+        self.root = Path(out_dir)
+        self.dir = self.root / "signals"
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._csv = OutputWriter(self.root) if csv else None
+        self._month: str | None = None
+        self._days: List[pd.Timestamp] = []
+        self._frames: List[pd.DataFrame] = []
+
+    def write_day(self, day, rows: list[tuple[str, str]]):
+        day = pd.to_datetime(day).normalize()
+        month = day.strftime("%Y%m")
+        if self._month is not None and month != self._month:
+            self.flush()
+        self._month = month
+        self._days.append(day)
+        if rows:
+            df = pd.DataFrame(rows, columns=["symbol", "filter_code"])
+            df.insert(0, "date", day)
+            self._frames.append(df)
+        if self._csv is not None:
+            self._csv.write_day(day, rows)
+        return self.dir / f"part-{month}.parquet"
+
+    def flush(self) -> Path | None:
+        if self._month is None:
+            return None
+        path = self.dir / f"part-{self._month}.parquet"
+        days = pd.DatetimeIndex(self._days)
+        frames = list(self._frames)
+        scanned = stored_signal_days(path) | {str(d.date()) for d in days}
+        if path.exists():
+            old = pq.read_table(path).to_pandas()
+            old["date"] = pd.to_datetime(old["date"])
+            old = old[~old["date"].isin(days)]
+            frames.insert(0, old.astype({"symbol": str, "filter_code": str}))
+        df = (
+            pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=SIGNAL_COLUMNS)
+        )
+        df = df.drop_duplicates(subset=SIGNAL_COLUMNS).sort_values(SIGNAL_COLUMNS, kind="mergesort")
+        table = pa.table(
+            {
+                "date": pa.array(pd.to_datetime(df["date"]).dt.date, type=pa.date32()),
+                "symbol": pa.array(df["symbol"].astype(str)).dictionary_encode(),
+                "filter_code": pa.array(df["filter_code"].astype(str)).dictionary_encode(),
+            },
+            schema=_SIGNAL_SCHEMA,
+        ).replace_schema_metadata({_DAYS_KEY: json.dumps(sorted(scanned))})
+        tmp = path.with_suffix(".parquet.tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, path)
+        logger.info("wrote=%d days=%d path=%s", len(df), len(days), path)
+        self._month, self._days, self._frames = None, [], []
+        return path
+
+    def close(self) -> None:
+        self.flush()
+
+
+def make_signal_writer(out_dir: str | Path, signal_format: str = "csv"):
+    """Return the writer for ``signal_format`` (``csv``, ``parquet`` or ``both``)."""
+    if signal_format not in SIGNAL_FORMATS:
+        raise ValueError(f"Bilinmeyen signal_format: {signal_format}")
+    if signal_format == "csv":
+        return OutputWriter(out_dir)
+    return SignalStore(out_dir, csv=signal_format == "both")
+
+
+def has_signal_store(out_dir: str | Path) -> bool:
+    return any((Path(out_dir) / "signals").glob("part-*.parquet"))
+
+
+def read_signals(
+    out_dir: str | Path,
+    start=None,
+    end=None,
+    filter_codes: Iterable[str] | None = None,
+    symbols: Iterable[str] | None = None,
+) -> pd.DataFrame:
+    """Read the signal store with date-range and filter pushdown.
+
+    Month files outside ``[start, end]`` are pruned by name; the remaining
+    predicates are pushed into the Parquet scan. ``symbol`` and
+    ``filter_code`` come back as categoricals, ``date`` as ``datetime64``.
+    """
+    root = Path(out_dir) / "signals"
+    start = pd.to_datetime(start).normalize() if start is not None else None
+    end = pd.to_datetime(end).normalize() if end is not None else None
+    files: List[str] = []
+    for p in sorted(root.glob("part-*.parquet")):
+        month = p.stem.split("-", 1)[1]
+        if start is not None and month < start.strftime("%Y%m"):
+            continue
+        if end is not None and month > end.strftime("%Y%m"):
+            continue
+        files.append(str(p))
+    if not files:
+        empty = pd.DataFrame(columns=SIGNAL_COLUMNS)
+        empty["date"] = pd.to_datetime(empty["date"])
+        return empty
+
+    preds = []
+    if start is not None:
+        preds.append(ds.field("date") >= pa.scalar(start.date(), type=pa.date32()))
+    if end is not None:
+        preds.append(ds.field("date") <= pa.scalar(end.date(), type=pa.date32()))
+    if filter_codes is not None:
+        preds.append(ds.field("filter_code").isin([str(c) for c in filter_codes]))
+    if symbols is not None:
+        preds.append(ds.field("symbol").isin([str(s) for s in symbols]))
+    expr = reduce(operator.and_, preds) if preds else None
+    table = ds.dataset(files, format="parquet", schema=_SIGNAL_SCHEMA).to_table(filter=expr)
+    df = table.to_pandas()
+    df["date"] = pd.to_datetime(df["date"])
+    return df.reset_index(drop=True)
+
+
+__all__ = [
+    "OutputWriter",
+    "SignalStore",
+    "make_signal_writer",
+    "has_signal_store",
+    "read_signals",
+    "stored_signal_days",
+]
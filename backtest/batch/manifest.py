@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+
+from backtest.filters.engine import compile_filter
+
+MANIFEST_NAME = "run_manifest.json"
+_VERSION = 2
+
+# Girdi kolonları: geriye bakış gerektirmez
+_BASE_COLUMNS = {"open", "high", "low", "close", "volume", "adj_close", "date", "symbol"}
+# Sabit pencereli göstergeler: değer yalnız son N barın fonksiyonudur
+_WINDOWED = {"sma", "wma", "bbm", "bbu", "bbl", "roc", "mom", "cci", "willr"}
+_PARAM_RE = re.compile(r"^([a-z]+)_(\d+)")
+
+
+def filter_lookback(expr: str) -> int | None:
+    """Return the trading days of history *expr* looks back on.
+
+    Fixed-window indicators (``sma_20`` …) contribute their window, cross
+    helpers one extra bar. ``None`` means unbounded: recursive indicators
+    (EMA, RSI, MACD, ADX …) and unknown series depend on the whole history.
+    """
+    try:
+        names = compile_filter(expr).names
+    except Exception:
+        return None
+    lookback = 0
+    shift = 0
+    for name in names:
+        if name in {"cross_up", "cross_down"}:
+            shift = 1  # önceki bar ile karşılaştırma
+            continue
+        if name in _BASE_COLUMNS:
+            continue
+        m = _PARAM_RE.match(name)
+        if m is None or m.group(1) not in _WINDOWED:
+            return None
+        lookback = max(lookback, int(m.group(2)))
+    return lookback + shift
+
+
+def filters_lookback(filters_df: pd.DataFrame) -> int | None:
+    out = 0
+    for expr in filters_df["PythonQuery"].astype(str):
+        lb = filter_lookback(expr)
+        if lb is None:
+            return None
+        out = max(out, lb)
+    return out
+
+
+def filters_hash(filters_df: pd.DataFrame, alias_csv: str | None = None) -> str:
+    """Hash of the filter set (codes + expressions) and the alias table."""
+    h = hashlib.sha1()
+    pairs = sorted(zip(filters_df["FilterCode"].astype(str), filters_df["PythonQuery"].astype(str)))
+    h.update(json.dumps(pairs, ensure_ascii=False).encode("utf-8"))
+    if alias_csv and Path(alias_csv).exists():
+        h.update(Path(alias_csv).read_bytes())
+    return h.hexdigest()
+
+
+def day_fingerprints(df: pd.DataFrame) -> Dict[str, str]:
+    """Return ``{YYYY-MM-DD: digest}`` over every input row of each day.
+
+    Row hashes are summed per day, so the digest does not depend on row
+    order; column names are mixed in so schema changes invalidate all days.
+    """
+    if df.empty:
+        return {}
+    dates = pd.DatetimeIndex(pd.to_datetime(df.index)).normalize()
+    row_hash = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    order = np.argsort(dates.asi8, kind="mergesort")
+    sorted_dates = dates.asi8[order]
+    starts = np.flatnonzero(np.r_[True, sorted_dates[1:] != sorted_dates[:-1]])
+    sums = np.add.reduceat(row_hash[order], starts)
+    counts = np.diff(np.r_[starts, len(order)])
+    cols = "|".join(map(str, df.columns)).encode("utf-8")
+    out: Dict[str, str] = {}
+    for ts, total, n in zip(sorted_dates[starts], sums, counts):
+        h = hashlib.sha1(cols)
+        h.update(int(total).to_bytes(8, "little"))
+        h.update(int(n).to_bytes(8, "little"))
+        out[str(pd.Timestamp(ts).date())] = h.hexdigest()[:16]
+    return out
+
+
+class RunManifest:
+    """``run_manifest.json`` of a scan-range output directory.
+
+    Records the filter-set hash, the per-symbol, per-day input fingerprints
+    the outputs were computed from and the days whose outputs were written.
+    """
+
+    def __init__(self, out_dir: str | Path):
+        self.path = Path(out_dir) / MANIFEST_NAME
+        self.filters_hash: str | None = None
+        self.inputs: Dict[str, Dict[str, str]] = {}
+        self.days: set[str] = set()
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == _VERSION:
+                self.filters_hash = data.get("filters_hash")
+                self.inputs = {s: dict(v) for s, v in data.get("inputs", {}).items()}
+                self.days = set(data.get("days", []))
+
+    def stale_days(
+        self,
+        days: pd.DatetimeIndex,
+        inputs: Dict[str, Dict[str, str]],
+        fhash: str,
+        lookback: int | None,
+        exists=None,
+    ) -> pd.DatetimeIndex:
+        """Return the subset of *days* whose outputs must be recomputed.
+
+        *inputs* maps each symbol to its ``{YYYY-MM-DD: digest}`` day
+        fingerprints. A day is stale if its output is missing, the filter
+        set changed, or some symbol had a bar added, changed or removed
+        within ``lookback`` of that symbol's own bars up to the day (any
+        earlier bar when ``lookback`` is ``None``).
+        """
+        if fhash != self.filters_hash:
+            return pd.DatetimeIndex(days)
+        calendars = []
+        for sym in set(inputs) | set(self.inputs):
+            new, old = inputs.get(sym, {}), self.inputs.get(sym, {})
+            axis = sorted(set(new) | set(old))
+            changed = [pos for pos, d in enumerate(axis) if new.get(d) != old.get(d)]
+            if changed:
+                calendars.append((axis, changed))
+        keep = []
+        for day in days:
+            key = str(pd.Timestamp(day).date())
+            if key not in self.days or (exists is not None and not exists(day)):
+                keep.append(day)
+                continue
+            for axis, changed in calendars:
+                hi = bisect_right(axis, key) - 1  # sembolün bu güne kadarki son barı
+                lo = 0 if lookback is None else hi - lookback
+                i = bisect_left(changed, lo)
+                if i < len(changed) and changed[i] <= hi:
+                    keep.append(day)
+                    break
+        return pd.DatetimeIndex(keep)
+
+    def update(
+        self,
+        inputs: Dict[str, Dict[str, str]],
+        fhash: str,
+        days: Iterable,
+        lookback: int | None = None,
+    ) -> None:
+        """Record *days* as written from *inputs*.
+
+        Previously written days outside this run that the new inputs make
+        stale are forgotten, so a later run recomputes them.
+        """
+        written = {str(pd.Timestamp(d).date()) for d in days}
+        if fhash != self.filters_hash:
+            self.days = set()
+        else:
+            others = pd.DatetimeIndex(sorted(self.days - written))
+            stale = self.stale_days(others, inputs, fhash, lookback)
+            self.days -= {str(d.date()) for d in stale}
+        self.filters_hash = fhash
+        self.inputs = {s: dict(v) for s, v in inputs.items()}
+        self.days |= written
+
+    def save(self) -> Path:
+        data = {
+            "version": _VERSION,
+            "filters_hash": self.filters_hash,
+            "inputs": self.inputs,
+            "days": sorted(self.days),
+        }
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        return self.path
+
+
+__all__ = [
+    "RunManifest",
+    "day_fingerprints",
+    "filters_hash",
+    "filter_lookback",
+    "filters_lookback",
+]
@@ -1,17 +1,29 @@
 from __future__ import annotations
 
+import os
 from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
 from time import perf_counter
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 
+import numpy as np
 import pandas as pd
 
-from backtest.batch.io import OutputWriter
+from backtest.batch.io import make_signal_writer, stored_signal_days
+from backtest.batch.manifest import (
+    RunManifest,
+    day_fingerprints,
+    filters_hash,
+    filters_lookback,
+)
 from backtest.batch.scheduler import trading_days
+from backtest.batch.shm import SharedPanel
 from backtest.filters.engine import evaluate
+from backtest.indicators.cache import IndicatorCache
 from backtest.indicators.precompute import (
     collect_required_indicators,
     precompute_for_chunk,
+    required_warmup,
 )
 from backtest.logging_conf import get_logger, log_with
 from backtest.normalize import normalize_dataframe
@@ -39,86 +51,268 @@ def _parse_symbol_columns(df: pd.DataFrame) -> Dict[str, List[str]]:
     return {sym: list(df.columns)}
 
 
-def _process_chunk(args):
-    df_chunk, filters_df, indicators, day, alias_csv = args
-    attrs = df_chunk.attrs
-    df_chunk, _ = normalize_dataframe(df_chunk, alias_csv, policy="prefer_first")  # noqa: E501
-    df_chunk.attrs.update(attrs)
-    df_chunk = precompute_for_chunk(df_chunk, indicators)
-    d = pd.to_datetime(day)
-    rows: List[Tuple[str, str]] = []
+def _split_symbols(df_chunk: pd.DataFrame):
+    """Yield raw ``(symbol, frame)`` pairs for long or wide (SYMBOL_field) data."""
     if "symbol" in df_chunk.columns:
         for sym, sub in df_chunk.groupby("symbol"):
-            sub = sub.drop(columns=["symbol"])
-            for i, r in enumerate(filters_df.itertuples(index=False)):
-                code = str(r.FilterCode).strip()
-                expr = str(r.PythonQuery).strip()
-                log_with(
-                    log,
-                    "DEBUG",
-                    "evaluate",
-                    expr=expr,
-                    chunk_idx=i,
-                    symbol=sym,
-                )
-                try:
-                    mask = evaluate(sub, expr)
-                except Exception as e:
-                    log.exception(
-                        "evaluate failed",
-                        extra={"extra_fields": {"expr": expr}},
-                    )
-                    raise ValueError(
-                        f"Filter evaluation failed: {expr} → {e}"
-                    ) from e
-                val = mask.loc[d]
-                ok = val.any() if isinstance(val, pd.Series) else bool(val)
-                if ok:
-                    rows.append((sym, code))
+            yield sym, sub.drop(columns=["symbol"])
     else:
         sym_cols = _parse_symbol_columns(df_chunk)
         for sym, cols in sym_cols.items():
             sub = df_chunk[cols].copy()
-            sub.columns = [
-                c.split("_", 1)[1] if c.startswith(f"{sym}_") else c for c in cols
-            ]
-            for i, r in enumerate(filters_df.itertuples(index=False)):
-                code = str(r.FilterCode).strip()
-                expr = str(r.PythonQuery).strip()
-                log_with(
-                    log,
-                    "DEBUG",
-                    "evaluate",
-                    expr=expr,
-                    chunk_idx=i,
-                    symbol=sym,
-                )
-                try:
-                    mask = evaluate(sub, expr)
-                except Exception as e:
-                    log.exception(
-                        "evaluate failed",
-                        extra={"extra_fields": {"expr": expr}},
-                    )
-                    raise ValueError(
-                        f"Filter evaluation failed: {expr} → {e}"
-                    ) from e  # noqa: E501
-                val = mask.loc[d]
-                ok = val.any() if isinstance(val, pd.Series) else bool(val)
-                if ok:
-                    rows.append((sym, code))
+            sub.columns = [c.split("_", 1)[1] if c.startswith(f"{sym}_") else c for c in cols]
+            yield sym, sub
+
+
+def _iter_symbol_frames(df_chunk: pd.DataFrame, indicators, alias_csv, cache=None):
+    """Yield ``(symbol, frame)`` pairs normalised and precomputed per symbol.
+
+    Splitting happens before normalisation so that ``SYMBOL_field`` prefixes
+    survive and rolling indicators never cross symbol boundaries.
+    """
+    for sym, sub in _split_symbols(df_chunk):
+        yield sym, _prepare_symbol(sub, indicators, alias_csv, cache, sym)
+
+
+def _prepare_symbol(
+    sub: pd.DataFrame, indicators, alias_csv, cache: IndicatorCache | None = None, symbol=None
+) -> pd.DataFrame:
+    attrs = sub.attrs
+    sub, _ = normalize_dataframe(sub, alias_csv, policy="prefer_first")
+    sub.attrs.update(attrs)
+    return precompute_for_chunk(sub, indicators, cache=cache, symbol=symbol)
+
+
+def _iter_masks(sub: pd.DataFrame, filters_df: pd.DataFrame, sym: str):
+    """Yield ``(filter_code, mask)`` for every filter evaluated on *sub*."""
+    for i, r in enumerate(filters_df.itertuples(index=False)):
+        code = str(r.FilterCode).strip()
+        expr = str(r.PythonQuery).strip()
+        log_with(
+            log,
+            "DEBUG",
+            "evaluate",
+            expr=expr,
+            chunk_idx=i,
+            symbol=sym,
+        )
+        try:
+            mask = evaluate(sub, expr)
+        except Exception as e:
+            log.exception(
+                "evaluate failed",
+                extra={"extra_fields": {"expr": expr}},
+            )
+            raise ValueError(f"Filter evaluation failed: {expr} → {e}") from e
+        yield code, mask
+
+
+def _process_chunk(args):
+    df_chunk, filters_df, indicators, day, alias_csv, *rest = args
+    cache = rest[0] if rest else None
+    d = pd.to_datetime(day)
+    rows: List[Tuple[str, str]] = []
+    for sym, sub in _iter_symbol_frames(df_chunk, indicators, alias_csv, cache):
+        for code, mask in _iter_masks(sub, filters_df, sym):
+            val = mask.loc[d]
+            ok = val.any() if isinstance(val, pd.Series) else bool(val)
+            if ok:
+                rows.append((sym, code))
+    return rows
+
+
+def _range_hits(symbol_frames, filters_df, days: pd.DatetimeIndex):
+    """Return ``(day_pos, symbol, filter_code)`` hits over *days*.
+
+    Every filter is evaluated once per symbol on its full history; the mask
+    is then aligned to *days* to emit all hits in one pass.
+    """
+    rows: List[Tuple[int, str, str]] = []
+    for sym, sub in symbol_frames:
+        for code, mask in _iter_masks(sub, filters_df, sym):
+            mask = mask.astype(bool)
+            if not mask.index.is_unique:
+                mask = mask.groupby(level=0).any()
+            hit = mask.reindex(days, fill_value=False).to_numpy()
+            rows.extend((int(pos), sym, code) for pos in hit.nonzero()[0])
     return rows
 
 
+def _process_chunk_range(args):
+    """Evaluate every filter once over the chunk history and return the hits
+    for all requested days as ``(day_pos, symbol, filter_code)`` tuples."""
+    df_chunk, filters_df, indicators, days, alias_csv, *rest = args
+    cache = rest[0] if rest else None
+    frames = _iter_symbol_frames(df_chunk, indicators, alias_csv, cache)
+    return _range_hits(frames, filters_df, pd.DatetimeIndex(days))
+
+
+# ---- persistent worker pool -------------------------------------------------------
+# Workers attach once to the shared panel in the pool initializer; tasks then
+# only carry ``(sym_lo, sym_hi, day_lo, day_hi)`` index ranges.
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(
+    spec, filters_df, indicators, alias_csv, days, cache_dir=None, cache_max_bytes=None
+) -> None:
+    _WORKER.update(
+        panel=SharedPanel.attach(spec),
+        cache=IndicatorCache(cache_dir, max_bytes=cache_max_bytes),
+        filters_df=filters_df,
+        indicators=indicators,
+        alias_csv=alias_csv,
+        days=pd.DatetimeIndex(days),
+    )
+
+
+def _run_panel_task(task):
+    sym_lo, sym_hi, day_lo, day_hi = task
+    t0 = perf_counter()
+    panel: SharedPanel = _WORKER["panel"]  # type: ignore[assignment]
+    indicators, alias_csv = _WORKER["indicators"], _WORKER["alias_csv"]
+    cache: IndicatorCache = _WORKER["cache"]  # type: ignore[assignment]
+    before = cache.hits, cache.misses
+    frames = (
+        (sym, _prepare_symbol(sub, indicators, alias_csv, cache, sym))
+        for sym, sub in panel.iter_symbols(sym_lo, sym_hi)
+    )
+    days = _WORKER["days"][day_lo:day_hi]  # type: ignore[index]
+    rows = [
+        (day_lo + pos, sym, code)
+        for pos, sym, code in _range_hits(frames, _WORKER["filters_df"], days)
+    ]
+    cache_delta = (cache.hits - before[0], cache.misses - before[1])
+    return os.getpid(), perf_counter() - t0, rows, cache_delta
+
+
+class _PanelPool:
+    """One process pool per run whose workers share a :class:`SharedPanel`."""
+
+    def __init__(self, df, filters_df, indicators, alias_csv, days, workers, chunk_size, cache):
+        t0 = perf_counter()
+        self.panel = SharedPanel.create(sorted(_split_symbols(df), key=lambda item: str(item[0])))
+        n_sym = len(self.panel.spec.symbols)
+        self.sym_ranges = [(lo, min(lo + chunk_size, n_sym)) for lo in range(0, n_sym, chunk_size)]
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                self.panel.spec,
+                filters_df,
+                indicators,
+                alias_csv,
+                days,
+                cache.cache_dir,
+                cache.max_bytes,
+            ),
+        )
+        self.stats: Dict[int, List[float]] = {}
+        self.cache = cache
+        log.info(
+            "POOL workers=%d chunk_size=%d symbols=%d panel_bytes=%d setup=%.3fs",
+            workers,
+            chunk_size,
+            n_sym,
+            self.panel.nbytes,
+            perf_counter() - t0,
+        )
+
+    def run(self, day_lo: int, day_hi: int) -> List[Tuple[int, str, str]]:
+        tasks = [(lo, hi, day_lo, day_hi) for lo, hi in self.sym_ranges]
+        rows: List[Tuple[int, str, str]] = []
+        for pid, elapsed, part, (hits, misses) in self.executor.map(_run_panel_task, tasks):
+            self.cache.hits += hits
+            self.cache.misses += misses
+            st = self.stats.setdefault(pid, [0, 0.0, 0])
+            st[0] += 1
+            st[1] += elapsed
+            st[2] += len(part)
+            rows.extend(part)
+        return rows
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.panel.close()
+        for pid, (n_tasks, busy, hits) in sorted(self.stats.items()):
+            log.info("WORKER pid=%d tasks=%d busy=%.3fs hits=%d", pid, n_tasks, busy, hits)
+
+
+def _chunk_frames(df: pd.DataFrame, chunk_size: int) -> List[pd.DataFrame]:
+    """Split *df* into frames holding at most ``chunk_size`` symbols each."""
+    if "symbol" in df.columns:
+        symbols = sorted(df["symbol"].dropna().unique())
+        chunks = [symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)]
+        return [df[df["symbol"].isin(c)].copy() for c in chunks]
+    sym_cols = _parse_symbol_columns(df)
+    symbols = sorted(sym_cols.keys())
+    chunks = [symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)]  # noqa: E203
+    frames = []
+    for chunk_syms in chunks:
+        cols: List[str] = []
+        for sym in chunk_syms:
+            cols.extend(sym_cols[sym])
+        frames.append(df.loc[:, cols].copy())
+    return frames
+
+
+def _bound_history(df: pd.DataFrame, start, end, bars: int) -> pd.DataFrame:
+    """Rows from ``bars`` bars before *start* (per symbol) to one bar after *end*.
+
+    The extra bar after *end* keeps ``cross_*`` results on *end* identical:
+    they are forced to ``False`` on a frame's last bar.
+    """
+    dates = pd.DatetimeIndex(pd.to_datetime(df.index))
+    uniq = dates.unique().sort_values()
+    if len(uniq) == 0:
+        return df
+    lo, hi = pd.Timestamp(start), pd.Timestamp(end)
+    before = dates < lo
+    if "symbol" in df.columns:
+        # uzun biçim: her sembolün kendi son ``bars`` barı
+        rank = (
+            pd.Series(dates[before])
+            .groupby(df["symbol"].to_numpy()[before])
+            .rank(method="first", ascending=False)
+        )
+        keep = ~before
+        keep[np.flatnonzero(before)] = rank.to_numpy() <= bars
+    else:
+        keep = dates >= uniq[max(int(uniq.searchsorted(lo)) - bars, 0)]
+    j = int(uniq.searchsorted(hi, side="right"))
+    keep &= dates <= uniq[min(j, len(uniq) - 1)]
+    return df[keep]
+
+
+def _lookback_slice(df, start, end, indicators, tol: float | None) -> pd.DataFrame:
+    if tol is None:
+        return df
+    # +1: cross_* yardımcıları bir önceki barı okur
+    bars = required_warmup(indicators, tol) + 1
+    out = _bound_history(df, start, end, bars)
+    log.info("LOOKBACK warmup=%d tol=%g rows=%d/%d", bars, tol, len(out), len(df))
+    return out
+
+
 def run_scan_day(
     df: pd.DataFrame,
     day: str,
     filters_df: pd.DataFrame,
     *,
     alias_csv: str | None = None,
+    lookback_tol: float | None = None,
 ) -> List[Tuple[str, str]]:
-    """Generate signals for a single day."""
+    """Generate signals for a single day.
+
+    With ``lookback_tol`` indicators are computed on each symbol's history
+    cut to the declared warm-up before *day* (see
+    :func:`~backtest.indicators.precompute.required_warmup`), so the cost
+    no longer grows with the length of the history; recursive indicators
+    then match the full-history values to within about ``lookback_tol``
+    relative to their input's spread.
+    """
     indicators = collect_required_indicators(filters_df)
+    df = _lookback_slice(df, day, day, indicators, lookback_tol)
     return _process_chunk(
         (
             df.copy(),
@@ -140,46 +334,254 @@ def run_scan_range(
     alias_csv: str | None = None,
     parquet_cache: str | None = None,
     ind_cache: str | None = None,
+    ind_cache_max_bytes: int | None = None,
     chunk_size: int = 20,
     workers: int = 1,
+    mode: str = "range",
+    signal_format: str = "csv",
+    incremental: bool = False,
+    lookback_tol: float | None = None,
 ) -> None:
     """Run scans for a date range with optional symbol chunking and
-    parallelism."""
-    writer = OutputWriter(out_dir)
+    parallelism.
+
+    ``mode="range"`` (default) evaluates every filter once over the whole
+    date × symbol panel and splits the hits into per-day files afterwards.
+    ``mode="daily"`` keeps the legacy loop that re-evaluates each filter for
+    every trading day. ``mode="stream"`` writes days as
+    :func:`iter_scan_range` produces them, keeping only one batch of hits in
+    memory. All modes write identical ``YYYY-MM-DD.csv`` files.
+
+    With ``workers > 1`` a single process pool is started for the whole run.
+    The numeric panel is placed in shared memory once (see
+    :class:`backtest.batch.shm.SharedPanel`) and tasks only carry symbol and
+    day index ranges; per-worker busy time is logged when the pool closes.
+
+    Indicators go through an :class:`~backtest.indicators.cache.IndicatorCache`
+    keyed by symbol, indicator and input fingerprint, so each series is
+    computed once per run. ``ind_cache`` (or, for backward compatibility, a
+    directory next to ``parquet_cache``) persists the cache across runs, so
+    a repeated run over unchanged data computes no indicators;
+    ``ind_cache_max_bytes`` bounds its size (LRU eviction). Hit and miss
+    counts are logged at the end of the run.
+
+    ``signal_format`` selects the output: ``"csv"`` (per-day files),
+    ``"parquet"`` (month-partitioned :class:`~backtest.batch.io.SignalStore`
+    under ``<out_dir>/signals``) or ``"both"``.
+
+    ``incremental=True`` keeps a :class:`~backtest.batch.manifest.RunManifest`
+    (``run_manifest.json`` in ``out_dir``) with per-day input fingerprints and
+    the filter-set hash, and only recomputes days whose output is missing,
+    whose filters changed or whose inputs changed within the filters'
+    lookback window; other daily outputs are left untouched.
+
+    ``lookback_tol`` cuts the history to the indicators' warm-up before the
+    first scanned day, as in :func:`run_scan_day`.
+    """
+    if mode not in {"range", "daily", "stream"}:
+        raise ValueError(f"Bilinmeyen mode: {mode}")
+    writer = make_signal_writer(out_dir, signal_format)
     days = trading_days(df.index, start, end)
     if len(days) == 0:
         raise RuntimeError("BR002: tarih aralığı veriyle kesişmiyor")
 
-    sym_cols = _parse_symbol_columns(df)
-    symbols = sorted(sym_cols.keys())
-    chunks = [symbols[i : i + chunk_size] for i in range(0, len(symbols), chunk_size)]  # noqa: E203
+    manifest = None
+    if incremental:
+        manifest = RunManifest(out_dir)
+        inputs = {str(sym): day_fingerprints(sub) for sym, sub in _split_symbols(df)}
+        fhash = filters_hash(filters_df, alias_csv)
+        lookback = filters_lookback(filters_df)
+        stale = manifest.stale_days(
+            days, inputs, fhash, lookback, exists=_output_exists(out_dir, signal_format)
+        )
+        log.info(
+            "INCREMENTAL stale=%d/%d days lookback=%s filters_changed=%s",
+            len(stale),
+            len(days),
+            "unbounded" if lookback is None else lookback,
+            fhash != manifest.filters_hash,
+        )
+        days = stale
+        if len(days) == 0:
+            manifest.update(inputs, fhash, days, lookback)
+            manifest.save()
+            return None
+
     indicators = collect_required_indicators(filters_df)
+    log.info("INDICATORS required=%s", ",".join(sorted(indicators)))
+    df = _lookback_slice(df, days[0], days[-1], indicators, lookback_tol)
+    cache = IndicatorCache(
+        _indicator_cache_dir(parquet_cache, ind_cache), max_bytes=ind_cache_max_bytes
+    )
+    pool = None
+    if workers > 1 and mode != "stream":
+        pool = _PanelPool(df, filters_df, indicators, alias_csv, days, workers, chunk_size, cache)
+        frames: List[pd.DataFrame] = []
+    else:
+        frames = _chunk_frames(df, chunk_size)
+    try:
+        run = {"daily": _run_daily, "stream": _run_stream}.get(mode, _run_range)
+        run(frames, days, filters_df, indicators, writer, alias_csv, pool, cache)
+        writer.close()
+    finally:
+        if pool is not None:
+            pool.close()
+    if manifest is not None:
+        manifest.update(inputs, fhash, days, lookback)
+        manifest.save()
+    log.info(
+        "INDICATOR_CACHE hits=%d misses=%d evicted=%d dir=%s",
+        cache.hits,
+        cache.misses,
+        cache.evicted,
+        cache.cache_dir,
+    )
 
-    for day in days:
-        t0 = perf_counter()
-        tasks = []
-        for chunk_syms in chunks:
-            cols: List[str] = []
-            for sym in chunk_syms:
-                cols.extend(sym_cols[sym])
-            df_chunk = df.loc[:, cols].copy()
-            tasks.append(
-                (
-                    df_chunk,
-                    filters_df,
-                    indicators,
-                    str(day.date()),
-                    alias_csv,
-                )
+
+def iter_scan_range(
+    df: pd.DataFrame,
+    start: str,
+    end: str,
+    filters_df: pd.DataFrame,
+    *,
+    alias_csv: str | None = None,
+    parquet_cache: str | None = None,
+    ind_cache: str | None = None,
+    ind_cache_max_bytes: int | None = None,
+    batch_days: int = 20,
+    lookback_tol: float | None = None,
+) -> Iterator[Tuple[pd.Timestamp, pd.DataFrame]]:
+    """Yield ``(day, signals)`` for every trading day in ``[start, end]``.
+
+    Indicators are prepared once per symbol; filters are then evaluated in
+    batches of ``batch_days`` days, so only one batch of hits is held at a
+    time and consumers can start on the first days while later ones are
+    still being scanned. ``signals`` has ``date``/``symbol``/``filter_code``
+    columns (empty for days without hits). ``lookback_tol`` is as in
+    :func:`run_scan_day`.
+    """
+    days = trading_days(df.index, start, end)
+    if len(days) == 0:
+        raise RuntimeError("BR002: tarih aralığı veriyle kesişmiyor")
+    indicators = collect_required_indicators(filters_df)
+    log.info("INDICATORS required=%s", ",".join(sorted(indicators)))
+    df = _lookback_slice(df, days[0], days[-1], indicators, lookback_tol)
+    cache = IndicatorCache(
+        _indicator_cache_dir(parquet_cache, ind_cache), max_bytes=ind_cache_max_bytes
+    )
+    for day, rows in _stream_days([df], days, filters_df, indicators, alias_csv, cache, batch_days):
+        sig = pd.DataFrame(rows, columns=["symbol", "filter_code"]).drop_duplicates()
+        sig.insert(0, "date", day)
+        yield day, sig.reset_index(drop=True)
+
+
+def _stream_days(frames, days, filters_df, indicators, alias_csv, cache, batch_days=20):
+    """Yield ``(day, [(symbol, filter_code), ...])`` batch by batch.
+
+    Each batch evaluates the filters on the prepared symbol frames sliced to
+    the batch plus one bar on either side: enough context for the one-bar
+    look-back of ``cross_up``/``cross_down`` and for their last-row rule.
+    """
+    prepared = []
+    for frame in frames:
+        for sym, sub in _iter_symbol_frames(frame, indicators, alias_csv, cache):
+            if not sub.index.is_monotonic_increasing:
+                sub = sub.sort_index()
+            prepared.append((sym, sub))
+    step = max(int(batch_days), 1)
+    for lo in range(0, len(days), step):
+        block = days[lo : lo + step]
+        windows = []
+        for sym, sub in prepared:
+            a = sub.index.searchsorted(block[0], side="left")
+            b = sub.index.searchsorted(block[-1], side="right")
+            windows.append((sym, sub.iloc[max(a - 1, 0) : b + 1]))
+        by_day: List[List[Tuple[str, str]]] = [[] for _ in block]
+        for pos, sym, code in _range_hits(windows, filters_df, block):
+            by_day[pos].append((sym, code))
+        yield from zip(block, by_day)
+
+
+def _run_stream(frames, days, filters_df, indicators, writer, alias_csv, pool, cache):
+    t0 = perf_counter()
+    for day, rows in _stream_days(frames, days, filters_df, indicators, alias_csv, cache):
+        writer.write_day(day, rows)
+    log.info(
+        "STREAM %s..%s: %d days took %.3fs",
+        days[0].date(),
+        days[-1].date(),
+        len(days),
+        perf_counter() - t0,
+    )
+
+
+def _output_exists(out_dir, signal_format):
+    root = Path(out_dir)
+    months: Dict[str, set] = {}
+
+    def exists(day) -> bool:
+        day = pd.Timestamp(day)
+        if signal_format != "parquet" and not (root / f"{day.date()}.csv").exists():
+            return False
+        if signal_format != "csv":
+            # ay dosyasının varlığı yetmez: gün o dosyada taranmış olmalı
+            month = day.strftime("%Y%m")
+            if month not in months:
+                months[month] = stored_signal_days(root / "signals" / f"part-{month}.parquet")
+            return str(day.date()) in months[month]
+        return True
+
+    return exists
+
+
+def _indicator_cache_dir(parquet_cache, ind_cache) -> Path | None:
+    if ind_cache:
+        return Path(ind_cache)
+    if parquet_cache:
+        p = Path(parquet_cache)
+        return (p.parent if p.suffix else p) / "indicators"
+    return None
+
+
+def _run_range(frames, days, filters_df, indicators, writer, alias_csv, pool, cache):
+    t0 = perf_counter()
+    if pool is not None:
+        hits = pool.run(0, len(days))
+    else:
+        hits = []
+        for frame in frames:
+            hits.extend(
+                _process_chunk_range((frame, filters_df, indicators, days, alias_csv, cache))
             )
-        if workers > 1:
-            with ProcessPoolExecutor(max_workers=workers) as ex:
-                results = ex.map(_process_chunk, tasks)
-        else:
-            results = map(_process_chunk, tasks)
+    by_day: List[List[Tuple[str, str]]] = [[] for _ in days]
+    for pos, sym, code in hits:
+        by_day[pos].append((sym, code))
+    t_eval = perf_counter() - t0
+    for day, rows in zip(days, by_day):
+        writer.write_day(day, rows)
+    log.info(
+        "RANGE %s..%s: %d days IO+INDICATORS+FILTERS took %.3fs, WRITE took %.3fs",
+        days[0].date(),
+        days[-1].date(),
+        len(days),
+        t_eval,
+        perf_counter() - t0 - t_eval,
+    )
+
+
+def _run_daily(frames, days, filters_df, indicators, writer, alias_csv, pool, cache):
+    for i, day in enumerate(days):
+        t0 = perf_counter()
         rows: List[Tuple[str, str]] = []
-        for r in results:
-            rows.extend(r)
+        if pool is not None:
+            rows.extend((sym, code) for _, sym, code in pool.run(i, i + 1))
+        else:
+            for frame in frames:
+                rows.extend(
+                    _process_chunk(
+                        (frame.copy(), filters_df, indicators, str(day.date()), alias_csv, cache)
+                    )
+                )
         writer.write_day(day, rows)
         log.info(
             "DAY %s: IO+INDICATORS+FILTERS+WRITE took %.3fs",
@@ -190,9 +592,6 @@ def run_scan_range(
 
 # trade DataFrame üretiliyorsa, maliyeti uygula (opsiyonel)
 try:
-    import os
-    from pathlib import Path
-
     from backtest.portfolio.costs import CostParams, apply_costs
 
     _cost_cfg = Path(os.environ.get("COSTS_CFG", "config/costs.yaml"))
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class SymbolLayout:
+    """How to rebuild one symbol's frame from the shared block.
+
+    ``columns`` is the original column order, ``dtypes`` lists the shared
+    columns whose dtype is not ``float64``. Non-numeric columns never enter
+    shared memory: they travel in ``extra`` with the (pickled) spec.
+    """
+
+    columns: Tuple[str, ...]
+    dtypes: Tuple[Tuple[str, object], ...]
+    extra: pd.DataFrame | None
+    index_name: object = None
+    index_tz: object = None
+    attrs: Dict[str, object] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class PanelSpec:
+    """Picklable description of a :class:`SharedPanel` sent once per worker."""
+
+    values_name: str
+    index_name: str
+    shape: Tuple[int, int]
+    columns: Tuple[str, ...]
+    symbols: Tuple[str, ...]
+    offsets: Tuple[int, ...]
+    layouts: Tuple[SymbolLayout, ...]
+
+
+def _shared(col: pd.Series) -> bool:
+    return pd.api.types.is_numeric_dtype(col) or pd.api.types.is_bool_dtype(col)
+
+
+class SharedPanel:
+    """Numeric long-format price/indicator panel held in shared memory.
+
+    Rows are grouped by symbol (``offsets[k]:offsets[k + 1]`` belongs to
+    ``symbols[k]``) so workers can slice a symbol range without copying.
+    Numeric values are stored as a C-ordered ``float64`` matrix, the date
+    index as ``int64`` nanoseconds in a second block. Each symbol's
+    :class:`SymbolLayout` restores its own columns, dtypes and non-numeric
+    columns, so :meth:`symbol_frame` returns the frame that was put in.
+    Only the creating process unlinks the blocks; pool workers share its
+    resource tracker.
+    """
+
+    def __init__(self, spec: PanelSpec, owner: bool = False):
+        self.spec = spec
+        self._owner = owner
+        self._shm_values = shared_memory.SharedMemory(name=spec.values_name) if not owner else None
+        self._shm_index = shared_memory.SharedMemory(name=spec.index_name) if not owner else None
+
+    # ---- creation ---------------------------------------------------------------
+    @classmethod
+    def create(cls, frames: Iterable[Tuple[str, pd.DataFrame]]) -> "SharedPanel":
+        """Copy ``(symbol, frame)`` pairs into shared memory.
+
+        Numeric (and bool) columns go into the shared block; every frame
+        must carry a ``DatetimeIndex``. Other columns, the original dtypes
+        and column order are kept per symbol in the spec.
+        """
+        frames = list(frames)
+        columns: List[str] = []
+        layouts: List[SymbolLayout] = []
+        per_symbol: List[List[str]] = []
+        for _, sub in frames:
+            shared = [c for c in sub.columns if _shared(sub[c])]
+            per_symbol.append(shared)
+            other = [c for c in sub.columns if c not in shared]
+            columns.extend(c for c in shared if c not in columns)
+            index = pd.DatetimeIndex(sub.index)
+            layouts.append(
+                SymbolLayout(
+                    columns=tuple(sub.columns),
+                    dtypes=tuple((c, sub[c].dtype) for c in shared if sub[c].dtype != np.float64),
+                    extra=sub[other].reset_index(drop=True) if other else None,
+                    index_name=index.name,
+                    index_tz=index.tz,
+                    attrs=dict(sub.attrs),
+                )
+            )
+        offsets = [0]
+        for _, sub in frames:
+            offsets.append(offsets[-1] + len(sub))
+        n_rows, n_cols = offsets[-1], len(columns)
+
+        shm_values = shared_memory.SharedMemory(create=True, size=max(n_rows * n_cols * 8, 1))
+        shm_index = shared_memory.SharedMemory(create=True, size=max(n_rows * 8, 1))
+        values = np.ndarray((n_rows, n_cols), dtype=np.float64, buffer=shm_values.buf)
+        index = np.ndarray((n_rows,), dtype=np.int64, buffer=shm_index.buf)
+        for k, (_, sub) in enumerate(frames):
+            a, b = offsets[k], offsets[k + 1]
+            block = sub[per_symbol[k]].astype("float64")
+            values[a:b] = block.reindex(columns=columns).to_numpy(dtype=np.float64, na_value=np.nan)
+            index[a:b] = pd.DatetimeIndex(sub.index).asi8
+
+        spec = PanelSpec(
+            values_name=shm_values.name,
+            index_name=shm_index.name,
+            shape=(n_rows, n_cols),
+            columns=tuple(columns),
+            symbols=tuple(str(sym) for sym, _ in frames),
+            offsets=tuple(offsets),
+            layouts=tuple(layouts),
+        )
+        panel = cls(spec, owner=True)
+        panel._shm_values = shm_values
+        panel._shm_index = shm_index
+        return panel
+
+    @classmethod
+    def attach(cls, spec: PanelSpec) -> "SharedPanel":
+        return cls(spec)
+
+    # ---- access -----------------------------------------------------------------
+    @property
+    def nbytes(self) -> int:
+        n_rows, n_cols = self.spec.shape
+        return n_rows * (n_cols + 1) * 8
+
+    def _values(self) -> np.ndarray:
+        return np.ndarray(self.spec.shape, dtype=np.float64, buffer=self._shm_values.buf)
+
+    def _index(self) -> np.ndarray:
+        return np.ndarray((self.spec.shape[0],), dtype=np.int64, buffer=self._shm_index.buf)
+
+    def symbol_frame(self, k: int) -> pd.DataFrame:
+        """Return ``symbols[k]``'s frame as it was passed to :meth:`create`.
+
+        Float columns are views over the shared block when the symbol has
+        every shared column; otherwise the needed columns are copied out.
+        """
+        a, b = self.spec.offsets[k], self.spec.offsets[k + 1]
+        index = pd.DatetimeIndex(self._index()[a:b])
+        lay = self.spec.layouts[k]
+        if lay.index_tz is not None:
+            index = index.tz_localize("UTC").tz_convert(lay.index_tz)
+        index.name = lay.index_name
+        extra = () if lay.extra is None else tuple(lay.extra.columns)
+        shared = [c for c in lay.columns if c not in extra]
+        values = self._values()[a:b]
+        if shared != list(self.spec.columns):
+            pos = {c: i for i, c in enumerate(self.spec.columns)}
+            values = values[:, [pos[c] for c in shared]]
+        frame = pd.DataFrame(values, index=index, columns=shared, copy=False)
+        if lay.dtypes:
+            frame = frame.astype(dict(lay.dtypes))
+        if extra:
+            for c in extra:
+                frame[c] = lay.extra[c].to_numpy()
+            frame = frame[list(lay.columns)]
+        frame.attrs.update(lay.attrs)
+        return frame
+
+    def iter_symbols(self, lo: int, hi: int):
+        """Yield ``(symbol, frame)`` for symbols ``lo`` (inclusive) to ``hi``."""
+        for k in range(lo, hi):
+            yield self.spec.symbols[k], self.symbol_frame(k)
+
+    # ---- lifecycle --------------------------------------------------------------
+    def close(self) -> None:
+        for shm in (self._shm_values, self._shm_index):
+            if shm is None:
+                continue
+            try:
+                shm.close()
+            except BufferError:  # live DataFrame views still reference the block
+                pass
+            if self._owner:
+                shm.unlink()
+        self._shm_values = self._shm_index = None
+
+    def __enter__(self) -> "SharedPanel":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+__all__ = ["PanelSpec", "SharedPanel", "SymbolLayout"]
@@ -6,6 +6,7 @@ import json
 import logging
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from types import SimpleNamespace as NS
 
@@ -38,9 +39,9 @@ from backtest.normalizer import normalize
 from backtest.paths import ALIAS_PATH, BENCHMARK_PATH, DATA_DIR, EXCEL_DIR
 from backtest.portfolio.engine import PortfolioParams
 from backtest.portfolio.simulator import PortfolioSim
-from backtest.reporter import write_reports
+from backtest.reporter import write_range_event, write_reports
 from backtest.reporting import build_excel_report
-from backtest.screener import run_screener
+from backtest.screener import ScreenerPanel, run_screener
 from backtest.summary import summarize_range
 from backtest.trace import ArtifactWriter, RunContext, list_output_files
 from backtest.validator import dataset_summary, quality_warnings
@@ -116,23 +117,133 @@ def preflight(cfg):  # tests monkeypatch ediyor
         )
 
 
-def convert_to_parquet(excel_dir: str | Path, out_dir: str | Path) -> None:
-    """Read Excel files under *excel_dir* and write partitioned Parquet."""
-    excel_path = Path(excel_dir)
+_PRICE_COLUMNS = {"open", "high", "low", "close", "adj_close"}
+
+
+def _convert_workbook(task) -> dict:
+    """Convert one workbook into month parts; returns its size/row statistics."""
+    from backtest.downloader import layout
+    from backtest.naming.aliases import normalize_token
+
+    xls, out_dir, opts = task
+    xls = Path(xls)
+    symbol = xls.stem
+    df = pd.read_excel(xls, engine="openpyxl")
+    for c in df.select_dtypes(include=["datetime", "datetimetz"]).columns:
+        df[c] = pd.to_datetime(df[c]).dt.tz_localize(None)
+    date_col = None
+    has_symbol = False
+    for c in df.columns:
+        canon = normalize_token(str(c))
+        if canon == "date" and date_col is None and pd.api.types.is_datetime64_dtype(df[c]):
+            date_col = c
+        elif canon == "symbol":
+            df[c] = df[c].astype("category")
+            has_symbol = True
+    if not has_symbol:
+        # tek sözlük girdili kategorik sütun: dosya başına birkaç bayt
+        df["symbol"] = pd.Categorical([symbol] * len(df))
+    for c in df.select_dtypes(include=["float", "int", "bool"]).columns:
+        canon = normalize_token(str(c))
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+        if opts["float32"] and canon in _PRICE_COLUMNS:
+            df[c] = df[c].astype("float32")
+        elif opts["int_volume"] and canon == "volume":
+            vals = df[c].astype("float64")
+            if vals.notna().all() and (vals == vals.round()).all():
+                df[c] = vals.astype("int64")
+            else:
+                df[c] = vals
+        elif pd.api.types.is_integer_dtype(df[c]):
+            df[c] = df[c].astype("float64")
+
+    sym_dir = Path(out_dir) / f"symbol={symbol}"
+    sym_dir.mkdir(parents=True, exist_ok=True)
+    write_kw = {
+        "compression": opts["compression"],
+        "row_group_size": opts["row_group_size"],
+    }
+    written = []
+    if date_col is None or df[date_col].isna().any():
+        # ay bölümlemesi için geçerli tarih yok: tek dosya
+        target = sym_dir / f"{symbol}.parquet"
+        layout.write_parquet_atomic(df, target, **write_kw)
+        written.append(target)
+    else:
+        df = df.sort_values(date_col, kind="mergesort")
+        for yyyymm, g in df.groupby(df[date_col].dt.strftime("%Y%m"), sort=True):
+            target = layout.part_path(sym_dir, yyyymm)
+            layout.write_parquet_atomic(g.reset_index(drop=True), target, **write_kw)
+            written.append(target)
+    for stale in sym_dir.glob("*.parquet"):
+        if stale not in written:
+            stale.unlink()
+    return {
+        "symbol": symbol,
+        "rows": len(df),
+        "bytes_in": xls.stat().st_size,
+        "bytes_out": sum(p.stat().st_size for p in written),
+        "files": len(written),
+    }
+
+
+def convert_to_parquet(
+    excel_dir: str | Path,
+    out_dir: str | Path,
+    *,
+    workers: int = 1,
+    float32: bool = False,
+    int_volume: bool = False,
+    row_group_size: int | None = None,
+    compression: str | None = "snappy",
+) -> dict:
+    """Read Excel files under *excel_dir* and write partitioned Parquet.
+
+    Each workbook becomes ``symbol=<stem>/part-YYYYMM.parquet`` month parts
+    (the downloader layout); workbooks without a usable date column are
+    written as a single file. ``float32`` stores OHLC prices as ``float32``,
+    ``int_volume`` keeps integral volume as ``int64`` and symbol columns are
+    stored as categoricals; other integer columns become ``float64``.
+    Workbooks are converted on ``workers`` processes. Returns a summary with
+    the byte counts before and after and the elapsed time.
+    """
+    import time
+    from concurrent.futures import ProcessPoolExecutor
+
+    t0 = time.perf_counter()
     out = Path(out_dir)
     out.mkdir(parents=True, exist_ok=True)
-    for xls in excel_path.glob("*.xlsx"):
-        symbol = xls.stem
-        df = pd.read_excel(xls, engine="openpyxl")
-        for c in df.select_dtypes(include=["datetime", "datetimetz"]).columns:
-            df[c] = pd.to_datetime(df[c]).dt.tz_localize(None)
-        for c in df.select_dtypes(include=["float", "int", "bool"]).columns:
-            df[c] = pd.to_numeric(df[c], errors="coerce")
-            if pd.api.types.is_integer_dtype(df[c]):
-                df[c] = df[c].astype("float64")
-        sym_dir = out / f"symbol={symbol}"
-        sym_dir.mkdir(parents=True, exist_ok=True)
-        df.to_parquet(sym_dir / f"{symbol}.parquet", index=False)
+    opts = {
+        "float32": float32,
+        "int_volume": int_volume,
+        "row_group_size": row_group_size,
+        "compression": compression,
+    }
+    tasks = [(str(x), str(out), opts) for x in sorted(Path(excel_dir).glob("*.xlsx"))]
+    if workers > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as exc:
+            stats = list(exc.map(_convert_workbook, tasks))
+    else:
+        stats = [_convert_workbook(t) for t in tasks]
+    summary = {
+        "files": len(stats),
+        "rows": sum(s["rows"] for s in stats),
+        "bytes_in": sum(s["bytes_in"] for s in stats),
+        "bytes_out": sum(s["bytes_out"] for s in stats),
+        "parts": sum(s["files"] for s in stats),
+        "took": round(time.perf_counter() - t0, 3),
+    }
+    logger.info(
+        "CONVERT files={} parts={} rows={} bytes_in={} bytes_out={} workers={} took={:.2f}s",
+        summary["files"],
+        summary["parts"],
+        summary["rows"],
+        summary["bytes_in"],
+        summary["bytes_out"],
+        workers,
+        summary["took"],
+    )
+    return summary
 
 
 def _run_scan(cfg):  # tests monkeypatch ediyor
@@ -191,63 +302,73 @@ def _run_scan(cfg):  # tests monkeypatch ediyor
         )
         return None
 
-    sig_frames: list[pd.DataFrame] = []
-    for d in tdays:
-        sig = run_screener(
-            df,
-            filters_df,
-            d,
-            stop_on_filter_error=False,
-            raise_on_error=False,
-        )
-        if sig.empty:
-            _diag("NO_MATCH_DAY", day=str(pd.to_datetime(d).date()))
-        else:
-            sig_frames.append(sig)
-
-    signals = (
-        pd.concat(sig_frames, ignore_index=True)
-        if sig_frames
-        else pd.DataFrame(columns=["FilterCode", "Symbol", "Date"])
-    )
-
-    trades = run_1g_returns(
-        df,
-        signals,
-        holding_period=getattr(getattr(cfg, "trading", NS()), "holding_period", 1),
-        transaction_cost=getattr(getattr(cfg, "trading", NS()), "transaction_cost", 0.0),
-        trading_days=tdays,
-    )
-
-    if trades.empty:
-        _diag("ZERO_RESULT_RANGE")
-
-    idx_cols = ["FilterCode"]
-    if "Side" in trades.columns:
-        idx_cols.append("Side")
-    summary = (
-        trades.pivot_table(index=idx_cols, columns="Date", values="ReturnPct")
-        if not trades.empty
-        else pd.DataFrame()
-    )
-    v_summary = dataset_summary(df)
-    v_issues = quality_warnings(df)
-
-    write_reports(
-        trades,
-        dates=tdays,
-        summary_wide=summary,
+    holding_period = getattr(getattr(cfg, "trading", NS()), "holding_period", 1)
+    transaction_cost = getattr(getattr(cfg, "trading", NS()), "transaction_cost", 0.0)
+    panel = ScreenerPanel(df)  # canonicalise + date index once for all days
+    report_kw = dict(
         out_xlsx=str(out_dir),
         out_csv_dir=str(out_dir),
         daily_sheet_prefix=getattr(cfg.report, "daily_sheet_prefix", "SCAN_"),
         summary_sheet_name=getattr(cfg.report, "summary_sheet_name", "SUMMARY"),
         percent_fmt=getattr(cfg.report, "percent_format", "0.00%"),
-        validation_summary=v_summary,
-        validation_issues=v_issues,
+        validation_summary=dataset_summary(df),
+        validation_issues=quality_warnings(df),
         per_day_output=True,
         filename_pattern="SCAN_{date}.xlsx",
         csv_filename_pattern="SCAN_{date}.csv",
     )
+    # Tarama, T+1 getiri ve yazma gün gün boru hattında: her gün yalnız kendi
+    # sinyalleri ve giriş..çıkış penceresindeki fiyatlarla işlenir, biter bitmez
+    # yazılır. Yazma bir sonraki günün taramasıyla örtüşür; bellekte en fazla
+    # bir gün yazılmayı bekler.
+    n_trades = 0
+    no_trades = None
+    pending = None
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        for i, d in enumerate(tdays):
+            sig = run_screener(
+                panel,
+                filters_df,
+                d,
+                stop_on_filter_error=False,
+                raise_on_error=False,
+            )
+            if sig.empty:
+                _diag("NO_MATCH_DAY", day=str(pd.to_datetime(d).date()))
+                if no_trades is None:
+                    no_trades = run_1g_returns(
+                        df,
+                        pd.DataFrame(columns=["FilterCode", "Symbol", "Date"]),
+                        holding_period=holding_period,
+                        transaction_cost=transaction_cost,
+                        trading_days=tdays,
+                    )
+                trades = no_trades.copy()  # yazıcı çerçeveyi yerinde işaretler
+            else:
+                step = (
+                    holding_period
+                    if isinstance(holding_period, int) and holding_period > 0
+                    else len(tdays)
+                )
+                exit_day = tdays[min(i + step, len(tdays) - 1)]
+                trades = run_1g_returns(
+                    panel.between(d, exit_day),
+                    sig,
+                    holding_period=holding_period,
+                    transaction_cost=transaction_cost,
+                    trading_days=tdays,
+                )
+            n_trades += len(trades)
+            if pending is not None:
+                pending.result()
+            pending = pool.submit(write_reports, trades, dates=[d], range_event=False, **report_kw)
+        if pending is not None:
+            pending.result()
+    # aralık düzeyindeki olay/log tüm günler yazıldıktan sonra bir kez
+    write_range_event(n_trades, out_dir)
+
+    if not n_trades:
+        _diag("ZERO_RESULT_RANGE")
 
     events_path = out_dir / "events.jsonl"
     events_path.write_text(
@@ -313,12 +434,50 @@ def build_parser() -> argparse.ArgumentParser:
     pd_day = sub.add_parser("scan-day", help="Tek gün tarama")
     pd_day.add_argument("--date", required=False)
     pd_day.add_argument("--out", "--reports-dir", dest="out", required=False)
+    pd_day.add_argument(
+        "--lookback-tol",
+        type=float,
+        default=None,
+        help="Geçmişi göstergelerin ısınma süresine kısalt (tam geçmişe göre tolerans)",
+    )
     add_common(pd_day)
 
     prange = sub.add_parser("scan-range", help="Tarih aralığı tarama")
     prange.add_argument("--start", required=False)
     prange.add_argument("--end", required=False)
     prange.add_argument("--out", "--reports-dir", dest="out", required=False)
+    prange.add_argument(
+        "--signal-format",
+        choices=["csv", "parquet", "both"],
+        default="csv",
+        help="Sinyal çıktısı: günlük CSV, aylık Parquet deposu ya da ikisi",
+    )
+    prange.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Yalnız girdisi/filtresi değişen ya da eksik günleri yeniden hesapla",
+    )
+    prange.add_argument(
+        "--mode",
+        choices=["range", "daily", "stream"],
+        default="range",
+        help="range: tüm aralık tek geçişte; daily: gün gün; stream: günler üretildikçe yazılır",
+    )
+    prange.add_argument(
+        "--workers", type=int, default=1, help="Süreç sayısı (range/daily, paylaşımlı bellek)"
+    )
+    prange.add_argument(
+        "--ind-cache", default=None, help="Kalıcı gösterge deposu klasörü (çalıştırmalar arası)"
+    )
+    prange.add_argument(
+        "--ind-cache-max-mb", type=float, default=None, help="Gösterge deposu boyut sınırı (MB)"
+    )
+    prange.add_argument(
+        "--lookback-tol",
+        type=float,
+        default=None,
+        help="Geçmişi göstergelerin ısınma süresine kısalt (tam geçmişe göre tolerans)",
+    )
     add_common(prange)
 
     ps = sub.add_parser("summarize", help="Sinyallerden günlük özet ve BIST oranlı alpha üret")
@@ -332,6 +491,12 @@ def build_parser() -> argparse.ArgumentParser:
     )
     ps.add_argument("--out", required=False, default="raporlar/ozet")
     ps.add_argument("--horizon", type=int, default=1)
+    ps.add_argument(
+        "--signal-source",
+        choices=["auto", "parquet", "csv"],
+        default="auto",
+        help="Sinyal kaynağı: Parquet deposu, günlük CSV ya da en son yazılan (auto)",
+    )
 
     pr = sub.add_parser("report-excel", help="A9 csv'lerinden summary.xlsx üret")
     pr.add_argument("--daily", required=True, help="daily_summary.csv yolu")
@@ -389,6 +554,20 @@ def build_parser() -> argparse.ArgumentParser:
         help="Excel kaynak klasörü (varsayılan: paths.EXCEL_DIR)",
     )
     ctp.add_argument("--out", required=True, help="Parquet çıkış klasörü")
+    ctp.add_argument("--workers", type=int, default=1, help="Paralel süreç sayısı")
+    ctp.add_argument("--float32", action="store_true", help="OHLC fiyatlarını float32 yaz")
+    ctp.add_argument("--int-volume", action="store_true", help="Tam sayı hacmi int64 yaz")
+    ctp.add_argument("--row-group-size", type=int, default=None, help="Row group satır sayısı")
+    ctp.add_argument(
+        "--compression",
+        choices=["snappy", "zstd", "gzip", "none"],
+        default="snappy",
+        help="Parquet sıkıştırması",
+    )
+
+    vac = sub.add_parser("vacuum-ind-cache", help="Gösterge deposunu temizle ve sınırla")
+    vac.add_argument("--ind-cache", required=True, help="Gösterge deposu klasörü")
+    vac.add_argument("--max-mb", type=float, default=None, help="LRU ile inilecek boyut (MB)")
 
     fr = sub.add_parser("fetch-range", help="Veri aralığı indir")
     fr.add_argument("--symbols", required=True)
@@ -396,27 +575,42 @@ def build_parser() -> argparse.ArgumentParser:
     fr.add_argument("--end", required=True)
     fr.add_argument("--provider", default="stub")
     fr.add_argument("--directory", default=str(DATA_DIR))
+    fr.add_argument("--workers", type=int, default=1, help="Eşzamanlı sembol sayısı")
+    fr.add_argument("--retries", type=int, default=2, help="Sembol başına ek deneme")
 
     fl = sub.add_parser("fetch-latest", help="TTL ile en son veriyi indir")
     fl.add_argument("--symbols", required=True)
     fl.add_argument("--ttl-hours", type=int, default=6)
     fl.add_argument("--provider", default="stub")
     fl.add_argument("--directory", default=str(DATA_DIR))
+    fl.add_argument("--workers", type=int, default=1, help="Eşzamanlı sembol sayısı")
+    fl.add_argument("--retries", type=int, default=2, help="Sembol başına ek deneme")
 
     rc_cmd = sub.add_parser("refresh-cache", help="Önbelleği yenile")
     rc_cmd.add_argument("--ttl-hours", type=int, default=0)
     rc_cmd.add_argument("--provider", default="stub")
     rc_cmd.add_argument("--directory", default=str(DATA_DIR))
+    rc_cmd.add_argument("--workers", type=int, default=1, help="Eşzamanlı sembol sayısı")
+    rc_cmd.add_argument("--retries", type=int, default=2, help="Sembol başına ek deneme")
 
     vc_cmd = sub.add_parser("vacuum-cache", help="Eski parçaları temizle")
     vc_cmd.add_argument("--older-than-days", type=int, default=365)
     vc_cmd.add_argument("--provider", default="stub")
     vc_cmd.add_argument("--directory", default=str(DATA_DIR))
 
+    cc_cmd = sub.add_parser("compact-cache", help="Delta dosyalarını aylık parçalarla birleştir")
+    cc_cmd.add_argument("--symbols", default=None, help="Virgülle ayrılmış; boşsa tümü")
+    cc_cmd.add_argument("--provider", default="stub")
+    cc_cmd.add_argument("--directory", default=str(DATA_DIR))
+
     ic_cmd = sub.add_parser("integrity-check", help="Parquet bütünlüğünü kontrol et")
     ic_cmd.add_argument("--symbols", required=True)
     ic_cmd.add_argument("--provider", default="stub")
     ic_cmd.add_argument("--directory", default=str(DATA_DIR))
+    ic_cmd.add_argument(
+        "--fast", action="store_true", help="Önce Parquet footer istatistikleriyle tara"
+    )
+    ic_cmd.add_argument("--workers", type=int, default=1, help="Eşzamanlı sembol sayısı")
 
     return p
 
@@ -485,6 +679,7 @@ def main(argv=None):
         "fetch-latest",
         "refresh-cache",
         "vacuum-cache",
+        "compact-cache",
         "integrity-check",
     }:
         from backtest.downloader.core import DataDownloader
@@ -492,7 +687,7 @@ def main(argv=None):
         from backtest.downloader.providers.local_excel import LocalExcelProvider
         from backtest.downloader.providers.stub import StubProvider
 
-        def _make_dl(name: str, directory: str) -> DataDownloader:
+        def _make_dl(name: str, directory: str, **kwargs) -> DataDownloader:
             if name == "stub":
                 prov = StubProvider()
             elif name == "local-csv":
@@ -501,9 +696,14 @@ def main(argv=None):
                 prov = LocalExcelProvider(directory)
             else:  # pragma: no cover
                 raise SystemExit(f"unknown provider: {name}")
-            return DataDownloader(prov)
+            return DataDownloader(prov, **kwargs)
 
-        dl = _make_dl(args.provider, args.directory)
+        dl_opts = {
+            k: getattr(args, k)
+            for k in ("workers", "retries")
+            if getattr(args, k, None) is not None and args.cmd != "integrity-check"
+        }
+        dl = _make_dl(args.provider, args.directory, **dl_opts)
         if args.cmd == "fetch-range":
             dl.fetch_range(args.symbols.split(","), args.start, args.end)
         elif args.cmd == "fetch-latest":
@@ -512,8 +712,10 @@ def main(argv=None):
             dl.refresh_cache(args.ttl_hours)
         elif args.cmd == "vacuum-cache":
             dl.vacuum_cache(args.older_than_days)
+        elif args.cmd == "compact-cache":
+            dl.compact_cache(args.symbols.split(",") if args.symbols else None)
         elif args.cmd == "integrity-check":
-            dl.integrity_check(args.symbols.split(","))
+            dl.integrity_check(args.symbols.split(","), fast=args.fast, workers=args.workers)
         return
     if args.cmd == "compare-strategies":
         from backtest.strategy.cli import compare_strategies_cli
@@ -527,7 +729,23 @@ def main(argv=None):
         return
     if args.cmd == "convert-to-parquet":
         excel_dir = args.excel_dir or EXCEL_DIR
-        convert_to_parquet(excel_dir, args.out)
+        summary = convert_to_parquet(
+            excel_dir,
+            args.out,
+            workers=args.workers,
+            float32=args.float32,
+            int_volume=args.int_volume,
+            row_group_size=args.row_group_size,
+            compression=None if args.compression == "none" else args.compression,
+        )
+        print(json.dumps(summary, ensure_ascii=False))
+        return
+    if args.cmd == "vacuum-ind-cache":
+        from backtest.indicators.cache import IndicatorCache
+
+        max_bytes = None if args.max_mb is None else int(args.max_mb * 1024 * 1024)
+        stats = IndicatorCache(args.ind_cache).vacuum(max_bytes)
+        print(json.dumps(stats, ensure_ascii=False))
         return
     if args.cmd == "guardrails":
         outdir = Path(getattr(args, "out_dir", "artifacts/guardrails"))
@@ -758,6 +976,7 @@ def main(argv=None):
             args.benchmark,
             horizon=args.horizon,
             write_dir=args.out,
+            source=args.signal_source,
         )
         print("Özet yazıldı:", res)
         sys.exit(0)
@@ -819,7 +1038,10 @@ def main(argv=None):
     filters_df = load_filters_from_module(module, include)
 
     if args.cmd == "scan-day":
-        rows = run_scan_day(df, args.date, filters_df, alias_csv=args.alias)
+        extra = {}
+        if getattr(args, "lookback_tol", None) is not None:
+            extra["lookback_tol"] = args.lookback_tol
+        rows = run_scan_day(df, args.date, filters_df, alias_csv=args.alias, **extra)
         if args.no_preflight:
             logger.info("--no-preflight aktif")
         if not flags.write_outputs:
@@ -838,7 +1060,28 @@ def main(argv=None):
     if args.cmd == "scan-range":
         if args.no_preflight:
             logger.info("--no-preflight aktif")
-        run_scan_range(df, args.start, args.end, filters_df, out_dir=args.out, alias_csv=args.alias)
+        extra = {}
+        if getattr(args, "signal_format", "csv") != "csv":
+            extra["signal_format"] = args.signal_format
+        if getattr(args, "incremental", False):
+            extra["incremental"] = True
+        if getattr(args, "ind_cache", None):
+            extra["ind_cache"] = args.ind_cache
+            if args.ind_cache_max_mb is not None:
+                extra["ind_cache_max_bytes"] = int(args.ind_cache_max_mb * 1024 * 1024)
+        if getattr(args, "lookback_tol", None) is not None:
+            extra["lookback_tol"] = args.lookback_tol
+        run_scan_range(
+            df,
+            args.start,
+            args.end,
+            filters_df,
+            out_dir=args.out,
+            alias_csv=args.alias,
+            mode=args.mode,
+            workers=args.workers,
+            **extra,
+        )
         if args.cmd in ("scan-day", "scan-range") and flags.write_outputs:
             out_root = args.out or cfg_dict.get("paths", {}).get("outputs", "raporlar/gunluk")
             files = list_output_files(out_root)
@@ -1,5 +1,5 @@
 """Backend implementations for data loading."""
 
-from . import pandas_backend, polars_backend
+from . import pandas_backend, polars_backend, polars_lazy
 
-__all__ = ["polars_backend", "pandas_backend"]
+__all__ = ["polars_backend", "polars_lazy", "pandas_backend"]
@@ -1,27 +1,65 @@
 from __future__ import annotations
 
+import operator
+from functools import reduce
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, List, Sequence
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from backtest.downloader import layout
 
 
 def _read_symbol(path: Path, cols: Iterable[str] | None) -> pd.DataFrame:
-    files = sorted(path.glob("*.parquet"))
+    files = layout.symbol_files(path)
     if not files:
         raise FileNotFoundError(f"No parquet files under {path}")
+    if cols is not None:
+        cols = [c for c in cols if c.lower() != "symbol"]
     df = pd.concat([pd.read_parquet(f, columns=cols) for f in files])
+    df = df.drop(columns=[c for c in df.columns if str(c).lower() == "symbol"])
+    date_col = "Date" if "Date" in df.columns else "date"
+    if any(layout.is_delta(f) for f in files) and date_col in df.columns:
+        df = layout.merge_frames([df], date_col)
     return df
 
 
-def load_prices(
-    parquet_dir: str | Path,
+def _symbol_files(root: Path, sym: str, start: str | None, end: str | None) -> List[Path]:
+    """Parquet files of *sym*; month partitions outside ``[start, end]`` are pruned."""
+    path = root / f"symbol={sym}"
+    files = layout.symbol_files(path)
+    if not files:
+        raise FileNotFoundError(f"No parquet files under {path}")
+    lo = pd.Timestamp(start).strftime("%Y%m") if start else None
+    hi = pd.Timestamp(end).strftime("%Y%m") if end else None
+    keep = []
+    for f in files:
+        month = layout.file_month(f)
+        if month is not None and ((lo and month < lo) or (hi and month > hi)):
+            continue
+        keep.append(f)
+    return keep
+
+
+def _bound(value: str, typ: pa.DataType) -> pa.Scalar | None:
+    ts = pd.Timestamp(value)
+    if pa.types.is_timestamp(typ) and typ.tz is None:
+        return pa.scalar(ts.to_pydatetime(), type=typ)
+    if pa.types.is_date(typ):
+        return pa.scalar(ts.date(), type=typ)
+    return None
+
+
+def _load_legacy(
+    root: Path,
     symbols: Sequence[str],
     start: str | None,
     end: str | None,
     cols: Iterable[str] | None,
 ) -> pd.DataFrame:
-    root = Path(parquet_dir)
     frames = []
     for sym in symbols:
         p = root / f"symbol={sym}"
@@ -34,3 +72,97 @@ def load_prices(
         frames.append(df)
     out = pd.concat(frames, ignore_index=True)
     return out
+
+
+def load_prices(
+    parquet_dir: str | Path,
+    symbols: Sequence[str],
+    start: str | None,
+    end: str | None,
+    cols: Iterable[str] | None,
+) -> pd.DataFrame:
+    """Read ``symbol=<SYM>`` partitions with one :mod:`pyarrow.dataset` scan.
+
+    Month parts (``part-YYYYMM.parquet`` and their ``delta-YYYYMM-*`` files)
+    outside ``[start, end]`` are never opened, ``cols`` and the date bounds
+    are pushed into the Parquet reader. When delta files are present the
+    merged view is returned (first row per symbol and date). Files whose
+    schemas cannot be unified fall back to the per-symbol path. A ``symbol``
+    or ``Symbol`` column stored inside the files is ignored; ``Symbol`` always
+    comes from the partition directory. A delta file removed by a
+    concurrent compaction makes the files be listed and read again.
+    """
+    if not symbols:
+        raise ValueError("No objects to concatenate")
+    root = Path(parquet_dir)
+    cols = list(cols) if cols is not None else None
+    return layout.read_retrying(lambda: _load_dataset(root, symbols, start, end, cols))
+
+
+def _load_dataset(
+    root: Path,
+    symbols: Sequence[str],
+    start: str | None,
+    end: str | None,
+    cols: List[str] | None,
+) -> pd.DataFrame:
+    files: List[Path] = []
+    for sym in symbols:
+        files.extend(_symbol_files(root, sym, start, end))
+    schema_files = files or sorted((root / f"symbol={symbols[0]}").glob("*.parquet"))[:1]
+    try:
+        schema = pa.unify_schemas([pq.read_schema(f) for f in schema_files])
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return _load_legacy(root, symbols, start, end, cols)
+    # Dosyanın kendi symbol/Symbol sütunu bölüm anahtarıyla çakışır; değer
+    # her zaman dizin adından (symbol=<SYM>) gelir.
+    schema = pa.schema([f for f in schema if f.name.lower() != "symbol"], metadata=schema.metadata)
+    if cols is not None:
+        cols = [c for c in cols if c.lower() != "symbol"]
+    date_col = "Date" if "Date" in schema.names else "date"
+    names = (
+        cols
+        if cols is not None
+        else [n for n in schema.names if not n.startswith("__index_level_")]
+    )
+
+    preds = []
+    post = []
+    for value, op in ((start, operator.ge), (end, operator.le)):
+        if not value:
+            continue
+        if date_col not in schema.names:
+            raise KeyError(date_col)
+        scalar = _bound(value, schema.field(date_col).type)
+        if scalar is None:
+            post.append((value, op))
+        else:
+            preds.append(op(ds.field(date_col), scalar))
+    dedup = any(layout.is_delta(f) for f in files)
+    need_date = (post or dedup) and date_col in schema.names and date_col not in names
+    read_cols = names + [date_col] if need_date else names
+
+    dataset = ds.dataset(
+        [str(f) for f in files],
+        schema=pa.unify_schemas([schema, pa.schema([("symbol", pa.string())])]),
+        format="parquet",
+        partitioning=ds.partitioning(pa.schema([("symbol", pa.string())]), flavor="hive"),
+        partition_base_dir=str(root),
+    )
+    table = dataset.to_table(
+        columns=read_cols + ["symbol"],
+        filter=reduce(operator.and_, preds) if preds else None,
+    )
+    out = table.to_pandas()
+    for value, op in post:
+        out = out[op(out[date_col], value)]
+    if dedup and date_col in out.columns:
+        rank = out["symbol"].map({sym: i for i, sym in enumerate(symbols)})
+        out = (
+            out.assign(_rank=rank)
+            .drop_duplicates(["symbol", date_col])
+            .sort_values(["_rank", date_col], kind="mergesort")
+            .drop(columns="_rank")
+        )
+    out = out.rename(columns={"symbol": "Symbol"})[names + ["Symbol"]]
+    return out.reset_index(drop=True)
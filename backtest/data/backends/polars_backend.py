@@ -6,24 +6,33 @@ from typing import Iterable, Sequence
 
 import polars as pl
 
+from backtest.downloader import layout
+
 
 def _scan_symbol(path: Path, cols: Iterable[str] | None) -> pl.LazyFrame:
-    files = sorted(path.glob("*.parquet"))
+    files = layout.symbol_files(path)
     if not files:
         raise FileNotFoundError(f"No parquet files under {path}")
     lf = pl.scan_parquet([str(f) for f in files])
+    names = lf.collect_schema().names()
+    # dosyadaki symbol/Symbol sütunu yok sayılır; değer dizin adından gelir
+    lf = lf.drop([n for n in names if n.lower() == "symbol"])
+    if any(layout.is_delta(f) for f in files):
+        # parça + delta birleşik görünümü: tarih başına ilk satır
+        date_col = "Date" if "Date" in names else "date"
+        lf = lf.unique(subset=[date_col], keep="first", maintain_order=True).sort(date_col)
     if cols is not None:
-        lf = lf.select(list(cols))
+        lf = lf.select([c for c in cols if c.lower() != "symbol"])
     return lf
 
 
-def load_prices(
+def scan_prices(
     parquet_dir: str | Path,
     symbols: Sequence[str],
     start: str | None,
     end: str | None,
     cols: Iterable[str] | None,
-) -> pl.DataFrame:
+) -> pl.LazyFrame:
     root = Path(parquet_dir)
     lfs = []
     start_dt = datetime.strptime(start, "%Y-%m-%d") if start else None
@@ -37,8 +46,19 @@ def load_prices(
             lf = lf.filter(pl.col("Date") <= end_dt)
         lf = lf.with_columns(pl.lit(sym).alias("Symbol"))
         lfs.append(lf)
-    lazy = pl.concat(lfs)
-    return lazy.collect()
+    return pl.concat(lfs)
+
+
+def load_prices(
+    parquet_dir: str | Path,
+    symbols: Sequence[str],
+    start: str | None,
+    end: str | None,
+    cols: Iterable[str] | None,
+) -> pl.DataFrame:
+    return layout.read_retrying(
+        lambda: scan_prices(parquet_dir, symbols, start, end, cols).collect()
+    )
 
 
 def to_pandas(df: pl.DataFrame):
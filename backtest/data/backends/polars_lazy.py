@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, List, Sequence
+
+import pandas as pd
+import polars as pl
+
+from backtest.filters.engine import compile_filter
+from backtest.naming.aliases import normalize_token
+
+from .polars_backend import scan_prices
+
+_PARAM_RE = re.compile(r"^(sma|ema|rsi|mom|roc)_(\d+)$")
+SIGNAL_COLUMNS = ["date", "symbol", "filter_code"]
+
+
+def normalize_lazy(lf: pl.LazyFrame) -> pl.LazyFrame:
+    """Canonical column names, float prices and ``(symbol, date)`` order.
+
+    Columns are renamed with :func:`normalize_token` (``Date`` → ``date``),
+    numeric columns become ``Float64`` with NaN turned into null so that
+    comparisons treat missing values like pandas does.
+    """
+    names = lf.collect_schema().names()
+    rename = {}
+    for c in names:
+        canon = normalize_token(c)
+        if canon not in rename.values():
+            rename[c] = canon
+    lf = lf.select([pl.col(c).alias(n) for c, n in rename.items()])
+    schema = lf.collect_schema()
+    casts = [
+        pl.col(n).cast(pl.Float64).fill_nan(None)
+        for n, t in schema.items()
+        if t.is_numeric() and n not in ("date", "symbol")
+    ]
+    return (
+        lf.with_columns(
+            pl.col("date").cast(pl.Datetime("ns")),
+            pl.col("symbol").cast(pl.String),
+            *casts,
+        )
+        .drop_nulls("date")
+        .sort(["symbol", "date"])
+    )
+
+
+def _rsi(close: pl.Expr, n: int) -> pl.Expr:
+    delta = close.diff()
+    up = delta.clip(lower_bound=0).ewm_mean(alpha=1 / n, adjust=True)
+    down = (-delta.clip(upper_bound=0)).ewm_mean(alpha=1 / n, adjust=True)
+    return 100 - (100 / (1 + up / down))
+
+
+def indicator_expr(name: str, by: str = "symbol") -> pl.Expr | None:
+    """Polars expression computing *name* per ``by`` group, ``None`` if unknown.
+
+    Conventions follow :mod:`backtest.indicators.precompute` and
+    :mod:`backtest.indicators.compute` (``ewm`` with ``adjust=True``).
+    """
+    m = _PARAM_RE.match(name)
+    if m is None:
+        return None
+    kind, n = m.group(1), int(m.group(2))
+    close = pl.col("close")
+    if kind == "sma":
+        e = close.rolling_mean(window_size=n)
+    elif kind == "ema":
+        e = close.ewm_mean(span=n, adjust=True)
+    elif kind == "rsi":
+        e = _rsi(close, n)
+    elif kind == "mom":
+        e = close - close.shift(n)
+    else:
+        e = close / close.shift(n) - 1
+    return e.over(by).fill_nan(None).alias(name)
+
+
+def required_names(filters_df: pd.DataFrame) -> List[str]:
+    names: dict = {}
+    for expr in filters_df["PythonQuery"].astype(str):
+        for n in compile_filter(expr.strip()).names:
+            if n not in ("cross_up", "cross_down"):
+                names[n] = None
+    return list(names)
+
+
+def with_indicators(lf: pl.LazyFrame, names: Iterable[str]) -> pl.LazyFrame:
+    """Add the indicator columns among *names* that the data does not provide."""
+    have = set(lf.collect_schema().names())
+    exprs = [e for n in names if n not in have and (e := indicator_expr(n)) is not None]
+    return lf.with_columns(exprs) if exprs else lf
+
+
+def scan_signals_lazy(
+    lf: pl.LazyFrame,
+    filters_df: pd.DataFrame,
+    start: str | None = None,
+    end: str | None = None,
+) -> pl.LazyFrame:
+    """Lazy ``date, symbol, filter_code`` hits of every filter in ``[start, end]``.
+
+    *lf* must already be normalised; indicators are computed on the whole
+    history and the date window is applied after the masks.
+    """
+    from backtest.dsl.polars_expr import to_polars_expr
+
+    lf = with_indicators(lf, required_names(filters_df))
+    parts = []
+    for r in filters_df.itertuples(index=False):
+        code = str(r.FilterCode).strip()
+        mask = to_polars_expr(str(r.PythonQuery).strip())
+        parts.append(
+            lf.filter(mask).select(
+                pl.col("date"), pl.col("symbol"), pl.lit(code).alias("filter_code")
+            )
+        )
+    if not parts:
+        schema = {"date": pl.Datetime("ns"), "symbol": pl.String, "filter_code": pl.String}
+        return pl.LazyFrame(schema=schema)
+    out = pl.concat(parts)
+    if start:
+        out = out.filter(pl.col("date") >= datetime.strptime(start, "%Y-%m-%d"))
+    if end:
+        out = out.filter(pl.col("date") <= datetime.strptime(end, "%Y-%m-%d"))
+    return out.unique(maintain_order=True).sort(SIGNAL_COLUMNS)
+
+
+def run_signals(
+    parquet_dir: str | Path,
+    symbols: Sequence[str],
+    filters_df: pd.DataFrame,
+    start: str | None = None,
+    end: str | None = None,
+) -> pd.DataFrame:
+    """Scan → normalise → indicators → filters as one lazy query.
+
+    The plan is collected once, at the signal output.
+    """
+    lf = normalize_lazy(scan_prices(parquet_dir, symbols, None, None, None))
+    return scan_signals_lazy(lf, filters_df, start, end).collect().to_pandas()
+
+
+__all__ = [
+    "indicator_expr",
+    "normalize_lazy",
+    "run_signals",
+    "scan_signals_lazy",
+    "with_indicators",
+]
@@ -5,7 +5,7 @@ from typing import Iterable, Sequence
 
 from backtest.paths import DATA_DIR
 
-from .backends import pandas_backend, polars_backend
+from .backends import pandas_backend, polars_backend, polars_lazy
 
 
 def load_prices(
@@ -26,11 +26,16 @@ def load_prices(
         Date bounds in YYYY-MM-DD format.
     cols : iterable of str, optional
         Desired columns; ``None`` loads all columns.
-    backend : {"pandas", "polars"}
-        Data backend to use.
+    backend : {"pandas", "polars", "polars-lazy"}
+        Data backend to use. ``"polars-lazy"`` returns a normalised
+        :class:`polars.LazyFrame` (``date``, ``symbol``, lower-case fields)
+        without collecting it; see :mod:`backtest.data.backends.polars_lazy`.
     parquet_dir : str or Path
         Root directory containing ``symbol=`` partitions (default ``DATA_DIR/parquet``).
     """
+    if backend == "polars-lazy":
+        lf = polars_backend.scan_prices(parquet_dir, symbols, start, end, cols)
+        return polars_lazy.normalize_lazy(lf)
     if backend == "polars":
         df = polars_backend.load_prices(parquet_dir, symbols, start, end, cols)
         return polars_backend.to_pandas(df)
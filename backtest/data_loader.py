@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import importlib.util
 import json
 import logging
@@ -7,10 +8,12 @@ import os
 import re
 import time
 import warnings
-from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 from loguru import logger
 
@@ -175,30 +178,64 @@ def canonicalize_columns(df: pd.DataFrame) -> pd.DataFrame:
 
     df = df.rename(columns=rename_map)
 
-    seen_series: Dict[str, pd.Series] = {}
-    i = 0
-    while i < df.shape[1]:
-        col = df.columns[i]
-        if col not in seen_series:
-            seen_series[col] = df.iloc[:, i]
-            i += 1
+    # Her sütun en fazla bir kez hash'lenir; eşit hash'ler ``equals`` ile
+    # doğrulanır ve çerçeve sonda tek seçim + yeniden adlandırmayla kurulur.
+    names = list(df.columns)
+    counts = Counter(names)
+    digests: Dict[int, tuple] = {}
+
+    def digest(pos: int) -> tuple:
+        if pos not in digests:
+            digests[pos] = _column_digest(df.iloc[:, pos])
+        return digests[pos]
+
+    first_pos: Dict[str, int] = {}
+    keep: List[int] = []
+    final: List[str] = []
+    for i, col in enumerate(names):
+        if col not in first_pos:
+            first_pos[col] = i
+            keep.append(i)
+            final.append(col)
             continue
-        first_series = seen_series[col]
-        curr_series = df.iloc[:, i]
-        if first_series.equals(curr_series):
+        j = first_pos[col]
+        if digest(i) == digest(j) and df.iloc[:, j].equals(df.iloc[:, i]):
             logging.info("Dropping duplicate column '%s'", col)
-            df = df.iloc[:, [j for j in range(df.shape[1]) if j != i]]
+            counts[col] -= 1
             continue
         new_name = f"{col}_alt"
-        j = 1
-        while new_name in df.columns:
-            j += 1
-            new_name = f"{col}_alt{j}"
+        k = 1
+        while counts[new_name] > 0:
+            k += 1
+            new_name = f"{col}_alt{k}"
         logging.info("Column '%s' conflicts with existing; renamed to '%s'", col, new_name)
-        df = df.rename(columns={df.columns[i]: new_name})
-        seen_series[new_name] = df.iloc[:, i]
-        i += 1
-    return df
+        counts[col] -= 1
+        counts[new_name] += 1
+        first_pos[new_name] = i
+        keep.append(i)
+        final.append(new_name)
+    if len(keep) == len(names) and final == names:
+        return df
+    out = df.iloc[:, keep]
+    out.columns = final
+    return out
+
+
+def _column_digest(s: pd.Series) -> tuple:
+    """``(dtype, digest)`` of a column's values for duplicate detection.
+
+    Floats are canonicalised first (``-0.0`` → ``0.0``, one NaN bit pattern)
+    so columns that :meth:`pandas.Series.equals` treats as equal hash equal.
+    """
+    if isinstance(s.dtype, np.dtype):
+        vals = s.to_numpy()
+        if vals.dtype.kind == "f":
+            vals = vals + 0.0
+            vals[np.isnan(vals)] = np.nan
+        hashed = pd.util.hash_array(vals)
+    else:
+        hashed = pd.util.hash_pandas_object(s, index=False).to_numpy()
+    return str(s.dtype), hashlib.blake2b(hashed.tobytes(), digest_size=16).digest()
 
 
 def apply_corporate_actions(
@@ -254,11 +291,148 @@ def apply_corporate_actions(
     return merged
 
 
+_CACHE_MANIFEST_SUFFIX = ".manifest.json"
+_CACHE_MANIFEST_VERSION = 1
+
+
+def _cache_manifest_path(cache_file: Path) -> Path:
+    return cache_file.with_name(cache_file.name + _CACHE_MANIFEST_SUFFIX)
+
+
+def _load_cache_manifest(cache_file: Path) -> Optional[Dict[str, Any]]:
+    path = _cache_manifest_path(cache_file)
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != _CACHE_MANIFEST_VERSION:
+        return None
+    return data
+
+
+def _save_cache_manifest(cache_file: Path, files: Dict[str, Dict[str, Any]]) -> None:
+    path = _cache_manifest_path(cache_file)
+    tmp = path.with_name(path.name + ".tmp")
+    data = {"version": _CACHE_MANIFEST_VERSION, "files": files}
+    tmp.write_text(json.dumps(data, indent=1, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _file_fingerprint(fpath: Path, previous: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Return ``{size, mtime_ns, sha1}`` of *fpath*.
+
+    The content hash is only recomputed when size or mtime differ from
+    *previous*, so unchanged workbooks cost a single ``stat``.
+    """
+    st = fpath.stat()
+    fp = {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    if previous and all(previous.get(k) == v for k, v in fp.items()) and previous.get("sha1"):
+        fp["sha1"] = previous["sha1"]
+        return fp
+    h = hashlib.sha1()
+    with open(fpath, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    fp["sha1"] = h.hexdigest()
+    return fp
+
+
+def _parse_sheet(
+    xls: Any, sheet: str, price_schema: Any, fpath: Path, verbose: bool = False
+) -> Optional[pd.DataFrame]:
+    """Parse and clean one symbol sheet; ``None`` when the sheet is unusable."""
+    try:
+        df = xls.parse(
+            sheet_name=sheet,
+            header=0,
+            dtype_backend="numpy_nullable",
+        )
+    except TypeError:
+        df = xls.parse(sheet_name=sheet, header=0)
+    if df is None or df.empty:
+        return None
+    df, _ = normalize_columns(df, price_schema=price_schema)
+    if "date" not in df.columns:
+        df.columns = [normalize_key(c) for c in df.columns]
+    if "date" not in df.columns:
+        if verbose:
+            logger.info("[SKIP] {}:{} 'date' bulunamadı.", fpath, sheet)
+        return None
+    df["date"] = pd.to_datetime(
+        df["date"].astype(str).str[:10],
+        format="%Y-%m-%d",
+        errors="coerce",
+        dayfirst=False,
+    )
+    df = df.dropna(subset=["date"])
+    keep = [c for c in ["open", "high", "low", "close", "volume"] if c in df.columns]
+    for c in keep:
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    df = df.dropna(subset=keep)
+    df = df[(df[keep] >= 0).all(axis=1)]
+    df["symbol"] = str(sheet).strip().upper()
+    return df.copy()
+
+
+def _ingest_sheets_task(task: tuple) -> tuple:
+    """Process-pool worker: parse a group of sheets of one workbook.
+
+    The workbook is opened once per task (``sheets=None`` means all of its
+    sheets) and the parsed sheets cross the process boundary as
+    :class:`pyarrow.RecordBatch` (pickled as raw Arrow buffers) instead of
+    pickled DataFrames.
+    """
+    import pyarrow as pa
+
+    fpath, sheets, engine, price_schema, verbose = task
+    t0 = time.perf_counter()
+    batches = []
+    n_sheets = 0
+    try:
+        with pd.ExcelFile(fpath, engine=engine) as xls:
+            for sheet in xls.sheet_names if sheets is None else sheets:
+                n_sheets += 1
+                try:
+                    df = _parse_sheet(xls, sheet, price_schema, Path(fpath), verbose)
+                except Exception as e:
+                    if verbose:
+                        logger.warning("[WARN] Sheet işlenemedi: {}:{} -> {}", fpath, sheet, e)
+                    continue
+                if df is not None:
+                    batches.append(pa.RecordBatch.from_pandas(df, preserve_index=False))
+    except Exception as e:
+        if verbose:
+            logger.warning("[WARN] Dosya açılamadı: {} -> {}", fpath, e)
+    return fpath, batches, n_sheets, time.perf_counter() - t0
+
+
+def _sheet_names(fpath: Path, engine: str) -> List[str]:
+    try:
+        with pd.ExcelFile(fpath, engine=engine) as xls:
+            return list(xls.sheet_names)
+    except Exception:
+        return []
+
+
 def read_excels_long(
     cfg_or_path: Union[str, Path, Any],
     engine: str = "auto",
     verbose: bool = False,
+    *,
+    ingest: str = "thread",
+    workers: Optional[int] = None,
 ) -> pd.DataFrame:
+    """Read every ``*.xlsx`` under the configured Excel directory into one long frame.
+
+    ``ingest="thread"`` (default) parses workbooks on a thread pool.
+    ``ingest="process"`` spreads the workbooks over a process pool
+    (openpyxl parsing is GIL bound), opening each workbook once per task;
+    when there are fewer workbooks than workers their sheets are split
+    into one group per worker. Sheets come back as Arrow record batches;
+    the result is identical.
+    """
+    if ingest not in ("thread", "process"):
+        raise ValueError(f"Bilinmeyen ingest modu: {ingest}")
     start_all = time.perf_counter()
     price_schema = None
     log = get_logger(__name__)
@@ -331,25 +505,82 @@ def read_excels_long(
 
     aggregated_cache: Optional[Path] = None
     cache_dir: Optional[Path] = None
+    # Kısmi yenileme: değişmeyen kitapların satırları önbellekten gelir
+    base_cached: Optional[pd.DataFrame] = None
+    parse_files: List[Path] = excel_files
+    manifest_files: Dict[str, Dict[str, Any]] = {}
+    fingerprints: Dict[str, Dict[str, Any]] = {}
     if enable_cache and cache_path:
         try:
             cache_file = resolve_path(cache_path)
+            df_cached = None
+            manifest = None
             if cache_file.exists() and cache_file.is_file():
                 try:
                     df_cached = pd.read_parquet(cache_file)
-                    _log_metrics(df_cached)
-                    return df_cached
                 except Exception as e:  # engine missing or wrong format
                     logger.warning("Önbellek okunamadı: {} -> {}", cache_path, e)
                     try:
                         df_cached = pd.read_pickle(cache_file)
-                        _log_metrics(df_cached)
-                        return df_cached
                     except Exception as e2:
                         logger.warning("Önbellek okunamadı: {} -> {}", cache_path, e2)
             aggregated_cache = cache_file if cache_file.suffix else None
             if cache_file and cache_file.is_dir():
                 cache_dir = cache_file
+            if aggregated_cache is not None:
+                manifest = _load_cache_manifest(aggregated_cache)
+                old_files = manifest["files"] if manifest else {}
+                fingerprints = {
+                    f.name: _file_fingerprint(f, old_files.get(f.name)) for f in excel_files
+                }
+            if df_cached is not None:
+                if manifest is None:
+                    if not excel_files:
+                        # kaynak yok: elimizdeki tek veri önbellek
+                        _log_metrics(df_cached)
+                        return df_cached
+                    logger.info("Önbellek manifesti yok, tam yeniden oluşturuluyor: {}", cache_file)
+                else:
+                    changed = [
+                        f
+                        for f in excel_files
+                        if fingerprints[f.name]["sha1"] != old_files.get(f.name, {}).get("sha1")
+                    ]
+                    removed = sorted(set(old_files) - set(fingerprints))
+                    if not changed and not removed:
+                        if any(
+                            fingerprints[n] != {k: old_files[n].get(k) for k in fingerprints[n]}
+                            for n in fingerprints
+                        ):
+                            for n, fp in fingerprints.items():
+                                old_files[n].update(fp)
+                            _save_cache_manifest(aggregated_cache, old_files)
+                        _log_metrics(df_cached)
+                        return df_cached
+                    # aynı sembolü taşıyan değişmemiş kitaplar da yeniden okunur
+                    stale = {f.name for f in changed} | set(removed)
+                    stale_syms: set = set()
+                    while True:
+                        for n in stale:
+                            stale_syms.update(old_files.get(n, {}).get("symbols", []))
+                        more = {
+                            f.name
+                            for f in excel_files
+                            if f.name not in stale
+                            and stale_syms & set(old_files.get(f.name, {}).get("symbols", []))
+                        }
+                        if not more:
+                            break
+                        stale |= more
+                    parse_files = [f for f in excel_files if f.name in stale]
+                    manifest_files = {
+                        n: v for n, v in old_files.items() if n in fingerprints and n not in stale
+                    }
+                    if "symbol" in df_cached.columns:
+                        base_cached = df_cached[~df_cached["symbol"].isin(stale_syms)]
+                    else:
+                        parse_files = excel_files
+                        manifest_files = {}
         except Exception as e:
             logger.warning("Önbellek okunamadı: {} -> {}", cache_path, e)
     if enable_cache and not cache_dir and excel_dir:
@@ -405,39 +636,9 @@ def read_excels_long(
             with pd.ExcelFile(fpath, engine=engine_to_use) as xls:
                 for sheet in xls.sheet_names:
                     try:
-                        try:
-                            df = xls.parse(
-                                sheet_name=sheet,
-                                header=0,
-                                dtype_backend="numpy_nullable",
-                            )
-                        except TypeError:
-                            df = xls.parse(sheet_name=sheet, header=0)
-                        if df is None or df.empty:
-                            continue
-                        df, _ = normalize_columns(df, price_schema=price_schema)
-                        if "date" not in df.columns:
-                            df.columns = [normalize_key(c) for c in df.columns]
-                        if "date" not in df.columns:
-                            if verbose:
-                                logger.info("[SKIP] {}:{} 'date' bulunamadı.", fpath, sheet)
-                            continue
-                        df["date"] = pd.to_datetime(
-                            df["date"].astype(str).str[:10],
-                            format="%Y-%m-%d",
-                            errors="coerce",
-                            dayfirst=False,
-                        )
-                        df = df.dropna(subset=["date"])
-                        keep = [
-                            c for c in ["open", "high", "low", "close", "volume"] if c in df.columns
-                        ]
-                        for c in keep:
-                            df[c] = pd.to_numeric(df[c], errors="coerce")
-                        df = df.dropna(subset=keep)
-                        df = df[(df[keep] >= 0).all(axis=1)]
-                        df["symbol"] = str(sheet).strip().upper()
-                        records_local.append(df.copy())
+                        df = _parse_sheet(xls, sheet, price_schema, fpath, verbose)
+                        if df is not None:
+                            records_local.append(df)
                     except Exception as e:
                         if verbose:
                             logger.warning("[WARN] Sheet işlenemedi: {}:{} -> {}", fpath, sheet, e)
@@ -460,9 +661,105 @@ def read_excels_long(
             logger.info("Excel'den okundu: {} ({:.2f}s)", fpath, time.perf_counter() - t0)
         return df_out
 
-    max_workers = min(32, os.cpu_count() or 1)
-    with ThreadPoolExecutor(max_workers=max_workers) as exc:
-        records = list(exc.map(_process_file, excel_files))
+    def _cached(fpath: Path) -> Optional[pd.DataFrame]:
+        if not (enable_cache and cache_dir):
+            return None
+        cache_file = cache_dir / (fpath.stem + ".parquet")
+        try:
+            if cache_file.exists() and cache_file.stat().st_mtime >= fpath.stat().st_mtime:
+                return pd.read_parquet(cache_file)
+        except Exception as e:
+            logger.warning("Cache okunamadı: {} -> {}", cache_file, e)
+        return None
+
+    def _process_files_parallel(files: List[Path]) -> List[pd.DataFrame]:
+        out: Dict[Path, pd.DataFrame] = {}
+        pending = []
+        for fpath in files:
+            df_cached = _cached(fpath)
+            if df_cached is not None:
+                out[fpath] = df_cached
+            else:
+                pending.append(fpath)
+        n_workers = workers or min(32, os.cpu_count() or 1)
+        # Her kitap görev başına bir kez açılır: kitap sayısı işçilerden azsa
+        # sayfalar işçi başına bir gruba bölünür, yoksa kitap tek görevdir.
+        per_file = max(1, n_workers // max(1, len(pending)))
+        tasks = []
+        for fpath in pending:
+            if per_file == 1:
+                groups: List[Optional[List[str]]] = [None]
+            else:
+                names = _sheet_names(fpath, engine_to_use)
+                size = max(1, -(-len(names) // per_file))
+                groups = [names[i : i + size] for i in range(0, len(names), size)]  # noqa: E203
+            for group in groups:
+                tasks.append((str(fpath), group, engine_to_use, price_schema, verbose))
+        batches: Dict[str, List[Any]] = {}
+        n_sheets = 0
+        t0 = time.perf_counter()
+        if tasks:
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(tasks))) as exc:
+                for fpath, parts, n, _dt in exc.map(_ingest_sheets_task, tasks):
+                    batches.setdefault(fpath, []).extend(parts)
+                    n_sheets += n
+        logger.info(
+            "INGEST mode=process workers={} tasks={} sheets={} files={} took={:.2f}s",
+            n_workers,
+            len(tasks),
+            n_sheets,
+            len(pending),
+            time.perf_counter() - t0,
+        )
+        for fpath in files:
+            if fpath in out:
+                continue
+            parts = batches.get(str(fpath))
+            if not parts:
+                out[fpath] = pd.DataFrame()
+                continue
+            df_out = pd.concat([b.to_pandas() for b in parts], ignore_index=True)
+            if enable_cache and cache_dir:
+                cache_file = cache_dir / (fpath.stem + ".parquet")
+                try:
+                    cache_dir.mkdir(parents=True, exist_ok=True)
+                    df_out.to_parquet(cache_file, index=False)
+                    logger.info("Parquet'e dönüştürüldü: {}", cache_file)
+                except Exception as e:
+                    logger.warning("Önbelleğe yazılamadı: {} -> {}", cache_file, e)
+            out[fpath] = df_out
+        return [out[f] for f in files]
+
+    def _parse_files(files: List[Path]) -> List[pd.DataFrame]:
+        if ingest == "process":
+            return _process_files_parallel(files)
+        max_workers = workers or min(32, os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=max_workers) as exc:
+            return list(exc.map(_process_file, files))
+
+    t_parse = time.perf_counter()
+    records = _parse_files(parse_files)
+    if base_cached is not None:
+        new_syms = set().union(*(set(r["symbol"]) for r in records if not r.empty))
+        if new_syms & set(base_cached["symbol"]):
+            # yeni kitap mevcut bir sembolü taşıyor: birleştirme sırası önemli
+            logger.info("Önbellek sembol çakışması, tam yeniden oluşturuluyor")
+            base_cached, parse_files, manifest_files = None, excel_files, {}
+            records = _parse_files(parse_files)
+    for fpath, rec in zip(parse_files, records):
+        if fpath.name in fingerprints:
+            manifest_files[fpath.name] = {
+                **fingerprints[fpath.name],
+                "symbols": sorted(rec["symbol"].unique()) if not rec.empty else [],
+            }
+    if base_cached is not None:
+        logger.info(
+            "CACHE_REFRESH refreshed={} kept={} took={:.2f}s",
+            [f.name for f in parse_files],
+            len(excel_files) - len(parse_files),
+            time.perf_counter() - t_parse,
+        )
+        records.insert(0, base_cached)
 
     records = [r for r in records if not r.empty]
     if not records:
@@ -496,6 +793,7 @@ def read_excels_long(
             aggregated_cache.parent.mkdir(parents=True, exist_ok=True)
             try:
                 full.to_parquet(aggregated_cache, index=False)
+                _save_cache_manifest(aggregated_cache, manifest_files)
             except Exception as e:
                 logger.warning("Önbelleğe yazılamadı: {} -> {}", aggregated_cache, e)
                 try:
@@ -2,28 +2,52 @@ from __future__ import annotations
 
 import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable
+from typing import Callable, Dict, Iterable, List, Tuple
 
 import pandas as pd
+import pyarrow.parquet as pq
 
+from backtest.logging_conf import get_logger
 from backtest.paths import DATA_DIR, PROJECT_ROOT
 
+from . import layout
 from .schema import CANON_COLS, normalize
 
+log = get_logger("downloader")
+
 
 class DataDownloader:
-    """Core downloader managing manifest, locks and Parquet outputs."""
+    """Core downloader managing manifest, locks and Parquet outputs.
+
+    Symbols are fetched by up to ``workers`` threads, each with ``retries``
+    extra attempts (exponential ``retry_backoff``). Every symbol writes only
+    its own ``symbol=`` directory; manifest entries are committed under the
+    lock with one atomic write per ``batch_size`` symbols.
+    """
 
     def __init__(
         self,
         provider,
         data_dir: str | Path = DATA_DIR / "parquet",
         manifest_path: str | Path = PROJECT_ROOT / "artifacts/data/manifest.json",
+        *,
+        workers: int = 1,
+        retries: int = 2,
+        retry_backoff: float = 0.5,
+        batch_size: int = 100,
     ) -> None:
+        if workers < 1 or batch_size < 1 or retries < 0:
+            raise ValueError("workers/batch_size >= 1 ve retries >= 0 olmalı")
         self.provider = provider
+        self.workers = workers
+        self.retries = retries
+        self.retry_backoff = retry_backoff
+        self.batch_size = batch_size
         self.data_dir = Path(data_dir)
         self.manifest_path = Path(manifest_path)
         self.lock_path = self.manifest_path.parent / ".lock"
@@ -39,12 +63,31 @@ class DataDownloader:
         return {}
 
     def _save_manifest(self) -> None:
-        with open(self.manifest_path, "w") as f:
+        tmp = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        with open(tmp, "w") as f:
             json.dump(self._manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.manifest_path)
+
+    def _commit(self, entries: Dict[str, dict]) -> None:
+        """Merge *entries* into the on-disk manifest with one atomic write."""
+        if not entries:
+            return
+        with self._lock():
+            self._manifest = {**self._load_manifest(), **entries}
+            self._save_manifest()
 
     @contextmanager
-    def _lock(self):
-        fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+    def _lock(self, timeout: float = 30.0):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_RDWR)
+                break
+            except FileExistsError:
+                # başka bir işlem (manifest yazımı, sıkıştırma) kilidi tutuyor
+                if time.monotonic() >= deadline:
+                    raise TimeoutError(f"Kilit alınamadı: {self.lock_path}")
+                time.sleep(0.01)
         try:
             yield
         finally:
@@ -53,42 +96,106 @@ class DataDownloader:
 
     # ---- internal operations -----------------------------------------------------
     def _write_symbol(self, symbol: str, df: pd.DataFrame) -> None:
+        """Write *df* as new month parts or, for existing months, delta files.
+
+        Existing parts are never rewritten here; :meth:`compact_cache`
+        merges the deltas later. Dates already stored for a month are not
+        written again (existing rows win), so a date lives in one file only.
+        """
         sym_dir = self.data_dir / f"symbol={symbol}"
         sym_dir.mkdir(parents=True, exist_ok=True)
         df = df.sort_values("date")
         for yyyymm, g in df.groupby(df["date"].dt.strftime("%Y%m")):
-            part = sym_dir / f"part-{yyyymm}.parquet"
+            part = layout.part_path(sym_dir, yyyymm)
             if part.exists():
-                existing = pd.read_parquet(part)
-                g = (
-                    pd.concat([existing, g])
-                    .drop_duplicates("date")
-                    .sort_values("date")
-                    .reset_index(drop=True)
-                )
-            g.to_parquet(part, index=False)
+                g = g[~g["date"].isin(_stored_dates(sym_dir, yyyymm))]
+                if g.empty:
+                    continue
+                target = layout.new_delta_path(sym_dir, yyyymm)
+            else:
+                target = part
+            layout.write_parquet_atomic(g.reset_index(drop=True), target)
+
+    def _fetch_one(self, symbol: str, start, end) -> pd.DataFrame:
+        for attempt in range(self.retries + 1):
+            try:
+                return self.provider.fetch(symbol, start, end)
+            except Exception as e:
+                if attempt >= self.retries:
+                    raise
+                delay = self.retry_backoff * (2**attempt)
+                log.warning("fetch retry symbol=%s attempt=%d err=%s", symbol, attempt + 1, e)
+                if delay > 0:
+                    time.sleep(delay)
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def _sync(
+        self,
+        jobs: List[Tuple[str, object, object]],
+        entry: Callable[[pd.DataFrame], dict],
+    ) -> Dict[str, dict]:
+        """Fetch and write every ``(symbol, start, end)`` job; return the new entries."""
+        failed: Dict[str, str] = {}
+        done: Dict[str, dict] = {}
+
+        def run(job):
+            symbol, start, end = job
+            df = self._fetch_one(symbol, start, end)
+            if df.empty:
+                return symbol, None
+            df = normalize(df)
+            self._write_symbol(symbol, df)
+            return symbol, entry(df)
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.workers) as exc:
+            for lo in range(0, len(jobs), self.batch_size):
+                batch = jobs[lo : lo + self.batch_size]
+                futures = {exc.submit(run, job): job[0] for job in batch}
+                entries: Dict[str, dict] = {}
+                for fut, symbol in futures.items():
+                    try:
+                        _, meta = fut.result()
+                    except Exception as e:
+                        failed[symbol] = str(e)
+                        log.error("fetch failed symbol=%s err=%s", symbol, e)
+                        continue
+                    if meta is not None:
+                        entries[symbol] = meta
+                self._commit(entries)
+                done.update(entries)
+        log.info(
+            "SYNC symbols=%d written=%d failed=%d workers=%d took=%.3fs",
+            len(jobs),
+            len(done),
+            len(failed),
+            self.workers,
+            time.perf_counter() - t0,
+        )
+        if failed:
+            raise RuntimeError(f"İndirme başarısız: {sorted(failed)}")
+        return done
 
     # ---- public API --------------------------------------------------------------
-    def fetch_range(self, symbols: Iterable[str], start, end) -> None:
+    def fetch_range(self, symbols: Iterable[str], start, end) -> Dict[str, dict]:
         start = pd.to_datetime(start).date()
         end = pd.to_datetime(end).date()
-        for symbol in symbols:
-            df = self.provider.fetch(symbol, start, end)
-            if df.empty:
-                continue
-            df = normalize(df)
-            with self._lock():
-                self._write_symbol(symbol, df)
-                self._manifest[symbol] = {
-                    "last_fetch_ts": datetime.utcnow().isoformat(),
-                    "last_date": df["date"].max().date().isoformat(),
-                    "source": getattr(self.provider, "name", "provider"),
-                    "ttl_hours": getattr(self.provider, "ttl_hours", 0),
-                }
-                self._save_manifest()
-
-    def fetch_latest(self, symbols: Iterable[str], ttl_hours: int) -> None:
+        source = getattr(self.provider, "name", "provider")
+        ttl = getattr(self.provider, "ttl_hours", 0)
+
+        def entry(df: pd.DataFrame) -> dict:
+            return {
+                "last_fetch_ts": datetime.utcnow().isoformat(),
+                "last_date": df["date"].max().date().isoformat(),
+                "source": source,
+                "ttl_hours": ttl,
+            }
+
+        return self._sync([(s, start, end) for s in symbols], entry)
+
+    def fetch_latest(self, symbols: Iterable[str], ttl_hours: int) -> Dict[str, dict]:
         now = datetime.utcnow()
+        jobs = []
         for symbol in symbols:
             info = self._manifest.get(symbol)
             if info:
@@ -101,58 +208,191 @@ class DataDownloader:
             end = now.date()
             if start > end:
                 continue
-            df = self.provider.fetch(symbol, start, end)
-            if df.empty:
-                continue
-            df = normalize(df)
-            with self._lock():
-                self._write_symbol(symbol, df)
-                self._manifest[symbol] = {
-                    "last_fetch_ts": now.isoformat(),
-                    "last_date": df["date"].max().date().isoformat(),
-                    "source": getattr(self.provider, "name", "provider"),
-                    "ttl_hours": ttl_hours,
-                }
-                self._save_manifest()
+            jobs.append((symbol, start, end))
+        source = getattr(self.provider, "name", "provider")
+
+        def entry(df: pd.DataFrame) -> dict:
+            return {
+                "last_fetch_ts": now.isoformat(),
+                "last_date": df["date"].max().date().isoformat(),
+                "source": source,
+                "ttl_hours": ttl_hours,
+            }
+
+        return self._sync(jobs, entry)
 
     def refresh_cache(self, ttl_hours: int = 0) -> None:
-        self.fetch_latest(self._manifest.keys(), ttl_hours)
+        self.fetch_latest(list(self._manifest), ttl_hours)
 
     def vacuum_cache(self, older_than_days: int = 365) -> None:
+        """Remove data not written for ``older_than_days``.
+
+        A month expires as a whole: its part and deltas are removed only
+        when the newest of them is older than the cutoff, so a recent
+        delta never outlives the part it extends.
+        """
         cutoff = datetime.utcnow() - pd.Timedelta(days=older_than_days)
-        for part in self.data_dir.glob("**/*.parquet"):
-            if datetime.utcfromtimestamp(part.stat().st_mtime) < cutoff:
-                part.unlink()
+        groups: Dict[Tuple[Path, str], List[Path]] = {}
+        for f in self.data_dir.glob("**/*.parquet"):
+            month = layout.file_month(f)
+            groups.setdefault((f.parent, month or f.name), []).append(f)
+        with self._lock():
+            for files in groups.values():
+                newest = max(f.stat().st_mtime for f in files)
+                if datetime.utcfromtimestamp(newest) < cutoff:
+                    for f in files:
+                        f.unlink()
 
-    def integrity_check(self, symbols: Iterable[str]) -> dict:
-        report = {}
-        for symbol in symbols:
+    def compact_cache(self, symbols: Iterable[str] | None = None) -> Dict[str, int]:
+        """Merge delta files into their monthly parts (dedup on ``date``).
+
+        Each symbol is compacted under the downloader lock: the part is
+        replaced atomically, then its deltas are removed. A reader that
+        listed the files before the removal can hit a missing delta; the
+        loaders re-list and read again in that case (see
+        :func:`layout.read_retrying`), and both layouts hold the same rows.
+        Returns the number of delta files merged per symbol.
+        """
+        if symbols is None:
+            dirs = sorted(self.data_dir.glob("symbol=*"))
+        else:
+            dirs = [self.data_dir / f"symbol={s}" for s in symbols]
+        merged: Dict[str, int] = {}
+        t0 = time.perf_counter()
+        for sym_dir in dirs:
+            count = 0
+            with self._lock():
+                by_month: Dict[str, List[Path]] = {}
+                for f in layout.symbol_files(sym_dir):
+                    month = layout.file_month(f)
+                    if month is not None:
+                        by_month.setdefault(month, []).append(f)
+                for month, files in by_month.items():
+                    deltas = [f for f in files if layout.is_delta(f)]
+                    if not deltas:
+                        continue
+                    df = layout.merge_frames([pd.read_parquet(f) for f in files])
+                    layout.write_parquet_atomic(df, layout.part_path(sym_dir, month))
+                    for f in deltas:
+                        f.unlink()
+                    count += len(deltas)
+            if count:
+                merged[sym_dir.name.split("=", 1)[1]] = count
+        log.info(
+            "COMPACT symbols=%d deltas=%d took=%.3fs",
+            len(merged),
+            sum(merged.values()),
+            time.perf_counter() - t0,
+        )
+        return merged
+
+    def _check_symbol_full(self, sym_dir: Path) -> dict:
+        files = [f for f in layout.symbol_files(sym_dir) if layout.file_month(f)]
+        if not files:
+            return {"missing": True}
+        frames = [pd.read_parquet(p) for p in files]
+        # birleşik görünüm: parça + delta dosyaları, tarih başına ilk satır
+        df = layout.merge_frames(frames)
+        issues: list[str] = []
+        # bir tarih tüm parça/delta dosyalarında en fazla bir kez bulunmalı
+        if pd.concat([f["date"] for f in frames], ignore_index=True).duplicated().any():
+            issues.append("duplicate_dates")
+        if not df["date"].is_monotonic_increasing:
+            issues.append("not_sorted")
+        if set(CANON_COLS) - set(df.columns):
+            issues.append("missing_cols")
+        if df.isna().any().any():
+            issues.append("nan_values")
+        if (df["date"].dt.weekday >= 5).any():
+            issues.append("weekend")
+        expected = pd.date_range(df["date"].min(), df["date"].max(), freq="B")
+        missing = expected.difference(df["date"])
+        if not missing.empty:
+            issues.append("gaps")
+        return {"issues": issues}
+
+    @staticmethod
+    def _check_symbol_stats(files: List[Path]) -> dict | None:
+        """Rule a symbol clean from footers and its date column; ``None`` if suspicious.
+
+        Footers screen the columns and null counts (pandas NaN is written
+        as null) without reading data. Row counts and date bounds cannot
+        prove the dates are unique, so only the ``date`` column of every
+        part and delta file is read: the symbol is clean when those dates
+        are unique across all files, fall on weekdays and cover every
+        business day between the first and the last one. Anything else
+        needs the full check.
+        """
+        dates = []
+        for f in files:
+            pf = pq.ParquetFile(f)
+            meta = pf.metadata
+            if set(CANON_COLS) - set(meta.schema.names) or meta.num_rows == 0:
+                return None
+            for rg in range(meta.num_row_groups):
+                group = meta.row_group(rg)
+                for c in range(group.num_columns):
+                    st = group.column(c).statistics
+                    if st is None or st.null_count is None or st.null_count > 0:
+                        return None
+            dates.append(pf.read(columns=["date"]).column("date").to_pandas())
+        d = pd.concat(dates, ignore_index=True)
+        if d.duplicated().any() or (d.dt.weekday >= 5).any():
+            return None
+        if len(d) != len(pd.bdate_range(d.min(), d.max())):
+            return None  # benzersiz hafta içi tarihler: eksik sayı = boşluk
+        return {"issues": []}
+
+    def integrity_check(
+        self, symbols: Iterable[str], *, fast: bool = False, workers: int = 1
+    ) -> dict:
+        """Check every symbol's merged view and write ``integrity_report.json``.
+
+        With ``fast=True`` symbols are first screened from Parquet footer
+        statistics and their date columns; only the suspicious ones are
+        read in full. Symbols are
+        checked on ``workers`` threads.
+        """
+        t0 = time.perf_counter()
+
+        def check(symbol: str) -> Tuple[str, dict]:
             sym_dir = self.data_dir / f"symbol={symbol}"
             if not sym_dir.exists():
-                report[symbol] = {"missing": True}
-                continue
-            dfs = [pd.read_parquet(p) for p in sorted(sym_dir.glob("part-*.parquet"))]
-            if not dfs:
-                report[symbol] = {"missing": True}
-                continue
-            df = pd.concat(dfs).sort_values("date").reset_index(drop=True)
-            issues: list[str] = []
-            if df["date"].duplicated().any():
-                issues.append("duplicate_dates")
-            if not df["date"].is_monotonic_increasing:
-                issues.append("not_sorted")
-            if set(CANON_COLS) - set(df.columns):
-                issues.append("missing_cols")
-            if df.isna().any().any():
-                issues.append("nan_values")
-            if (df["date"].dt.weekday >= 5).any():
-                issues.append("weekend")
-            expected = pd.date_range(df["date"].min(), df["date"].max(), freq="B")
-            missing = expected.difference(df["date"])
-            if not missing.empty:
-                issues.append("gaps")
-            report[symbol] = {"issues": issues}
+                return "missing", {"missing": True}
+            if fast:
+                files = [f for f in layout.symbol_files(sym_dir) if layout.file_month(f)]
+                res = self._check_symbol_stats(files) if files else None
+                if res is not None:
+                    return "fast", res
+            return "full", self._check_symbol_full(sym_dir)
+
+        symbols = list(symbols)
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as exc:
+            results = list(exc.map(check, symbols))
+        report = {sym: res for sym, (_, res) in zip(symbols, results)}
+        kinds = [kind for kind, _ in results]
+        log.info(
+            "INTEGRITY symbols=%d fast=%d full=%d workers=%d took=%.3fs",
+            len(symbols),
+            kinds.count("fast"),
+            kinds.count("full"),
+            workers,
+            time.perf_counter() - t0,
+        )
         out = self.manifest_path.parent / "integrity_report.json"
         with open(out, "w") as f:
             json.dump(report, f, indent=2, sort_keys=True)
         return report
+
+
+def _stored_dates(sym_dir: Path, month: str) -> pd.Series:
+    """Dates already stored for ``month`` (``YYYYMM``); reads only the date column."""
+
+    def read():
+        files = [f for f in layout.symbol_files(sym_dir) if layout.file_month(f) == month]
+        cols = [pq.read_table(f, columns=["date"]).column("date").to_pandas() for f in files]
+        if not cols:
+            return pd.Series([], dtype="datetime64[ns]")
+        return pd.concat(cols, ignore_index=True)
+
+    return layout.read_retrying(read)
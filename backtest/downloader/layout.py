@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import os
+import re
+import time
+from pathlib import Path
+from typing import Callable, Iterable, List, Sequence, TypeVar
+
+import pandas as pd
+
+# symbol=<SYM>/part-YYYYMM.parquet           sıkıştırılmış aylık parça
+# symbol=<SYM>/delta-YYYYMM-<seq>.parquet    sonradan eklenen barlar
+_PART_RE = re.compile(r"^part-(\d{6})\.parquet$")
+_DELTA_RE = re.compile(r"^delta-(\d{6})-(\d+)\.parquet$")
+
+T = TypeVar("T")
+
+
+def part_path(sym_dir: Path, month: str) -> Path:
+    return sym_dir / f"part-{month}.parquet"
+
+
+def new_delta_path(sym_dir: Path, month: str) -> Path:
+    return sym_dir / f"delta-{month}-{time.time_ns()}.parquet"
+
+
+def file_month(path: Path) -> str | None:
+    """``YYYYMM`` of a part or delta file, ``None`` for other names."""
+    m = _PART_RE.match(path.name) or _DELTA_RE.match(path.name)
+    return m.group(1) if m else None
+
+
+def is_delta(path: Path) -> bool:
+    return _DELTA_RE.match(path.name) is not None
+
+
+def _order_key(path: Path):
+    m = _PART_RE.match(path.name)
+    if m:
+        return (m.group(1), 0, 0, path.name)
+    m = _DELTA_RE.match(path.name)
+    if m:
+        return (m.group(1), 1, int(m.group(2)), path.name)
+    return ("", 0, 0, path.name)
+
+
+def ordered_files(paths: Iterable[Path]) -> List[Path]:
+    """Sort so that each month's part precedes its deltas, deltas by write order."""
+    return sorted(paths, key=_order_key)
+
+
+def symbol_files(sym_dir: Path) -> List[Path]:
+    return ordered_files(sym_dir.glob("*.parquet"))
+
+
+def merge_frames(frames: Sequence[pd.DataFrame], date_col: str = "date") -> pd.DataFrame:
+    """Merged view of a part and its deltas: first row per ``date`` wins, sorted.
+
+    Frames must be in :func:`ordered_files` order; this matches the old
+    read-concat-``drop_duplicates`` write path, where existing rows won.
+    """
+    df = pd.concat(frames, ignore_index=True)
+    return df.drop_duplicates(date_col).sort_values(date_col).reset_index(drop=True)
+
+
+def read_retrying(read: Callable[[], T], attempts: int = 3) -> T:
+    """Call *read*, running it again when a file it listed has vanished.
+
+    Compaction removes a month's delta files after replacing its part, so
+    a reader that listed them just before gets ``FileNotFoundError``.
+    *read* must list the files itself; a retry then sees the compacted
+    layout, which holds the same rows.
+    """
+    for attempt in range(attempts):
+        try:
+            return read()
+        except FileNotFoundError:
+            if attempt == attempts - 1:
+                raise
+            time.sleep(0.05 * (attempt + 1))
+    raise AssertionError("unreachable")  # pragma: no cover
+
+
+def read_merged(sym_dir: Path, date_col: str = "date") -> pd.DataFrame | None:
+    """Merged view of every part and delta file of one ``symbol=`` directory."""
+
+    def read():
+        files = [f for f in symbol_files(sym_dir) if file_month(f) is not None]
+        if not files:
+            return None
+        return merge_frames([pd.read_parquet(p) for p in files], date_col)
+
+    return read_retrying(read)
+
+
+def write_parquet_atomic(df: pd.DataFrame, path: Path, **kwargs) -> None:
+    """Write *df* through a temporary file; ``kwargs`` go to ``to_parquet``."""
+    tmp = path.with_name(path.name + ".tmp")
+    df.to_parquet(tmp, index=False, **kwargs)
+    os.replace(tmp, path)
+
+
+__all__ = [
+    "file_month",
+    "is_delta",
+    "merge_frames",
+    "new_delta_path",
+    "ordered_files",
+    "part_path",
+    "read_merged",
+    "read_retrying",
+    "symbol_files",
+    "write_parquet_atomic",
+]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+import threading
+import time
 from datetime import date
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import pandas as pd
 
@@ -9,15 +11,29 @@ from .base import BaseProvider
 
 
 class StubProvider(BaseProvider):
-    """Provider generating deterministic synthetic data for tests."""
+    """Provider generating deterministic synthetic data for tests.
+
+    ``latency`` seconds are slept per call to mimic a remote source;
+    the first ``fail_first`` calls of every symbol raise ``ConnectionError``.
+    """
 
     name = "stub"
 
-    def __init__(self) -> None:
+    def __init__(self, latency: float = 0.0, fail_first: int = 0) -> None:
         self.calls: List[Tuple[str, date, date]] = []
+        self.latency = latency
+        self.fail_first = fail_first
+        self._attempts: Dict[str, int] = {}
+        self._mu = threading.Lock()
 
     def fetch(self, symbol: str, start: date, end: date) -> pd.DataFrame:
-        self.calls.append((symbol, start, end))
+        with self._mu:
+            self.calls.append((symbol, start, end))
+            self._attempts[symbol] = n_try = self._attempts.get(symbol, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        if n_try <= self.fail_first:
+            raise ConnectionError(f"stub: geçici hata ({symbol}, deneme {n_try})")
         dates = pd.date_range(start, end, freq="B")
         n = len(dates)
         data = {
@@ -1,12 +1,17 @@
 from .errors import DSLError
 from .evaluator import Evaluator, SeriesContext
 from .functions import FUNCTIONS
+from .matrix import MatrixContext, MatrixEvaluator
 from .parser import parse_expression
+from .planner import FilterPlan
 
 __all__ = [
     "DSLError",
     "parse_expression",
     "Evaluator",
+    "FilterPlan",
+    "MatrixContext",
+    "MatrixEvaluator",
     "SeriesContext",
     "FUNCTIONS",
 ]
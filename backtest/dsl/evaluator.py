@@ -48,7 +48,10 @@ class Evaluator:
 
     def eval(self, expr: str) -> pd.Series:
         tree = parse_expression(expr)
-        res = self._eval_node(tree.body)
+        return self._to_mask(self._eval_node(tree.body))
+
+    @staticmethod
+    def _to_mask(res) -> pd.Series:
         # Bool dtype garanti et; NaN→False
         if isinstance(res, pd.Series):
             if res.dtype != bool:
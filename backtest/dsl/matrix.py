@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import ast
+from typing import Any, Callable, Dict, Iterable, Mapping
+
+import numpy as np
+import pandas as pd
+
+from .errors import DSLBadArgs, DSLUnknownName
+from .evaluator import _ARITH, _CMPOP, Evaluator, SeriesContext
+from .parser import parse_expression
+
+
+def _prev(a: np.ndarray) -> np.ndarray:
+    """Shift rows down by one along the date axis (``Series.shift(1)``)."""
+    out = np.empty(a.shape, dtype=np.float64)
+    out[:1] = np.nan
+    out[1:] = a[:-1]
+    return out
+
+
+def _finish_cross(out: np.ndarray) -> np.ndarray:
+    out[-1:] = False  # filters.engine: son satır daima False
+    return out
+
+
+def _require_matrix(a, name: str) -> np.ndarray:
+    if not isinstance(a, np.ndarray):
+        raise DSLBadArgs(f"{name}: ilk argüman seri olmalı", code="DF004")
+    return a
+
+
+def cross_up(a: np.ndarray, b) -> np.ndarray:
+    """Column-wise ``filters.engine.cross_up``."""
+    a = _require_matrix(a, "cross_up")
+    if isinstance(b, np.ndarray):
+        out = (_prev(a) <= _prev(b)) & (a > b)
+    else:
+        out = (_prev(a) <= b) & (a > b)
+    return _finish_cross(out)
+
+
+def cross_down(a: np.ndarray, b) -> np.ndarray:
+    """Column-wise ``filters.engine.cross_down``.
+
+    Series with a single distinct value are treated as a level crossing
+    (``prev > level & cur <= level``), exactly like the pandas helper.
+    """
+    a = _require_matrix(a, "cross_down")
+    if isinstance(b, np.ndarray):
+        bf = b.astype(np.float64, copy=False)
+        finite = ~np.isnan(bf)
+        lo = np.where(finite, bf, np.inf).min(axis=0, initial=np.inf)
+        hi = np.where(finite, bf, -np.inf).max(axis=0, initial=-np.inf)
+        constant = finite.any(axis=0) & (lo == hi)
+        level = bf[:1]
+        by_level = (_prev(a) > level) & (a <= level)
+        general = (_prev(a) >= _prev(bf)) & (a < bf)
+        out = np.where(constant, by_level, general)
+    else:
+        out = (_prev(a) > b) & (a <= b)
+    return _finish_cross(out)
+
+
+MATRIX_FUNCTIONS: Dict[str, Callable[..., np.ndarray]] = {
+    "cross_up": cross_up,
+    "cross_down": cross_down,
+}
+
+
+class MatrixContext(SeriesContext):
+    """Name → ``date × symbol`` matrix (or scalar) context.
+
+    Wide DataFrames are converted once to contiguous ``float64`` arrays;
+    all matrices must share one shape. ``index``/``columns`` label the
+    date and symbol axes of evaluation results.
+    """
+
+    def __init__(
+        self,
+        values: Mapping[str, Any],
+        index: Iterable | None = None,
+        columns: Iterable | None = None,
+    ):
+        converted: Dict[str, Any] = {}
+        shape = None
+        for name, val in values.items():
+            if isinstance(val, pd.DataFrame):
+                if index is None:
+                    index = val.index
+                if columns is None:
+                    columns = val.columns
+                val = val.to_numpy(dtype=np.float64, na_value=np.nan)
+            if isinstance(val, np.ndarray):
+                if val.dtype != bool:
+                    val = val.astype(np.float64, copy=False)
+                val = np.ascontiguousarray(val)
+                if val.ndim != 2:
+                    raise ValueError(f"{name}: 2 boyutlu matris bekleniyor")
+                if shape is None:
+                    shape = val.shape
+                elif val.shape != shape:
+                    raise ValueError(f"{name}: şekil uyuşmuyor {val.shape} != {shape}")
+            converted[name] = val
+        super().__init__(converted)
+        self.shape = shape
+        self.index = pd.Index(index) if index is not None else None
+        self.columns = pd.Index(columns) if columns is not None else None
+
+    @classmethod
+    def from_long(
+        cls,
+        df: pd.DataFrame,
+        names: Iterable[str],
+        *,
+        date_col: str = "date",
+        symbol_col: str = "symbol",
+    ) -> "MatrixContext":
+        """Pivot a long ``(date, symbol)`` panel into one matrix per name."""
+        names = list(names)
+        wide = df.pivot_table(
+            index=date_col, columns=symbol_col, values=names, aggfunc="last", dropna=False
+        ).sort_index()
+        dates = wide.index
+        symbols = wide.columns.get_level_values(1).unique()
+        values = {n: wide[n].reindex(columns=symbols) for n in names}
+        return cls(values, index=dates, columns=symbols)
+
+
+class MatrixEvaluator(Evaluator):
+    """DSL evaluator over ``date × symbol`` matrices.
+
+    One call evaluates a filter for every symbol at once; each column of
+    the result equals :class:`Evaluator` run on that symbol's series (same
+    NaN→False rule, ``and`` quirk and cross semantics).
+    """
+
+    def __init__(self, context: MatrixContext):
+        super().__init__(context)
+
+    def eval(self, expr: str) -> np.ndarray:
+        tree = parse_expression(expr)
+        with np.errstate(all="ignore"):
+            return self._to_mask(self._eval_node(tree.body))
+
+    def eval_frame(self, expr: str) -> pd.DataFrame:
+        """Evaluate *expr* and label the mask with the context axes."""
+        return pd.DataFrame(self.eval(expr), index=self.ctx.index, columns=self.ctx.columns)
+
+    def _to_mask(self, res) -> np.ndarray:
+        if isinstance(res, np.ndarray):
+            if res.dtype != bool:
+                res = np.nan_to_num(res.astype(np.float64), nan=0.0) != 0.0
+            return res
+        if isinstance(res, (int, float, bool, np.bool_, np.number)):
+            shape = self.ctx.shape if self.ctx.shape is not None else (1, 1)
+            return np.full(shape, bool(res))
+        raise TypeError("Beklenmeyen eval sonucu")
+
+    def _eval_node(self, node):
+        if isinstance(node, ast.BinOp):
+            left = self._eval_node(node.left)
+            right = self._eval_node(node.right)
+            return _ARITH[type(node.op)](left, right)
+        if isinstance(node, ast.UnaryOp):
+            operand = self._eval_node(node.operand)
+            if isinstance(node.op, ast.Not):
+                return ~operand if isinstance(operand, np.ndarray) else (not operand)
+            if isinstance(node.op, ast.USub):
+                return -operand
+            if isinstance(node.op, ast.UAdd):
+                return +operand
+        if isinstance(node, ast.BoolOp):
+            if isinstance(node.op, ast.And):
+                out = self._eval_node(node.values[0])
+                for v in node.values[1:]:
+                    self._eval_node(v)  # yan etkiler/isim kontrolü
+                return out
+            if isinstance(node.op, ast.Or):
+                vals = [self._eval_node(v) for v in node.values]
+                out = vals[0]
+                for v in vals[1:]:
+                    out = (out | v) if isinstance(out, np.ndarray) else (bool(out) or bool(v))
+                return out
+        if isinstance(node, ast.Compare):
+            left = self._eval_node(node.left)
+            result = None
+            for op_node, comp in zip(node.ops, node.comparators):
+                right = self._eval_node(comp)
+                chunk = _CMPOP[type(op_node)](left, right)
+                result = chunk if result is None else (result & chunk)
+                left = right
+            return result
+        if isinstance(node, ast.Name):
+            return self.ctx.get(node.id)
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Call):
+            func_name = getattr(node.func, "id", None)
+            if func_name not in MATRIX_FUNCTIONS:
+                raise DSLUnknownName(f"Tanımsız fonksiyon: {func_name}", code="DF003")
+            fn = MATRIX_FUNCTIONS[func_name]
+            args = [self._eval_node(a) for a in node.args]
+            try:
+                return fn(*args)
+            except TypeError as e:
+                raise DSLBadArgs(str(e), code="DF004") from e
+        raise TypeError(f"Beklenmeyen AST düğümü: {type(node).__name__}")
+
+
+__all__ = ["MatrixContext", "MatrixEvaluator", "MATRIX_FUNCTIONS"]
@@ -4,6 +4,9 @@ import ast
 
 from .errors import DSLForbiddenNode, DSLParseError
 
+_ALLOWED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod)
+_ALLOWED_UNARY = (ast.Not, ast.USub, ast.UAdd)
+
 # Whitelist edilen node tipleri
 _ALLOWED_NODES = (
     ast.Expression,
@@ -24,9 +27,9 @@ _ALLOWED_NODES = (
     ast.LtE,
     ast.Eq,
     ast.NotEq,
+    *_ALLOWED_BINOPS,
+    *_ALLOWED_UNARY,
 )
-_ALLOWED_BINOPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Mod)
-_ALLOWED_UNARY = (ast.Not, ast.USub, ast.UAdd)
 _ALLOWED_CMPS = (ast.Gt, ast.Lt, ast.GtE, ast.LtE, ast.Eq, ast.NotEq)
 _ALLOWED_BOOLOPS = (ast.And, ast.Or)
 
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import ast
+from typing import Dict, Iterator, Mapping
+
+import pandas as pd
+
+from .evaluator import Evaluator, SeriesContext
+from .parser import parse_expression
+
+# İşlem sayılan (yaprak olmayan) düğümler; Name/Constant yalnız sözlük bakışıdır
+_OPS = (ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.Call)
+
+
+def _children(node: ast.AST) -> Iterator[ast.AST]:
+    """Yield the sub-nodes :class:`Evaluator` evaluates for *node*."""
+    if isinstance(node, ast.BinOp):
+        yield node.left
+        yield node.right
+    elif isinstance(node, ast.UnaryOp):
+        yield node.operand
+    elif isinstance(node, ast.BoolOp):
+        yield from node.values
+    elif isinstance(node, ast.Compare):
+        yield node.left
+        yield from node.comparators
+    elif isinstance(node, ast.Call):
+        yield from node.args
+
+
+class _MemoEvaluator(Evaluator):
+    """Evaluator that computes each structurally distinct node once."""
+
+    def __init__(self, context: SeriesContext, keys: Mapping[int, str]):
+        super().__init__(context)
+        self._keys = keys
+        self._memo: Dict[str, object] = {}
+        self.evaluations = 0
+
+    def _eval_node(self, node):
+        key = self._keys.get(id(node))
+        if key is None:
+            return super()._eval_node(node)
+        if key in self._memo:
+            return self._memo[key]
+        value = super()._eval_node(node)
+        self._memo[key] = value
+        if isinstance(node, _OPS):
+            self.evaluations += 1
+        return value
+
+
+class FilterPlan:
+    """All filters of a set merged into one expression DAG.
+
+    Sub-expressions are identified structurally (``ast.dump``), so
+    ``close > sma_20`` shared by many filters is evaluated once per
+    context. Semantics are those of :meth:`Evaluator.eval` for each filter.
+    """
+
+    def __init__(self, filters: Mapping[str, str]):
+        self.trees: Dict[str, ast.AST] = {
+            code: parse_expression(expr).body for code, expr in filters.items()
+        }
+        self._keys: Dict[int, str] = {}
+        total = 0
+        unique: set[str] = set()
+        for tree in self.trees.values():
+            stack = [tree]
+            while stack:
+                node = stack.pop()
+                key = ast.dump(node)
+                self._keys[id(node)] = key
+                if isinstance(node, _OPS):
+                    total += 1
+                    unique.add(key)
+                stack.extend(_children(node))
+        self.total_ops = total
+        self.unique_ops = len(unique)
+        self.last_evaluations = 0
+
+    @property
+    def saved(self) -> int:
+        """Operator evaluations avoided versus evaluating filters one by one."""
+        return self.total_ops - self.unique_ops
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "filters": len(self.trees),
+            "ops": self.total_ops,
+            "unique_ops": self.unique_ops,
+            "saved": self.saved,
+        }
+
+    def evaluate(self, context: SeriesContext | Mapping[str, object]) -> Dict[str, pd.Series]:
+        """Return ``{code: mask}`` for every filter, sharing common sub-terms."""
+        if not isinstance(context, SeriesContext):
+            context = SeriesContext(context)
+        ev = _MemoEvaluator(context, self._keys)
+        masks = {code: ev._to_mask(ev._eval_node(tree)) for code, tree in self.trees.items()}
+        self.last_evaluations = ev.evaluations
+        return masks
+
+
+__all__ = ["FilterPlan"]
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import ast
+import io
+import tokenize
+from functools import lru_cache
+
+import polars as pl
+
+from backtest.filters.engine import compile_filter
+
+from .errors import DSLBadArgs, DSLUnknownName
+from .evaluator import _ARITH, _CMPOP
+from .parser import parse_expression
+
+_BOOL_TOKENS = {"&": "and", "|": "or"}
+
+
+def _to_python_bool_ops(text: str) -> str:
+    """Rewrite ``&``/``|`` to ``and``/``or`` the way ``pandas.eval`` reads them.
+
+    Normalised filter text uses the pandas operators whose precedence sits
+    below comparisons; Python's ``ast`` would bind them tighter.
+    """
+    toks = []
+    for tok in tokenize.generate_tokens(io.StringIO(text).readline):
+        if tok.type == tokenize.OP and tok.string in _BOOL_TOKENS:
+            toks.append((tokenize.NAME, _BOOL_TOKENS[tok.string]))
+        else:
+            toks.append((tok.type, tok.string))
+    return tokenize.untokenize(toks).strip()
+
+
+class _Translator:
+    def __init__(self, by: str, order: str):
+        self.by = by
+        self.order = order
+
+    def _prev(self, e: pl.Expr) -> pl.Expr:
+        return e.shift(1).over(self.by)
+
+    def _not_last(self) -> pl.Expr:
+        # filters.engine: sembolün son satırında kesişim daima False
+        return pl.col(self.order).shift(-1).over(self.by).is_not_null()
+
+    def cross_up(self, a, b) -> pl.Expr:
+        b_prev = self._prev(b) if isinstance(b, pl.Expr) else b
+        return ((self._prev(a) <= b_prev) & (a > b)).fill_null(False) & self._not_last()
+
+    def cross_down(self, a, b) -> pl.Expr:
+        if isinstance(b, pl.Expr):
+            constant = b.drop_nulls().n_unique().over(self.by) == 1
+            level = b.first().over(self.by)
+            by_level = (self._prev(a) > level) & (a <= level)
+            general = (self._prev(a) >= self._prev(b)) & (a < b)
+            out = pl.when(constant).then(by_level).otherwise(general)
+        else:
+            out = (self._prev(a) > b) & (a <= b)
+        return out.fill_null(False) & self._not_last()
+
+    def node(self, node):
+        if isinstance(node, ast.BinOp):
+            return _ARITH[type(node.op)](self.node(node.left), self.node(node.right))
+        if isinstance(node, ast.UnaryOp):
+            operand = self.node(node.operand)
+            if isinstance(node.op, ast.Not):
+                return ~operand if isinstance(operand, pl.Expr) else (not operand)
+            if isinstance(node.op, ast.USub):
+                return -operand
+            return +operand
+        if isinstance(node, ast.BoolOp):
+            vals = [self._mask(self.node(v)) for v in node.values]
+            out = vals[0]
+            for v in vals[1:]:
+                out = (out & v) if isinstance(node.op, ast.And) else (out | v)
+            return out
+        if isinstance(node, ast.Compare):
+            left = self.node(node.left)
+            result = None
+            for op_node, comp in zip(node.ops, node.comparators):
+                right = self.node(comp)
+                chunk = _CMPOP[type(op_node)](left, right)
+                if isinstance(chunk, pl.Expr):
+                    chunk = chunk.fill_null(False)  # NaN/eksik → False (pandas gibi)
+                result = chunk if result is None else (result & chunk)
+                left = right
+            return result
+        if isinstance(node, ast.Name):
+            if node.id in ("True", "False"):
+                return node.id == "True"
+            return pl.col(node.id)
+        if isinstance(node, ast.Constant):
+            return node.value
+        if isinstance(node, ast.Call):
+            name = getattr(node.func, "id", None)
+            if name not in ("cross_up", "cross_down"):
+                raise DSLUnknownName(f"Tanımsız fonksiyon: {name}", code="DF003")
+            args = [self.node(a) for a in node.args]
+            if len(args) != 2 or not isinstance(args[0], pl.Expr):
+                raise DSLBadArgs(f"{name}: iki argüman, ilki seri olmalı", code="DF004")
+            return getattr(self, name)(*args)
+        raise TypeError(f"Beklenmeyen AST düğümü: {type(node).__name__}")
+
+    def _mask(self, res):
+        if isinstance(res, pl.Expr):
+            return res.cast(pl.Boolean, strict=False).fill_null(False)
+        return pl.lit(bool(res))
+
+
+@lru_cache(maxsize=1024)
+def to_polars_expr(expr: str, *, by: str = "symbol", order: str = "date") -> pl.Expr:
+    """Translate a filter expression into a boolean Polars expression.
+
+    The raw expression goes through :func:`backtest.filters.engine.compile_filter`
+    (aliases, ``CROSSUP`` …) and the DSL whitelist, so the mask matches
+    ``filters.engine.evaluate`` applied per symbol: ``and``/``or`` are
+    element-wise, missing values compare as ``False`` and cross helpers
+    shift within ``by`` (rows must be ordered by ``order`` inside each group).
+    Column references use the canonical (``normalize_token``) names.
+    """
+    text = _to_python_bool_ops(compile_filter(expr).expr)
+    tree = parse_expression(text)
+    tr = _Translator(by, order)
+    res = tr.node(tree.body)
+    if not isinstance(res, pl.Expr):
+        res = pl.lit(bool(res))
+    elif _is_boolean(tree.body):
+        res = res.fill_null(False)
+    else:
+        # aritmetik sonuç: 0/NaN → False, diğer → True
+        res = res.cast(pl.Float64, strict=False).fill_nan(0.0).fill_null(0.0) != 0.0
+    return res.alias(expr)
+
+
+def _is_boolean(node) -> bool:
+    if isinstance(node, (ast.Compare, ast.BoolOp, ast.Call)):
+        return True
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.Not):
+        return True
+    return False
+
+
+__all__ = ["to_polars_expr"]
@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Mapping
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Iterable, Mapping
 
 import numpy as np
 import pandas as pd
@@ -67,9 +69,13 @@ def _build_locals(df: pd.DataFrame) -> dict[str, pd.Series]:
 
 
 def _validate_tokens(expr: str, locals_map: Mapping[str, object]):
+    _check_tokens(_TOKEN_RE.findall(expr), locals_map)
+
+
+def _check_tokens(tokens: Iterable[str], locals_map: Mapping[str, object]):
     undefined: list[str] = []
     unsafe: list[str] = []
-    for tok in _TOKEN_RE.findall(expr):
+    for tok in tokens:
         if tok in {"and", "or", "not"} or tok.lower() in {"true", "false"}:
             continue
         if tok not in locals_map:
@@ -107,25 +113,69 @@ def _normalise_boolean_literals(expr: str) -> str:
     return _BOOL_RE.sub(repl, expr)
 
 
+_FUNCTIONS = {"cross_up": cross_up, "cross_down": cross_down}
+
+
+@lru_cache(maxsize=256)
+def _column_lookup(columns: tuple) -> dict[str, object]:
+    """Map canonical token -> column label (last duplicate wins, as in ``_build_locals``)."""
+    return {normalize_token(c): c for c in columns}
+
+
+@dataclass(frozen=True)
+class CompiledFilter:
+    """Filter expression normalised, canonicalised and tokenised once.
+
+    ``names`` holds the referenced identifiers; :meth:`evaluate` binds only
+    those columns of *df* instead of the whole frame.
+    """
+
+    raw: str
+    expr: str
+    names: tuple[str, ...]
+
+    def evaluate(self, df: pd.DataFrame) -> pd.Series:
+        lookup = _column_lookup(tuple(df.columns))
+        locals_map: dict[str, object] = {
+            name: df[lookup[name]] for name in self.names if name in lookup
+        }
+        locals_map.update(_FUNCTIONS)
+        _check_tokens(self.names, locals_map)
+        expr = self.expr
+        try:
+            result = pd.eval(expr, engine="python", local_dict=locals_map)
+            if isinstance(result, (bool, np.bool_, int, float)):
+                return pd.Series([bool(result)] * len(df), index=df.index)
+            return result
+        except SyntaxError as e:
+            # Propagate syntax errors so callers can decide how to handle them.
+            raise SyntaxError(str(e)) from e
+        except Exception as e:  # pragma: no cover - defensive
+            log.exception("evaluate failed", extra={"extra_fields": {"expr": expr}})
+            raise ValueError(f"evaluate failed: {expr} → {e}") from e
+
+
+@lru_cache(maxsize=1024)
+def compile_filter(expr: str) -> CompiledFilter:
+    """Return the (cached) :class:`CompiledFilter` for the raw *expr*."""
+
+    text = normalize_expr(expr)[0]
+    text = _canonicalise_tokens(text)
+    text = _normalise_boolean_literals(text)
+    names = tuple(
+        dict.fromkeys(
+            tok
+            for tok in _TOKEN_RE.findall(text)
+            if tok not in {"and", "or", "not"} and tok.lower() not in {"true", "false"}
+        )
+    )
+    return CompiledFilter(raw=expr, expr=text, names=names)
+
+
 def evaluate(df: pd.DataFrame, expr: str) -> pd.Series:
     """Evaluate a normalised filter expression on *df*."""
 
-    expr = normalize_expr(expr)[0]
-    expr = _canonicalise_tokens(expr)
-    expr = _normalise_boolean_literals(expr)
-    locals_map = _build_locals(df)
-    _validate_tokens(expr, locals_map)
-    try:
-        result = pd.eval(expr, engine="python", local_dict=locals_map)
-        if isinstance(result, (bool, np.bool_, int, float)):
-            return pd.Series([bool(result)] * len(df), index=df.index)
-        return result
-    except SyntaxError as e:
-        # Propagate syntax errors so callers can decide how to handle them.
-        raise SyntaxError(str(e)) from e
-    except Exception as e:  # pragma: no cover - defensive
-        log.exception("evaluate failed", extra={"extra_fields": {"expr": expr}})
-        raise ValueError(f"evaluate failed: {expr} → {e}") from e
-
-
-__all__ = ["evaluate", "cross_up", "cross_down"]
+    return compile_filter(expr).evaluate(df)
+
+
+__all__ = ["evaluate", "compile_filter", "CompiledFilter", "cross_up", "cross_down"]
@@ -0,0 +1,489 @@
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+# Her fonksiyon (T, N) dizisi üzerinde sütun bazında çalışır: satırlar zaman
+# sırası, sütunlar semboller. Tek boyutlu girdi tek sütun olarak işlenir.
+# Formüller pandas_ta 0.3.14b0 (sma/ema/wma/rsi/adx/macd/bbands) ve
+# backtest.indicators.compute (cci/stochrsi/mom/roc) ile aynıdır.
+
+_EPS = np.finfo(float).eps
+
+
+def _as_2d(x) -> np.ndarray:
+    arr = np.asarray(x, dtype="float64")
+    return arr.reshape(-1, 1) if arr.ndim == 1 else arr
+
+
+def _rolling(x: np.ndarray, n: int, fn: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """``fn`` over trailing windows of ``n`` rows; any NaN in a window gives NaN."""
+    x = _as_2d(x)
+    out = np.full(x.shape, np.nan)
+    if n <= 0 or x.shape[0] < n:
+        return out
+    win = sliding_window_view(x, n, axis=0)  # (T-n+1, N, n)
+    out[n - 1 :] = fn(win)
+    return out
+
+
+def _shift(x: np.ndarray, n: int) -> np.ndarray:
+    x = _as_2d(x)
+    out = np.full(x.shape, np.nan)
+    if n < x.shape[0]:
+        out[n:] = x[:-n] if n else x
+    return out
+
+
+def ewm_mean(x, alpha: float, *, adjust: bool, min_periods: int = 0, ctx=None) -> np.ndarray:
+    """``Series.ewm(alpha=..., adjust=...).mean()`` applied to every column.
+
+    Mirrors pandas' recursion (``ignore_na=False``): missing values decay the
+    weight of older observations and ``min_periods`` counts observations.
+    ``ctx`` (see :mod:`backtest.indicators.state`) seeds the recursion from a
+    carried state and snapshots it at a given row.
+    """
+    x = _as_2d(x)
+    T, N = x.shape
+    out = np.full((T, N), np.nan)
+    factor = 1.0 - alpha
+    new_wt = 1.0 if adjust else alpha
+    minp = max(min_periods, 1)
+    weighted = np.full(N, np.nan)
+    old_wt = np.ones(N)
+    nobs = np.zeros(N, dtype=np.int64)
+    start = snap = saved = None
+    if ctx is not None:
+        (weighted, old_wt, nobs), start, snap = ctx.ewm_begin(N)
+        saved = [weighted.copy(), old_wt.copy(), nobs.copy()]
+    for t in range(T):
+        cur = x[t]
+        act = True if start is None else t >= start
+        obs = act & ~np.isnan(cur)
+        nobs += obs
+        started = act & ~np.isnan(weighted)
+        old_wt = np.where(started, old_wt * factor, old_wt)
+        upd = started & obs & (weighted != cur)
+        mixed = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+        weighted = np.where(upd, mixed, weighted)
+        grow = started & obs
+        old_wt = np.where(grow, old_wt + new_wt if adjust else 1.0, old_wt)
+        first = act & ~started & obs
+        weighted = np.where(first, cur, weighted)
+        out[t] = np.where(act & (nobs >= minp), weighted, np.nan)
+        if snap is not None:
+            hit = snap == t
+            if hit.any():
+                for dst, src in zip(saved, (weighted, old_wt, nobs)):
+                    dst[hit] = src[hit]
+    if ctx is not None:
+        ctx.ewm_end(saved)
+    return out
+
+
+def rma(x, n: int, ctx=None) -> np.ndarray:
+    """Wilder average (``pandas_ta.rma``)."""
+    return ewm_mean(x, 1.0 / n, adjust=True, min_periods=n, ctx=ctx)
+
+
+def sma(x, n: int) -> np.ndarray:
+    return _rolling(x, n, lambda w: w.mean(axis=-1))
+
+
+def ema(x, n: int, ctx=None) -> np.ndarray:
+    """``pandas_ta.ema``: seeded with the SMA of each column's first ``n`` values.
+
+    The seed window starts at the column's first non-missing row, so a
+    column that begins later (or a MACD line) is treated as its own series.
+    """
+    x = _as_2d(x).copy()
+    T, N = x.shape
+    valid = ~np.isnan(x)
+    start = np.where(valid.any(axis=0), valid.argmax(axis=0), T)
+    for j in range(N):
+        if ctx is not None and not ctx.fresh[j]:
+            continue  # taşınan durum: tohum SMA zaten uygulanmış
+        s = start[j]
+        if T - s < n:
+            x[:, j] = np.nan
+            continue
+        seed = np.nanmean(x[s : s + n, j]) if valid[s : s + n, j].any() else np.nan
+        x[s : s + n - 1, j] = np.nan
+        x[s + n - 1, j] = seed
+    return ewm_mean(x, 2.0 / (n + 1.0), adjust=False, ctx=ctx)
+
+
+def wma(x, n: int) -> np.ndarray:
+    weights = np.arange(1, n + 1, dtype="float64")
+    return _rolling(x, n, lambda w: (w @ weights) / (0.5 * n * (n + 1)))
+
+
+def rsi(x, n: int, *, min_periods: int | None = None, ctx=None) -> np.ndarray:
+    """``pandas_ta.rsi``; ``min_periods=0`` gives the unwarmed variant of ``compute``."""
+    minp = n if min_periods is None else min_periods
+    delta = _as_2d(x) - _shift(x, 1)
+    pos = np.where(delta < 0, 0.0, delta)
+    neg = np.where(delta > 0, 0.0, delta)
+    up = ewm_mean(pos, 1.0 / n, adjust=True, min_periods=minp, ctx=ctx)
+    down = ewm_mean(neg, 1.0 / n, adjust=True, min_periods=minp, ctx=ctx)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return 100.0 * up / (up + np.abs(down))
+
+
+def true_range(high, low, close) -> np.ndarray:
+    high, low = _as_2d(high), _as_2d(low)
+    hl = high - low
+    hl = hl + _EPS * (hl == 0).any(axis=0)  # pandas_ta.non_zero_range
+    prev = _shift(close, 1)
+    ranges = np.stack([hl, high - prev, prev - low])
+    with np.errstate(invalid="ignore"):
+        tr = np.fmax(np.fmax(np.abs(ranges[0]), np.abs(ranges[1])), np.abs(ranges[2]))
+    tr[:1] = np.nan
+    return tr
+
+
+def adx(high, low, close, n: int, ctx=None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(ADX, DMP, DMN)`` as in ``pandas_ta.adx`` with ``mamode='rma'``."""
+    high, low = _as_2d(high), _as_2d(low)
+    atr = rma(true_range(high, low, close), n, ctx)
+    up = high - _shift(high, 1)
+    dn = _shift(low, 1) - low
+    with np.errstate(invalid="ignore"):
+        pos = np.where(np.isnan(up) | np.isnan(dn), np.nan, ((up > dn) & (up > 0)) * up)
+        neg = np.where(np.isnan(up) | np.isnan(dn), np.nan, ((dn > up) & (dn > 0)) * dn)
+    pos = np.where(np.abs(pos) < _EPS, 0.0, pos)
+    neg = np.where(np.abs(neg) < _EPS, 0.0, neg)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        k = 100.0 / atr
+        dmp = k * rma(pos, n, ctx)
+        dmn = k * rma(neg, n, ctx)
+        dx = 100.0 * np.abs(dmp - dmn) / (dmp + dmn)
+    return rma(dx, n, ctx), dmp, dmn
+
+
+def macd(
+    x, fast: int, slow: int, signal: int, ctx=None
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(MACD, signal, histogram)``; the signal EMA starts at the first MACD value."""
+    line = ema(x, fast, ctx) - ema(x, slow, ctx)
+    sig = ema(line, signal, ctx)
+    return line, sig, line - sig
+
+
+def bbands(x, n: int, std: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """``(lower, mid, upper)`` with population standard deviation (``ddof=0``)."""
+    mid = sma(x, n)
+    dev = std * np.sqrt(_rolling(x, n, lambda w: w.var(axis=-1)))
+    return mid - dev, mid, mid + dev
+
+
+def cci(high, low, close, n: int) -> np.ndarray:
+    tp = (_as_2d(high) + _as_2d(low) + _as_2d(close)) / 3
+    mean = sma(tp, n)
+    md = sma(np.abs(tp - mean), n)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (tp - mean) / (0.015 * md)
+
+
+def stochrsi(
+    x, rsi_len: int, k: int, d: int, smooth: int, ctx=None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """``(%K, %D)`` of :func:`backtest.indicators.compute.ensure_stochrsi`."""
+    r = rsi(x, rsi_len, min_periods=0, ctx=ctx)
+    lo = _rolling(r, k, lambda w: w.min(axis=-1))
+    hi = _rolling(r, k, lambda w: w.max(axis=-1))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        stoch = (r - lo) / (hi - lo)
+    stoch_k = sma(stoch, smooth)
+    return stoch_k, sma(stoch_k, d)
+
+
+def mom(x, n: int) -> np.ndarray:
+    return _as_2d(x) - _shift(x, n)
+
+
+def roc(x, n: int) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _as_2d(x) / _shift(x, n) - 1.0
+
+
+# --------------------------------------------------------------------------
+# İsimlendirme: Precomputer / compute.py sütun adları
+
+
+@dataclass(frozen=True)
+class Spec:
+    """One parsed indicator request: kind, integer params, inputs and outputs."""
+
+    kind: str
+    params: Tuple[int, ...]
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+
+_PATTERNS: Dict[str, Tuple[re.Pattern, Tuple[str, ...]]] = {
+    "sma": (re.compile(r"^sma_(\d+)$"), ("close",)),
+    "ema": (re.compile(r"^ema_(\d+)$"), ("close",)),
+    "wma": (re.compile(r"^wma_(\d+)$"), ("close",)),
+    "rsi": (re.compile(r"^rsi_(\d+)$"), ("close",)),
+    "adx": (re.compile(r"^(?:adx|dmp|dmn)_(\d+)$"), ("high", "low", "close")),
+    "macd": (re.compile(r"^macd_(\d+)_(\d+)_(\d+)$"), ("close",)),
+    "bbands": (re.compile(r"^bb[hml]_(\d+)_(\d+)$"), ("close",)),
+    "cci": (re.compile(r"^cci_(\d+)$"), ("high", "low", "close")),
+    "stochrsi": (re.compile(r"^stochrsi_[kd]_(\d+)_(\d+)_(\d+)_(\d+)$"), ("close",)),
+    "mom": (re.compile(r"^mom_(\d+)$"), ("close",)),
+    "roc": (re.compile(r"^roc_(\d+)$"), ("close",)),
+}
+
+
+def _outputs(kind: str, params: Tuple[int, ...], name: str) -> Tuple[str, ...]:
+    p = "_".join(map(str, params))
+    if kind == "macd":
+        return (f"macd_{p}", f"macd_signal_{p}", f"macd_hist_{p}")
+    if kind == "bbands":
+        return (f"bbl_{p}", f"bbm_{p}", f"bbh_{p}")
+    if kind == "stochrsi":
+        return (f"stochrsi_k_{p}", f"stochrsi_d_{p}")
+    return (name,)
+
+
+def parse_spec(name: str) -> Spec | None:
+    """Parse a column name such as ``rsi_14`` or ``macd_12_26_9``; ``None`` if unknown."""
+    for kind, (pat, inputs) in _PATTERNS.items():
+        m = pat.match(name)
+        if m:
+            params = tuple(int(g) for g in m.groups())
+            return Spec(kind, params, inputs, _outputs(kind, params, name))
+    return None
+
+
+def compute_spec(spec: Spec, inputs: Dict[str, np.ndarray], ctx=None) -> Dict[str, np.ndarray]:
+    """Evaluate *spec* on ``(T, N)`` input matrices; returns ``{column: matrix}``.
+
+    ``ctx`` is only used by recursive kinds (ema, rsi, adx, macd, stochrsi).
+    """
+    k, p = spec.kind, spec.params
+    close = inputs["close"]
+    if k == "adx":
+        a, dp, dn = adx(inputs["high"], inputs["low"], close, p[0], ctx)
+        return {f"adx_{p[0]}": a, f"dmp_{p[0]}": dp, f"dmn_{p[0]}": dn}
+    if k == "cci":
+        return {spec.outputs[0]: cci(inputs["high"], inputs["low"], close, p[0])}
+    if k == "bbands":
+        return dict(zip(spec.outputs, bbands(close, *p)))
+    if k in ("macd", "stochrsi"):
+        fn = {"macd": macd, "stochrsi": stochrsi}[k]
+        return dict(zip(spec.outputs, fn(close, *p, ctx=ctx)))
+    if k in ("ema", "rsi"):
+        fn = {"ema": ema, "rsi": rsi}[k]
+        return {spec.outputs[0]: fn(close, p[0], ctx=ctx)}
+    fn = {"sma": sma, "wma": wma, "mom": mom, "roc": roc}[k]
+    return {spec.outputs[0]: fn(close, p[0])}
+
+
+def _decay_bars(alpha: float, tol: float) -> int:
+    """Bars after which the weight of older history in an EWM falls below *tol*."""
+    if alpha >= 1.0:
+        return 1
+    return int(np.ceil(np.log(tol) / np.log1p(-alpha)))
+
+
+def warmup(spec: Spec, tol: float = 1e-4) -> int:
+    """Bars of history *spec* needs before the first bar whose value is used.
+
+    Window kinds need their window (``sma``/``wma``/``bbands``/``mom``/
+    ``roc``; ``cci`` two chained windows). Recursive kinds need enough bars
+    for the discarded history to weigh less than *tol* in every EWM on the
+    path (about 4.6x the span for ``ema`` at the default ``tol=1e-4``), so
+    a value computed on the truncated series differs from the full-history
+    one by roughly ``tol`` times the spread of its input.
+    """
+    k, p = spec.kind, spec.params
+    if k in ("sma", "wma", "bbands", "mom", "roc"):
+        return p[0]
+    if k == "cci":
+        return 2 * p[0]
+    if k == "ema":
+        return max(p[0], _decay_bars(2.0 / (p[0] + 1.0), tol))
+    if k == "rsi":
+        return max(p[0], _decay_bars(1.0 / p[0], tol))
+    if k == "adx":
+        # ATR/DM yumuşatması ve ardından DX'in yumuşatması
+        return 2 * max(p[0], _decay_bars(1.0 / p[0], tol))
+    if k == "macd":
+        fast, slow, sig = p
+        slow_bars = max(max(fast, slow), _decay_bars(2.0 / (max(fast, slow) + 1.0), tol))
+        return slow_bars + max(sig, _decay_bars(2.0 / (sig + 1.0), tol))
+    if k == "stochrsi":
+        r, kk, d, smooth = p
+        return _decay_bars(1.0 / r, tol) + kk + smooth + d
+    raise ValueError(f"Desteklenmeyen gösterge: {k}")
+
+
+# --------------------------------------------------------------------------
+# Uzun panel <-> matris
+
+
+def _positions(df: pd.DataFrame, by: str, order: str) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Row and column of every ``df`` row in the packed ``bar × symbol`` layout."""
+    if by in df.columns:
+        cols, _ = pd.factorize(df[by], sort=False)
+    else:
+        cols = np.zeros(len(df), dtype=np.intp)
+    if order in df.columns:
+        # grup içinde order kolonuna göre (kararlı) sıra
+        idx = np.lexsort((df[order].to_numpy(), cols))
+        rows = np.empty(len(df), dtype=np.intp)
+        rows[idx] = pd.Series(cols[idx]).groupby(cols[idx], sort=False).cumcount().to_numpy()
+    else:
+        rows = pd.Series(cols).groupby(cols, sort=False).cumcount().to_numpy()
+    n_rows = int(rows.max()) + 1 if len(rows) else 0
+    return rows, cols, n_rows
+
+
+def panel_matrices(
+    df: pd.DataFrame,
+    fields: Iterable[str],
+    *,
+    by: str = "symbol",
+    order: str = "date",
+) -> Tuple[Dict[str, np.ndarray], Tuple[np.ndarray, np.ndarray]]:
+    """Pack a long frame into ``bar × symbol`` matrices, one per field.
+
+    Column ``j`` holds the ``j``-th symbol's rows in ``order`` from the top
+    and is NaN-padded at the bottom, so rolling windows never cross symbol
+    boundaries and every column sees exactly its own history. Returns the
+    matrices and the ``(rows, cols)`` positions to scatter results back.
+    """
+    rows, cols, n_rows = _positions(df, by, order)
+    n_cols = int(cols.max()) + 1 if len(cols) else 0
+    mats = {}
+    for f in fields:
+        mat = np.full((n_rows, n_cols), np.nan)
+        mat[rows, cols] = pd.to_numeric(df[f], errors="coerce").to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+        mats[f] = mat
+    return mats, (rows, cols)
+
+
+def compute_panel(
+    df: pd.DataFrame,
+    names: Sequence[str],
+    *,
+    by: str = "symbol",
+    order: str = "date",
+    store=None,
+    log_level: int = logging.INFO,
+) -> pd.DataFrame:
+    """Add the indicator columns *names* to a long multi-symbol frame.
+
+    All names are expanded into one :class:`~backtest.indicators.plan.Plan`
+    evaluated on the packed matrices (:func:`panel_matrices`), so shared
+    intermediates (the EMAs under a MACD, the RSI under a StochRSI, the
+    single ADX pass behind ``adx``/``dmp``/``dmn``) are computed once for all
+    symbols; row order of *df* is preserved. Multi-output names
+    (``macd_*``, ``bb?_*``, ``stochrsi_*``) add their sibling columns too,
+    like ``Precomputer``. Unknown names raise ``ValueError``.
+
+    With ``store`` (an :class:`~backtest.indicators.cache.IndicatorCache`)
+    every ``(symbol, column)`` is looked up by the fingerprint of that
+    symbol's input values first; only specs and symbols with a miss are
+    computed (on the matching matrix columns) and written through to the
+    store. ``log_level`` is the level of the plan log lines.
+    """
+    from .plan import Plan
+
+    specs: Dict[Spec, None] = {}
+    for name in names:
+        spec = parse_spec(name)
+        if spec is None:
+            raise ValueError(f"Desteklenmeyen gösterge: {name}")
+        specs[spec] = None
+    out = df.copy()
+    if not specs:
+        return out
+    fields = sorted({f for s in specs for f in s.inputs})
+    mats, (rows, cols) = panel_matrices(out, fields, by=by, order=order)
+    if store is None:
+        res = Plan(specs, level=log_level).run(mats)
+    else:
+        res = _compute_with_store(list(specs), mats, cols, out, by, store, log_level)
+    for spec in specs:
+        for col in spec.outputs:
+            out[col] = res[col][rows, cols]
+    return out
+
+
+def _compute_with_store(
+    specs: List[Spec], mats, cols, df, by, store, log_level: int = logging.INFO
+) -> Dict[str, np.ndarray]:
+    from .cache import fingerprint
+    from .plan import Plan
+
+    labels = (
+        pd.factorize(df[by], sort=False)[1].astype(str) if by in df.columns else np.array(["_"])
+    )
+    lengths = np.bincount(cols, minlength=len(labels))
+    shape = next(iter(mats.values())).shape
+    res: Dict[str, np.ndarray] = {}
+    missing: Dict[Spec, List[int]] = {}
+    fps: Dict[Tuple[Tuple[str, ...], int], str] = {}
+    for spec in specs:
+        for col in spec.outputs:
+            res[col] = np.full(shape, np.nan)
+        for j, sym in enumerate(labels):
+            n = lengths[j]
+            key = (spec.inputs, j)
+            if key not in fps:
+                fps[key] = fingerprint(pd.DataFrame({f: mats[f][:n, j] for f in spec.inputs}))
+            found = [store.get(sym, col, fps[key]) for col in spec.outputs]
+            if any(s is None or len(s) != n for s in found):
+                missing.setdefault(spec, []).append(j)
+                store.misses += 1
+                continue
+            store.hits += 1
+            for col, s in zip(spec.outputs, found):
+                res[col][:n, j] = s.to_numpy(dtype="float64")
+    if missing:
+        # eksik sembollerin birleşimi tek plan geçişiyle hesaplanır
+        union = sorted({j for js in missing.values() for j in js})
+        pos = {j: k for k, j in enumerate(union)}
+        computed = Plan(missing, level=log_level).run({f: m[:, union] for f, m in mats.items()})
+        for spec, js in missing.items():
+            for j in js:
+                n, fp = lengths[j], fps[(spec.inputs, j)]
+                for col in spec.outputs:
+                    res[col][:, j] = computed[col][:, pos[j]]
+                    store.put(labels[j], col, fp, pd.Series(computed[col][:n, pos[j]], name=col))
+    return res
+
+
+__all__ = [
+    "Spec",
+    "adx",
+    "bbands",
+    "cci",
+    "compute_panel",
+    "compute_spec",
+    "ema",
+    "ewm_mean",
+    "macd",
+    "mom",
+    "panel_matrices",
+    "parse_spec",
+    "rma",
+    "roc",
+    "rsi",
+    "sma",
+    "stochrsi",
+    "true_range",
+    "warmup",
+    "wma",
+]
@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import pandas as pd
+
+from backtest.naming.aliases import normalize_token
+
+logger = logging.getLogger(__name__)
+
+_SAFE = re.compile(r"[^0-9A-Za-z_.=-]+")
+
+
+def fingerprint(df: pd.DataFrame, columns: Iterable[str] | None = None) -> str:
+    """Return a stable content hash of ``df[columns]`` including its index.
+
+    Only the given input columns are hashed so unrelated columns do not
+    invalidate cached indicators.
+    """
+    cols = [c for c in (columns if columns is not None else df.columns) if c in df.columns]
+    h = hashlib.sha1()
+    h.update("|".join(map(str, cols)).encode("utf-8"))
+    h.update(pd.util.hash_pandas_object(df.loc[:, cols], index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+class IndicatorCache:
+    """Two-level (memory + optional Parquet directory) indicator cache.
+
+    Entries are keyed by ``(symbol, indicator spec, input fingerprint)``; the
+    spec is the canonical column name (``normalize_token``), which carries
+    the parameters (``rsi_14``, ``macd_12_26_9``). A change in the input
+    history yields a new fingerprint and therefore a miss. With
+    ``cache_dir`` set, series are written through to
+    ``<cache_dir>/<symbol>/<spec>-<fingerprint>.parquet`` and reused across
+    runs.
+
+    ``max_bytes`` bounds the on-disk size: a file's modification time is
+    its last use (refreshed on every hit) and the least recently used files
+    are evicted after a write pushes the directory over the bound.
+    ``mem_max_bytes`` likewise bounds the in-memory level (LRU, default
+    256 MB; ``None`` disables the bound), so a long run keeps only the
+    recently used series in RAM.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path | None = None,
+        *,
+        max_bytes: int | None = None,
+        mem_max_bytes: int | None = 256 * 1024 * 1024,
+    ):
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self.max_bytes = max_bytes
+        self.mem_max_bytes = mem_max_bytes
+        self._mem: OrderedDict[Tuple[str, str, str], pd.Series] = OrderedDict()
+        self._mem_bytes = 0
+        self._disk_bytes: int | None = None
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        if self.cache_dir is not None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def _key(symbol: str, spec: str, fp: str) -> Tuple[str, str, str]:
+        return str(symbol), normalize_token(spec) or spec, fp
+
+    def _path(self, key: Tuple[str, str, str]) -> Path:
+        symbol, spec, fp = key
+        assert self.cache_dir is not None
+        return self.cache_dir / _SAFE.sub("_", symbol) / f"{_SAFE.sub('_', spec)}-{fp[:20]}.parquet"
+
+    def _remember(self, key: Tuple[str, str, str], series: pd.Series) -> None:
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= int(old.memory_usage(index=True))
+        self._mem[key] = series
+        self._mem_bytes += int(series.memory_usage(index=True))
+        if self.mem_max_bytes is None:
+            return
+        # en eski kullanılanlar düşer; son eklenen sınırı aşsa da tutulur
+        while self._mem_bytes > self.mem_max_bytes and len(self._mem) > 1:
+            _, dropped = self._mem.popitem(last=False)
+            self._mem_bytes -= int(dropped.memory_usage(index=True))
+
+    def get(self, symbol: str, spec: str, fp: str) -> pd.Series | None:
+        key = self._key(symbol, spec, fp)
+        if key in self._mem:
+            self._mem.move_to_end(key)
+            return self._mem[key].rename(spec)
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        if not path.exists():
+            return None
+        try:
+            series = pd.read_parquet(path).iloc[:, 0]
+            os.utime(path)  # LRU: son kullanım
+        except Exception as e:  # unreadable entry behaves like a miss
+            logger.warning("indicator cache okunamadı: %s -> %s", path, e)
+            return None
+        self._remember(key, series)
+        return series.rename(spec)
+
+    def put(self, symbol: str, spec: str, fp: str, series: pd.Series) -> None:
+        key = self._key(symbol, spec, fp)
+        self._remember(key, series)
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        tmp = path.with_name(path.name + ".tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            series.rename(key[1]).to_frame().to_parquet(tmp)
+            os.replace(tmp, path)
+        except Exception as e:
+            logger.warning("indicator cache yazılamadı: %s -> %s", path, e)
+            return
+        if self.max_bytes is not None:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, size, _ in self._entries())
+            else:
+                self._disk_bytes += path.stat().st_size
+            if self._disk_bytes > self.max_bytes:
+                self._evict(self.max_bytes, keep=path)
+
+    def _entries(self) -> List[Tuple[Path, int, float]]:
+        """``(path, size, last_used)`` of every stored file."""
+        if self.cache_dir is None:
+            return []
+        out = []
+        for p in self.cache_dir.glob("*/*.parquet"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:  # başka süreç sildi
+                continue
+            out.append((p, st.st_size, st.st_mtime))
+        return out
+
+    def _evict(self, max_bytes: int, keep: Path | None = None) -> Tuple[int, int]:
+        entries = sorted(self._entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+        for path, size, _ in entries:
+            if total <= max_bytes:
+                break
+            if path == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+            freed += size
+        self._disk_bytes = total
+        self.evicted += removed
+        if removed:
+            logger.info("INDICATOR_CACHE evicted=%d freed=%d bytes=%d", removed, freed, total)
+        return removed, freed
+
+    @property
+    def disk_bytes(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def vacuum(self, max_bytes: int | None = None) -> Dict[str, int]:
+        """Compact the on-disk store.
+
+        Leftover ``*.tmp`` files, unreadable entries and empty symbol
+        directories are removed, then least recently used entries are
+        evicted down to ``max_bytes`` (default: the instance bound).
+        """
+        if self.cache_dir is None:
+            return {"removed": 0, "freed": 0, "bytes": 0, "entries": 0}
+        t0 = time.perf_counter()
+        removed = freed = 0
+        for p in self.cache_dir.glob("*/*.tmp"):
+            freed += p.stat().st_size
+            p.unlink(missing_ok=True)
+            removed += 1
+        for p, size, _ in self._entries():
+            try:
+                pd.read_parquet(p)
+            except Exception:
+                p.unlink(missing_ok=True)
+                removed += 1
+                freed += size
+        bound = self.max_bytes if max_bytes is None else max_bytes
+        if bound is not None:
+            r, f = self._evict(bound)
+            removed += r
+            freed += f
+        for d in self.cache_dir.iterdir():
+            if d.is_dir() and not any(d.iterdir()):
+                d.rmdir()
+        self._mem.clear()
+        self._mem_bytes = 0
+        entries = self._entries()
+        stats = {
+            "removed": removed,
+            "freed": freed,
+            "bytes": sum(size for _, size, _ in entries),
+            "entries": len(entries),
+        }
+        logger.info(
+            "INDICATOR_CACHE vacuum removed=%d freed=%d bytes=%d entries=%d took=%.3fs",
+            stats["removed"],
+            stats["freed"],
+            stats["bytes"],
+            stats["entries"],
+            time.perf_counter() - t0,
+        )
+        return stats
+
+    def get_or_compute(
+        self, symbol: str, spec: str, fp: str, compute: Callable[[], pd.Series]
+    ) -> pd.Series:
+        series = self.get(symbol, spec, fp)
+        if series is not None:
+            self.hits += 1
+            return series
+        self.misses += 1
+        series = compute()
+        self.put(symbol, spec, fp, series)
+        return series
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+__all__ = ["IndicatorCache", "fingerprint"]
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from . import batch
+from .batch import Spec
+
+logger = logging.getLogger(__name__)
+
+# Düğüm anahtarı aynı hesabı tanımlar: macd_12_26_9 ile ema_12 aynı
+# "ema(close,12)" düğümünü, rsi_14 ile stochrsi_*_14_* aynı Wilder
+# ortalamalarını, adx/dmp/dmn aynı ADX geçişini paylaşır.
+
+
+class Plan:
+    """Dependency graph of primitives behind a set of indicator specs.
+
+    Every node (input column, shift, rolling mean/var/min/max, EMA, Wilder
+    smoothing, true range, ...) is keyed by what it computes, so an
+    intermediate needed by several outputs is evaluated exactly once.
+    Nodes are stored in topological order; :meth:`run` evaluates them on
+    ``(T, N)`` input matrices and returns ``{column: matrix}`` equal to
+    :func:`backtest.indicators.batch.compute_spec` for every spec. The plan
+    and per-node timings are logged at ``level``.
+    """
+
+    def __init__(self, specs: Iterable[Spec], *, level: int = logging.INFO):
+        self.level = level
+        self.specs: Tuple[Spec, ...] = tuple(dict.fromkeys(specs))
+        self.nodes: Dict[str, Tuple[Callable[..., np.ndarray] | None, Tuple[str, ...]]] = {}
+        self.outputs: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+        for spec in self.specs:
+            for col, key in _EXPAND[spec.kind](self, *spec.params).items():
+                if col in spec.outputs:
+                    self.outputs[col] = key
+
+    @property
+    def inputs(self) -> List[str]:
+        return [k for k, (fn, _) in self.nodes.items() if fn is None]
+
+    def shared(self) -> List[str]:
+        """Nodes feeding more than one consumer (other nodes or output columns)."""
+        uses: Dict[str, int] = {}
+        for _, deps in self.nodes.values():
+            for d in deps:
+                uses[d] = uses.get(d, 0) + 1
+        for key in self.outputs.values():
+            uses[key] = uses.get(key, 0) + 1
+        return [k for k, n in uses.items() if n > 1 and self.nodes[k][0] is not None]
+
+    def describe(self) -> str:
+        return " -> ".join(k for k, (fn, _) in self.nodes.items() if fn is not None)
+
+    def run(self, inputs: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Evaluate the graph; intermediates are released after their last use."""
+        last: Dict[str, int] = {}
+        for i, (_, deps) in enumerate(self.nodes.values()):
+            for d in deps:
+                last[d] = i
+        keep = set(self.outputs.values())
+        values: Dict[str, np.ndarray] = {}
+        self.timings = {}
+        logger.log(
+            self.level,
+            "PLAN specs=%d nodes=%d shared=%d order=%s",
+            len(self.specs),
+            len(self.nodes) - len(self.inputs),
+            len(self.shared()),
+            self.describe(),
+        )
+        t_all = time.perf_counter()
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for i, (key, (fn, deps)) in enumerate(self.nodes.items()):
+                t0 = time.perf_counter()
+                if fn is None:
+                    values[key] = batch._as_2d(inputs[key])
+                else:
+                    values[key] = fn(*(values[d] for d in deps))
+                    self.timings[key] = time.perf_counter() - t0
+                for d in deps:
+                    if last[d] == i and d not in keep:
+                        del values[d]
+        logger.log(
+            self.level,
+            "PLAN took=%.4fs nodes=%s",
+            time.perf_counter() - t_all,
+            " ".join(f"{k}={t:.4f}s" for k, t in self.timings.items()),
+        )
+        return {col: values[key] for col, key in self.outputs.items()}
+
+    # ------------------------------------------------------------------
+    # düğüm kurucuları
+
+    def _node(self, key: str, fn: Callable[..., np.ndarray] | None, *deps: str) -> str:
+        if key not in self.nodes:
+            self.nodes[key] = (fn, deps)
+        return key
+
+    def _src(self, field: str) -> str:
+        return self._node(field, None)
+
+    def _shift(self, x: str, n: int) -> str:
+        return self._node(f"shift({x},{n})", lambda v: batch._shift(v, n), x)
+
+    def _diff(self, x: str) -> str:
+        return self._node(f"diff({x})", lambda v, p: v - p, x, self._shift(x, 1))
+
+    def _count(self, x: str) -> str:
+        return self._node(f"count({x})", lambda v: np.cumsum(~np.isnan(v), axis=0), x)
+
+    def _ewm(self, x: str, n: int) -> str:
+        return self._node(f"ewm({x},1/{n})", lambda v: batch.ewm_mean(v, 1.0 / n, adjust=True), x)
+
+    def _rma(self, x: str, n: int) -> str:
+        # min_periods=n, ham EWM'nin gözlem sayısıyla maskelenmesine eşittir
+        return self._node(
+            f"rma({x},{n})",
+            lambda e, c: np.where(c >= n, e, np.nan),
+            self._ewm(x, n),
+            self._count(x),
+        )
+
+    def _window(self, op: str, x: str, n: int) -> str:
+        fn = {
+            "sma": lambda v: batch.sma(v, n),
+            "var": lambda v: batch._rolling(v, n, lambda w: w.var(axis=-1)),
+            "min": lambda v: batch._rolling(v, n, lambda w: w.min(axis=-1)),
+            "max": lambda v: batch._rolling(v, n, lambda w: w.max(axis=-1)),
+            "wma": lambda v: batch.wma(v, n),
+        }[op]
+        return self._node(f"{op}({x},{n})", fn, x)
+
+    def _ema(self, x: str, n: int) -> str:
+        return self._node(f"ema({x},{n})", lambda v: batch.ema(v, n), x)
+
+    def _rsi_raw(self, x: str, n: int) -> str:
+        d = self._diff(x)
+        gain = self._node(f"gain({d})", lambda v: np.where(v < 0, 0.0, v), d)
+        loss = self._node(f"loss({d})", lambda v: np.where(v > 0, 0.0, v), d)
+        return self._node(
+            f"rsi({x},{n})",
+            lambda up, down: 100.0 * up / (up + np.abs(down)),
+            self._ewm(gain, n),
+            self._ewm(loss, n),
+        )
+
+    def _true_range(self) -> str:
+        return self._node(
+            "tr",
+            batch.true_range,
+            self._src("high"),
+            self._src("low"),
+            self._src("close"),
+        )
+
+    def _dm(self) -> Tuple[str, str]:
+        up, down = self._diff(self._src("high")), self._diff(self._src("low"))
+
+        def pos(u, d):
+            d = -d
+            v = np.where(np.isnan(u) | np.isnan(d), np.nan, ((u > d) & (u > 0)) * u)
+            return np.where(np.abs(v) < batch._EPS, 0.0, v)
+
+        def neg(u, d):
+            d = -d
+            v = np.where(np.isnan(u) | np.isnan(d), np.nan, ((d > u) & (d > 0)) * d)
+            return np.where(np.abs(v) < batch._EPS, 0.0, v)
+
+        return self._node("dm+", pos, up, down), self._node("dm-", neg, up, down)
+
+
+# --------------------------------------------------------------------------
+# Spec -> düğümler
+
+
+def _sma(p: Plan, n: int) -> Dict[str, str]:
+    return {f"sma_{n}": p._window("sma", p._src("close"), n)}
+
+
+def _wma(p: Plan, n: int) -> Dict[str, str]:
+    return {f"wma_{n}": p._window("wma", p._src("close"), n)}
+
+
+def _ema(p: Plan, n: int) -> Dict[str, str]:
+    return {f"ema_{n}": p._ema(p._src("close"), n)}
+
+
+def _rsi(p: Plan, n: int) -> Dict[str, str]:
+    close = p._src("close")
+    key = p._node(
+        f"rsi({close},{n},minp={n})",
+        lambda r, c: np.where(c >= n, r, np.nan),
+        p._rsi_raw(close, n),
+        p._count(p._diff(close)),
+    )
+    return {f"rsi_{n}": key}
+
+
+def _adx(p: Plan, n: int) -> Dict[str, str]:
+    atr = p._rma(p._true_range(), n)
+    pos, neg = p._dm()
+    dmp = p._node(f"dmp({n})", lambda a, s: 100.0 / a * s, atr, p._rma(pos, n))
+    dmn = p._node(f"dmn({n})", lambda a, s: 100.0 / a * s, atr, p._rma(neg, n))
+    dx = p._node(f"dx({n})", lambda a, b: 100.0 * np.abs(a - b) / (a + b), dmp, dmn)
+    return {f"adx_{n}": p._rma(dx, n), f"dmp_{n}": dmp, f"dmn_{n}": dmn}
+
+
+def _macd(p: Plan, fast: int, slow: int, signal: int) -> Dict[str, str]:
+    close = p._src("close")
+    line = p._node(
+        f"macd({fast},{slow})", lambda a, b: a - b, p._ema(close, fast), p._ema(close, slow)
+    )
+    sig = p._ema(line, signal)
+    hist = p._node(f"hist({line},{signal})", lambda a, b: a - b, line, sig)
+    sfx = f"{fast}_{slow}_{signal}"
+    return {f"macd_{sfx}": line, f"macd_signal_{sfx}": sig, f"macd_hist_{sfx}": hist}
+
+
+def _bbands(p: Plan, n: int, std: int) -> Dict[str, str]:
+    close = p._src("close")
+    mid = p._window("sma", close, n)
+    dev = p._node(f"dev({close},{n},{std})", lambda v: std * np.sqrt(v), p._window("var", close, n))
+    return {
+        f"bbl_{n}_{std}": p._node(f"bbl({n},{std})", lambda m, d: m - d, mid, dev),
+        f"bbm_{n}_{std}": mid,
+        f"bbh_{n}_{std}": p._node(f"bbh({n},{std})", lambda m, d: m + d, mid, dev),
+    }
+
+
+def _cci(p: Plan, n: int) -> Dict[str, str]:
+    tp = p._node(
+        "tp", lambda hi, lo, cl: (hi + lo + cl) / 3, p._src("high"), p._src("low"), p._src("close")
+    )
+    mean = p._window("sma", tp, n)
+    dev = p._node(f"absdev({tp},{n})", lambda v, m: np.abs(v - m), tp, mean)
+    md = p._window("sma", dev, n)
+    return {f"cci_{n}": p._node(f"cci({n})", lambda v, m, d: (v - m) / (0.015 * d), tp, mean, md)}
+
+
+def _stochrsi(p: Plan, r: int, k: int, d: int, smooth: int) -> Dict[str, str]:
+    rsi = p._rsi_raw(p._src("close"), r)
+    lo, hi = p._window("min", rsi, k), p._window("max", rsi, k)
+    stoch = p._node(f"stoch({rsi},{k})", lambda v, a, b: (v - a) / (b - a), rsi, lo, hi)
+    stoch_k = p._window("sma", stoch, smooth)
+    sfx = f"{r}_{k}_{d}_{smooth}"
+    return {f"stochrsi_k_{sfx}": stoch_k, f"stochrsi_d_{sfx}": p._window("sma", stoch_k, d)}
+
+
+def _mom(p: Plan, n: int) -> Dict[str, str]:
+    close = p._src("close")
+    return {f"mom_{n}": p._node(f"mom({n})", lambda v, s: v - s, close, p._shift(close, n))}
+
+
+def _roc(p: Plan, n: int) -> Dict[str, str]:
+    close = p._src("close")
+    return {f"roc_{n}": p._node(f"roc({n})", lambda v, s: v / s - 1.0, close, p._shift(close, n))}
+
+
+_EXPAND: Dict[str, Callable[..., Dict[str, str]]] = {
+    "sma": _sma,
+    "wma": _wma,
+    "ema": _ema,
+    "rsi": _rsi,
+    "adx": _adx,
+    "macd": _macd,
+    "bbands": _bbands,
+    "cci": _cci,
+    "stochrsi": _stochrsi,
+    "mom": _mom,
+    "roc": _roc,
+}
+
+
+def build_plan(names: Iterable[str]) -> Plan:
+    """Plan for indicator column names; unknown names raise ``ValueError``."""
+    specs = []
+    for name in names:
+        spec = batch.parse_spec(name)
+        if spec is None:
+            raise ValueError(f"Desteklenmeyen gösterge: {name}")
+        specs.append(spec)
+    return Plan(specs)
+
+
+__all__ = ["Plan", "build_plan"]
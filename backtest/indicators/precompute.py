@@ -1,49 +1,199 @@
 from __future__ import annotations
 
+import logging
+import re
+import tokenize
 from pathlib import Path
+from typing import Iterable
 
 import pandas as pd
 
+from backtest.filters.deps import collect_series
+from backtest.naming.aliases import normalize_token
+
+from . import batch
+from .cache import IndicatorCache, fingerprint
+
+logger = logging.getLogger(__name__)
+
+# normalize_token kanonik adı -> motor sütunu (batch adları farklı olduğunda)
+_ENGINE_ALIASES = [
+    (re.compile(r"^bbu_(\d+)_(\d+)$"), r"bbh_\1_\2"),
+    (re.compile(r"^plus_di_(\d+)$"), r"dmp_\1"),
+    (re.compile(r"^minus_di_(\d+)$"), r"dmn_\1"),
+]
+_MACD_PART_RE = re.compile(r"^macd_(?:signal|hist)_(\d+_\d+_\d+)$")
+
 
 def collect_required_indicators(filters_df: pd.DataFrame) -> set[str]:
-    """Extract indicator tokens used in filter expressions.
+    """Return the canonical series names referenced by the filter expressions.
 
-    This is a very small string scanner and does not attempt to fully parse the
-    expression. It is sufficient for simple demo use cases.
+    Every ``PythonQuery`` is tokenised by
+    :func:`backtest.filters.deps.collect_series` and each name is passed
+    through :func:`~backtest.naming.aliases.normalize_token`, so parameters
+    are kept exactly (``SMA50`` -> ``sma_50``). Plain data columns such as
+    ``close`` are included; :func:`precompute_for_chunk` derives only the
+    names the frame does not already provide.
     """
     out: set[str] = set()
-    for expr in filters_df.get("PythonQuery", []).astype(str):
-        for token in ["sma", "ema", "rsi", "adx", "macd", "boll"]:
-            if token in expr:
-                out.add(token)
+    for expr in filters_df.get("PythonQuery", pd.Series(dtype=str)).astype(str):
+        try:
+            names = collect_series(expr)
+        except (tokenize.TokenError, SyntaxError):
+            # bozuk ifade değerlendirmede anlamlı hatayla düşer
+            logger.warning("Filtre ifadesi ayrıştırılamadı: %s", expr)
+            continue
+        out.update(normalize_token(n) for n in names)
     return out
 
 
+def _derivation(name: str) -> tuple[str, str] | None:
+    """``(spec name, engine column)`` computing *name*, or ``None``."""
+    m = _MACD_PART_RE.match(name)
+    if m:
+        return f"macd_{m.group(1)}", name
+    for pat, repl in _ENGINE_ALIASES:
+        if pat.match(name):
+            col = pat.sub(repl, name)
+            return col, col
+    if batch.parse_spec(name) is not None:
+        return name, name
+    return None
+
+
+def _inputs(name: str) -> tuple[str, ...] | None:
+    """Input columns needed to derive *name*; ``None`` if it cannot be derived."""
+    if _CHUNK_RE.match(name):
+        return ("close",)
+    d = _derivation(name)
+    return None if d is None else batch.parse_spec(d[0]).inputs
+
+
+def requirement_report(required: Iterable[str], columns: Iterable[str]) -> dict:
+    """Split *required* series into ``provided`` / ``derived`` / ``missing``.
+
+    ``provided`` are present in *columns* (compared by canonical name),
+    ``derived`` can be computed by :func:`precompute_for_chunk` and
+    ``missing`` are neither; filters referencing those fail at evaluation
+    time. Legacy bare tokens (``sma``/``ema``/``rsi``) are not reported.
+    """
+    have = {normalize_token(str(c)) for c in columns}
+    report: dict[str, list[str]] = {"provided": [], "derived": [], "missing": []}
+    for name in sorted(set(required)):
+        if name in _CHUNK_INDICATORS:
+            continue
+        if name in have:
+            report["provided"].append(name)
+        elif _inputs(name) is not None:
+            report["derived"].append(name)
+        else:
+            report["missing"].append(name)
+    return report
+
+
+def required_warmup(names: Iterable[str], tol: float = 1e-4) -> int:
+    """Largest warm-up (bars) among the derivable series in *names*.
+
+    Uses :func:`backtest.indicators.batch.warmup`; the scan conventions for
+    ``sma_n``/``ema_n``/``rsi_n`` declare the same lengths as their engine
+    counterparts. Plain data columns and unknown names need no warm-up.
+    """
+    out = 0
+    for name in names:
+        name = _CHUNK_INDICATORS.get(name, name)
+        d = _derivation(name)
+        if d is not None:
+            out = max(out, batch.warmup(batch.parse_spec(d[0]), tol))
+    return out
+
+
+def _sma(df: pd.DataFrame, n: int = 20) -> pd.Series:
+    return df["close"].rolling(n).mean()
+
+
+def _ema(df: pd.DataFrame, n: int = 20) -> pd.Series:
+    return df["close"].ewm(span=n).mean()
+
+
+def _rsi(df: pd.DataFrame, n: int = 14) -> pd.Series:
+    delta = df["close"].diff()
+    up = delta.clip(lower=0).ewm(alpha=1 / n).mean()
+    down = -delta.clip(upper=0).ewm(alpha=1 / n).mean()
+    rs = up / down
+    return 100 - (100 / (1 + rs))
+
+
+# Tarama yolu sma/ema/rsi kuralı (polars_lazy ile aynı): tohumsuz ewm(adjust=True);
+# diğer göstergeler batch motoruyla hesaplanır.
+_CHUNK_FUNCS = {"sma": _sma, "ema": _ema, "rsi": _rsi}
+_CHUNK_RE = re.compile(r"^(sma|ema|rsi)_(\d+)$")
+
+# eski çıplak token -> sabit sütun
+_CHUNK_INDICATORS = {"sma": "sma_20", "ema": "ema_20", "rsi": "rsi_14"}
+
+
 def precompute_for_chunk(
     df_chunk: pd.DataFrame,
     indicators: set[str],
     cache_dir: str | Path | None = None,
+    *,
+    cache: IndicatorCache | None = None,
+    symbol: str | None = None,
 ) -> pd.DataFrame:
-    """Compute a small subset of indicators for a dataframe chunk.
+    """Add the indicator series in *indicators* to a single-symbol chunk.
 
-    Only a handful of indicators are supported and the implementation avoids
-    heavy third‑party dependencies such as TA‑Lib or pandas_ta. The calculations
-    are vectorised via pandas/numpy primitives.
+    *indicators* is normally the exact name set of
+    :func:`collect_required_indicators`: names the chunk already provides are
+    left untouched, ``sma_n``/``ema_n``/``rsi_n`` use the scan conventions
+    above and every other derivable name is computed in one
+    :func:`backtest.indicators.batch.compute_panel` pass, so shared
+    intermediates are computed once. The split is stored in
+    ``out.attrs['indicator_report']`` (see :func:`requirement_report`).
+    The legacy bare tokens ``sma``/``ema``/``rsi`` still (re)compute the
+    fixed ``sma_20``/``ema_20``/``rsi_14`` columns.
+
+    When ``cache`` (or ``cache_dir``) is given, each series is looked up by
+    ``(symbol, column, fingerprint of its input columns)`` before computing;
+    ``symbol`` defaults to ``df_chunk.attrs['symbol']``.
     """
     out = df_chunk.copy()
-    if "sma" in indicators:
-        out["sma_20"] = out["close"].rolling(20).mean()
-    if "ema" in indicators:
-        out["ema_20"] = out["close"].ewm(span=20).mean()
-    if "rsi" in indicators:
-        delta = out["close"].diff()
-        up = delta.clip(lower=0).ewm(alpha=1 / 14).mean()
-        down = -delta.clip(upper=0).ewm(alpha=1 / 14).mean()
-        rs = up / down
-        out["rsi_14"] = 100 - (100 / (1 + rs))
-    if cache_dir:
-        cache_dir = Path(cache_dir)
-        cache_dir.mkdir(parents=True, exist_ok=True)
-        key = "chunk" + str(hash(frozenset(indicators)))
-        out.to_parquet(cache_dir / f"{key}.parquet")
+    if cache is None and cache_dir:
+        cache = IndicatorCache(cache_dir)
+    symbol = symbol or out.attrs.get("symbol") or "_"
+    report = requirement_report(indicators, out.columns)
+    lookup = {normalize_token(str(c)): c for c in out.columns}
+    derived = [n for n in report["derived"] if all(f in lookup for f in _inputs(n))]
+    report["missing"] = sorted(report["missing"] + sorted(set(report["derived"]) - set(derived)))
+    report["derived"] = derived
+
+    simple = {_CHUNK_INDICATORS[t] for t in indicators if t in _CHUNK_INDICATORS}
+    simple.update(n for n in derived if _CHUNK_RE.match(n))
+    fp = None
+    for col in sorted(simple):
+        kind, n = _CHUNK_RE.match(col).groups()
+        fn = _CHUNK_FUNCS[kind]
+        if cache is None:
+            out[col] = fn(out, int(n))
+            continue
+        if fp is None:
+            fp = fingerprint(out, ("close",))
+        out[col] = cache.get_or_compute(symbol, col, fp, lambda: fn(out, int(n))).to_numpy()
+
+    engine = {n: _derivation(n) for n in derived if n not in simple}
+    if engine:
+        specs = sorted({spec_name for spec_name, _ in engine.values()})
+        fields = sorted({f for s in specs for f in batch.parse_spec(s).inputs})
+        frame = pd.DataFrame({f: out[lookup[f]].to_numpy() for f in fields})
+        frame["symbol"] = symbol
+        res = batch.compute_panel(frame, specs, by="symbol", store=cache, log_level=logging.DEBUG)
+        for name, (_, col) in engine.items():
+            out[name] = res[col].to_numpy()
+    out.attrs["indicator_report"] = report
+    logger.debug(
+        "INDICATORS symbol=%s provided=%s derived=%s missing=%s",
+        symbol,
+        report["provided"],
+        report["derived"],
+        report["missing"],
+    )
     return out
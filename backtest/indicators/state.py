@@ -0,0 +1,310 @@
+from __future__ import annotations
+
+import io
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+from . import batch
+from .cache import IndicatorCache
+
+logger = logging.getLogger(__name__)
+
+STATE_DIR = "_state"
+
+
+def _tail_rows(spec: batch.Spec) -> int:
+    """Input rows replayed before the new bars so windowed outputs are exact."""
+    p = spec.params
+    if spec.kind in ("sma", "wma", "bbands"):
+        return p[0]
+    if spec.kind in ("mom", "roc"):
+        return p[0] + 1
+    if spec.kind == "cci":
+        return 2 * p[0]
+    if spec.kind == "stochrsi":
+        _, k, d, smooth = p
+        return k + smooth + d
+    return 2  # ema/rsi/adx/macd: yalnız bir önceki bar (diff) gerekir
+
+
+def _seed_rows(spec: batch.Spec) -> int:
+    """Rows after which SMA-seeded EMAs are past their seed."""
+    if spec.kind == "ema":
+        return spec.params[0]
+    if spec.kind == "macd":
+        fast, slow, signal = spec.params
+        return max(fast, slow) + signal
+    return 0
+
+
+class _Replay:
+    """Carried EWM states for one :func:`batch.compute_spec` call.
+
+    Column ``j`` either replays its whole history (``fresh``: the recursion
+    starts empty at row 0) or its tail with every EWM seeded from the state
+    after tail row 0 (the recursion resumes at row 1). States are
+    snapshotted after row ``snap[j]`` (``-1``: never), in call order.
+    """
+
+    def __init__(self, ewm_in: List[List[np.ndarray]], fresh: np.ndarray, snap: np.ndarray):
+        self.ewm_in = ewm_in
+        self.ewm_out: List[List[np.ndarray]] = []
+        self.fresh = fresh
+        self.start = np.where(fresh, 0, 1)
+        self.snap = snap
+
+    def ewm_begin(self, n: int):
+        k = len(self.ewm_out)
+        if k < len(self.ewm_in):
+            w, o, c = (a.copy() for a in self.ewm_in[k])
+        else:
+            w, o, c = np.full(n, np.nan), np.ones(n), np.zeros(n, dtype=np.int64)
+        w[self.fresh], o[self.fresh], c[self.fresh] = np.nan, 1.0, 0
+        return (w, o, c), self.start, self.snap
+
+    def ewm_end(self, saved: List[np.ndarray]) -> None:
+        self.ewm_out.append(saved)
+
+
+class IndicatorState:
+    """Checkpoint that advances panel indicators by new bars.
+
+    For every symbol it keeps the last input rows the indicators need and,
+    for recursive indicators (ema, rsi, adx/dmp/dmn, macd, stochrsi), the
+    EWM recursion state. A new bar then costs O(1) per recursive indicator
+    and a short tail replay for windowed ones (sma, wma, bbands, cci, mom,
+    roc). Symbols with less history than that are replayed in full.
+    Results match :func:`batch.compute_panel` over the whole history;
+    :meth:`advance` can verify this against a full recomputation.
+    """
+
+    def __init__(self, names: Iterable[str], *, by: str = "symbol", order: str = "date"):
+        self.names = sorted(set(names))
+        self.by = by
+        self.order = order
+        specs: Dict[batch.Spec, None] = {}
+        for name in self.names:
+            spec = batch.parse_spec(name)
+            if spec is None:
+                raise ValueError(f"Desteklenmeyen gösterge: {name}")
+            specs[spec] = None
+        self.specs = list(specs)
+        self.fields = sorted({f for s in self.specs for f in s.inputs})
+        self.keep = max((_tail_rows(s) + _seed_rows(s) + 1 for s in self.specs), default=0)
+        self.symbols: List[str] = []
+        self.history = np.zeros(0, dtype=np.int64)
+        self.last = np.zeros(0, dtype="datetime64[ns]")
+        # alta hizalı: sütun j'nin son min(history, keep) satırı dolu
+        self.tail = {f: np.full((self.keep, 0), np.nan) for f in self.fields}
+        self.ewm: List[List[List[np.ndarray]]] = [[] for _ in self.specs]
+
+    @property
+    def columns(self) -> List[str]:
+        return [c for s in self.specs for c in s.outputs]
+
+    @classmethod
+    def from_history(
+        cls, df: pd.DataFrame, names: Iterable[str], *, by: str = "symbol", order: str = "date"
+    ):
+        """Compute *names* over the full history; returns ``(state, frame)``."""
+        state = cls(names, by=by, order=order)
+        return state, state.advance(df)
+
+    def _columns_for(self, labels) -> np.ndarray:
+        index = {s: i for i, s in enumerate(self.symbols)}
+        new = [s for s in labels if s not in index]
+        if new:
+            k = len(new)
+            self.symbols.extend(new)
+            self.history = np.concatenate([self.history, np.zeros(k, dtype=np.int64)])
+            self.last = np.concatenate([self.last, np.full(k, np.datetime64("NaT", "ns"))])
+            for f in self.fields:
+                self.tail[f] = np.hstack([self.tail[f], np.full((self.keep, k), np.nan)])
+            for states in self.ewm:
+                for st in states:
+                    st[0] = np.concatenate([st[0], np.full(k, np.nan)])
+                    st[1] = np.concatenate([st[1], np.ones(k)])
+                    st[2] = np.concatenate([st[2], np.zeros(k, dtype=np.int64)])
+            index = {s: i for i, s in enumerate(self.symbols)}
+        return np.array([index[s] for s in labels], dtype=np.intp)
+
+    def advance(
+        self,
+        new_bars: pd.DataFrame,
+        *,
+        verify: pd.DataFrame | None = None,
+        rtol: float = 1e-9,
+        atol: float = 1e-9,
+    ) -> pd.DataFrame:
+        """Append *new_bars* (any symbols, any number of bars) and return them
+        with the indicator columns added.
+
+        Bars must be newer than the last bar seen for their symbol. With
+        ``verify`` (the full history including *new_bars*) the result is
+        compared with :func:`batch.compute_panel` on that history and a
+        ``ValueError`` is raised when it differs beyond ``rtol``/``atol``.
+        """
+        out = new_bars.copy()
+        if out.empty:
+            for col in self.columns:
+                out[col] = np.nan
+            return out
+        labels = (
+            pd.factorize(out[self.by], sort=False)[1].astype(str).tolist()
+            if self.by in out.columns
+            else ["_"]
+        )
+        mats, (rows, kcols) = batch.panel_matrices(out, self.fields, by=self.by, order=self.order)
+        cols = self._columns_for(labels)
+        counts = np.bincount(kcols, minlength=len(labels))
+        if self.order in out.columns:
+            dates = pd.to_datetime(out[self.order]).to_numpy("datetime64[ns]")
+            first = np.full(len(labels), np.datetime64("NaT", "ns"))
+            newest = first.copy()
+            for k in range(len(labels)):
+                sel = dates[kcols == k]
+                first[k], newest[k] = sel.min(), sel.max()
+            prev = self.last[cols]
+            stale = ~np.isnat(prev) & (first <= prev)
+            if stale.any():
+                bad = [labels[k] for k in np.flatnonzero(stale)]
+                raise ValueError(f"Yeni barlar son kayıttan eski ya da aynı: {bad}")
+            self.last[cols] = newest
+
+        h = self.history[cols]
+        for si, spec in enumerate(self.specs):
+            L = _tail_rows(spec)
+            thr = L + _seed_rows(spec) + 1
+            carried = h >= thr
+            tl = np.where(carried, L, h)
+            n_rows = int((tl + counts).max())
+            X = {}
+            for f in spec.inputs:
+                x = np.full((n_rows, len(cols)), np.nan)
+                for k, j in enumerate(cols):
+                    t = int(tl[k])
+                    if t:
+                        x[:t, k] = self.tail[f][self.keep - t :, j]
+                    x[t : t + counts[k], k] = mats[f][: counts[k], k]
+                X[f] = x
+            h_new = h + counts
+            snap = np.where(h_new >= thr, tl + counts - L, -1)
+            ewm_in = [[a[cols] for a in st] for st in self.ewm[si]]
+            ctx = _Replay(ewm_in, ~carried, snap)
+            res = batch.compute_spec(spec, X, ctx=ctx)
+            for col in spec.outputs:
+                out[col] = res[col][tl[kcols] + rows, kcols]
+            if not self.ewm[si]:
+                n = len(self.symbols)
+                self.ewm[si] = [
+                    [np.full(n, np.nan), np.ones(n), np.zeros(n, dtype=np.int64)]
+                    for _ in ctx.ewm_out
+                ]
+            for st, saved in zip(self.ewm[si], ctx.ewm_out):
+                for a, b in zip(st, saved):
+                    a[cols] = b
+
+        for f in self.fields:
+            for k, j in enumerate(cols):
+                kept = int(min(h[k], self.keep))
+                seq = np.concatenate([self.tail[f][self.keep - kept :, j], mats[f][: counts[k], k]])
+                seq = seq[-self.keep :] if self.keep else seq[:0]
+                col = np.full(self.keep, np.nan)
+                if len(seq):
+                    col[self.keep - len(seq) :] = seq
+                self.tail[f][:, j] = col
+        self.history[cols] = h + counts
+
+        if verify is not None:
+            self._verify(out, verify, rtol, atol)
+        return out
+
+    def _verify(self, out: pd.DataFrame, full: pd.DataFrame, rtol: float, atol: float) -> None:
+        keys = [c for c in (self.by, self.order) if c in out.columns]
+        if self.order not in keys:
+            raise ValueError(f"Doğrulama için '{self.order}' kolonu gerekli")
+        ref = batch.compute_panel(full, self.names, by=self.by, order=self.order)
+        merged = out[keys + self.columns].merge(
+            ref[keys + self.columns], on=keys, how="left", suffixes=("", "_full")
+        )
+        worst = 0.0
+        failed = []
+        for col in self.columns:
+            a = merged[col].to_numpy(dtype="float64")
+            b = merged[f"{col}_full"].to_numpy(dtype="float64")
+            diff = np.abs(a - b)
+            both_nan = np.isnan(a) & np.isnan(b)
+            bad = ~both_nan & ~(diff <= atol + rtol * np.abs(b))
+            if bad.any():
+                failed.append(f"{col} ({int(bad.sum())} satır)")
+            if (~both_nan).any():
+                worst = max(worst, float(np.nanmax(np.where(both_nan, 0.0, diff))))
+        if failed:
+            raise ValueError(f"IndicatorState doğrulaması başarısız: {', '.join(failed)}")
+        logger.info("STATE verify ok rows=%d max_abs_diff=%.3g", len(out), worst)
+
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _path(store: IndicatorCache | str | Path, name: str) -> Path:
+        root = store.cache_dir if isinstance(store, IndicatorCache) else Path(store)
+        if root is None:
+            raise ValueError("Durum kaydı için bir depo klasörü gerekli")
+        return Path(root) / STATE_DIR / f"{name}.npz"
+
+    def save(self, store: IndicatorCache | str | Path, name: str = "default") -> Path:
+        """Write the checkpoint next to the indicator store (``_state/<name>.npz``)."""
+        path = self._path(store, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "names": self.names,
+            "by": self.by,
+            "order": self.order,
+            "ewm": [len(st) for st in self.ewm],
+        }
+        arrays = {
+            "meta": np.array(json.dumps(meta)),
+            "symbols": np.array(self.symbols, dtype=str),
+            "history": self.history,
+            "last": self.last,
+        }
+        for f in self.fields:
+            arrays[f"tail_{f}"] = self.tail[f]
+        for si, states in enumerate(self.ewm):
+            for i, (w, o, c) in enumerate(states):
+                arrays[f"ewm_{si}_{i}_w"], arrays[f"ewm_{si}_{i}_o"] = w, o
+                arrays[f"ewm_{si}_{i}_n"] = c
+        buf = io.BytesIO()
+        np.savez(buf, **arrays)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(buf.getvalue())
+        os.replace(tmp, path)
+        return path
+
+    @classmethod
+    def load(cls, store: IndicatorCache | str | Path, name: str = "default") -> "IndicatorState":
+        path = cls._path(store, name)
+        with np.load(path, allow_pickle=False) as z:
+            meta = json.loads(str(z["meta"]))
+            state = cls(meta["names"], by=meta["by"], order=meta["order"])
+            state.symbols = z["symbols"].tolist()
+            state.history = z["history"].astype(np.int64)
+            state.last = z["last"].astype("datetime64[ns]")
+            for f in state.fields:
+                state.tail[f] = z[f"tail_{f}"]
+            state.ewm = [
+                [
+                    [z[f"ewm_{si}_{i}_w"], z[f"ewm_{si}_{i}_o"], z[f"ewm_{si}_{i}_n"]]
+                    for i in range(n)
+                ]
+                for si, n in enumerate(meta["ewm"])
+            ]
+        return state
+
+
+__all__ = ["IndicatorState"]
@@ -1,5 +1,6 @@
 """I/O utilities including preflight checks."""
 
+from .panel_store import PanelStore, write_panel_store
 from .preflight import PreflightReport, preflight
 
-__all__ = ["PreflightReport", "preflight"]
+__all__ = ["PanelStore", "PreflightReport", "preflight", "write_panel_store"]
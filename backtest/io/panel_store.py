@@ -0,0 +1,184 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+META_NAME = "panel.json"
+_VERSION = 1
+_AXIS_FILES = {"dates": "dates.npy", "symbols": "symbols.npy"}
+_DTYPES = ("float64", "float32")
+
+
+def _save_npy(path: Path, arr: np.ndarray) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as fh:
+        np.save(fh, arr, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def write_panel_store(
+    df: pd.DataFrame,
+    root: str | Path,
+    *,
+    fields: Iterable[str] | None = None,
+    dtype: str = "float64",
+    date_col: str = "date",
+    symbol_col: str = "symbol",
+) -> Path:
+    """Write a long ``(date, symbol)`` frame as one ``date × symbol`` matrix per field.
+
+    Each field becomes ``<root>/<field>.npy`` (``dtype`` is ``float64`` or
+    ``float32``; missing cells are NaN). The sorted date axis is stored in
+    ``dates.npy`` and the symbol axis in ``symbols.npy``; ``panel.json``
+    lists the fields and the shape. Every file is replaced atomically.
+    By default all numeric columns besides the axes are written, so
+    precomputed indicators are stored next to OHLCV.
+    """
+    if dtype not in _DTYPES:
+        raise ValueError(f"Desteklenmeyen dtype: {dtype}")
+    missing = {date_col, symbol_col} - set(df.columns)
+    if missing:
+        raise ValueError(f"Eksik kolon(lar): {sorted(missing)}")
+    if fields is None:
+        fields = [
+            c
+            for c in df.columns
+            if c not in (date_col, symbol_col) and pd.api.types.is_numeric_dtype(df[c])
+        ]
+    fields = list(fields)
+    bad = [f for f in fields if not f or "/" in f or f in ("dates", "symbols", "panel")]
+    if bad:
+        raise ValueError(f"Geçersiz alan adı(ları): {bad}")
+
+    dates = pd.to_datetime(df[date_col]).dt.normalize()
+    d_codes, d_axis = pd.factorize(dates, sort=True)
+    s_codes, s_axis = pd.factorize(df[symbol_col].astype(str), sort=True)
+    if (d_codes < 0).any():
+        raise ValueError("Geçersiz tarih değerleri")
+
+    out = Path(root)
+    out.mkdir(parents=True, exist_ok=True)
+    shape = (len(d_axis), len(s_axis))
+    for name in fields:
+        mat = np.full(shape, np.nan, dtype=dtype)
+        # aynı (gün, sembol) için son satır kazanır
+        mat[d_codes, s_codes] = pd.to_numeric(df[name], errors="coerce").to_numpy(
+            dtype=dtype, na_value=np.nan
+        )
+        _save_npy(out / f"{name}.npy", mat)
+    _save_npy(out / _AXIS_FILES["dates"], pd.DatetimeIndex(d_axis).to_numpy("datetime64[ns]"))
+    _save_npy(out / _AXIS_FILES["symbols"], np.asarray(s_axis, dtype=str))
+    meta = {"version": _VERSION, "shape": list(shape), "fields": {f: dtype for f in fields}}
+    tmp = out / (META_NAME + ".tmp")
+    tmp.write_text(json.dumps(meta, indent=1, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, out / META_NAME)
+    return out
+
+
+class PanelStore:
+    """Read side of :func:`write_panel_store`.
+
+    Matrices are opened lazily with ``np.load(mmap_mode=...)``, so only the
+    pages touched by a slice are read and processes opening the same store
+    share the OS page cache. Slices returned by :meth:`window` are views of
+    the mapping whenever the selection is contiguous.
+    """
+
+    def __init__(self, root: str | Path, *, mmap_mode: str = "r"):
+        self.root = Path(root)
+        meta_path = self.root / META_NAME
+        if not meta_path.exists():
+            raise FileNotFoundError(f"Panel deposu bulunamadı: {self.root}")
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("version") != _VERSION:
+            raise ValueError(f"Desteklenmeyen panel sürümü: {meta.get('version')}")
+        self.mmap_mode = mmap_mode
+        self.fields: List[str] = list(meta["fields"])
+        self.shape = tuple(meta["shape"])
+        self.dates = pd.DatetimeIndex(np.load(self.root / _AXIS_FILES["dates"]))
+        self.symbols = pd.Index(np.load(self.root / _AXIS_FILES["symbols"]).tolist())
+        self._maps: Dict[str, np.memmap] = {}
+
+    def matrix(self, field: str) -> np.memmap:
+        """Return the whole ``date × symbol`` matrix of *field* as a memmap."""
+        if field not in self.fields:
+            raise KeyError(f"Alan yok: {field}")
+        arr = self._maps.get(field)
+        if arr is None:
+            arr = np.load(self.root / f"{field}.npy", mmap_mode=self.mmap_mode)
+            self._maps[field] = arr
+        return arr
+
+    def _rows(self, start=None, end=None) -> slice:
+        lo = 0 if start is None else self.dates.searchsorted(pd.Timestamp(start), "left")
+        hi = len(self.dates) if end is None else self.dates.searchsorted(pd.Timestamp(end), "right")
+        return slice(int(lo), int(hi))
+
+    def _cols(self, symbols: Iterable[str] | None):
+        if symbols is None:
+            return slice(None)
+        symbols = [str(s) for s in symbols]
+        idx = self.symbols.get_indexer(symbols)
+        if (idx < 0).any():
+            unknown = [s for s, i in zip(symbols, idx) if i < 0]
+            raise KeyError(f"Sembol yok: {unknown}")
+        return idx
+
+    def window(
+        self,
+        field: str,
+        start=None,
+        end=None,
+        symbols: Iterable[str] | None = None,
+    ) -> np.ndarray:
+        """Return rows ``[start, end]`` (inclusive) and the given symbol columns."""
+        rows = self._rows(start, end)
+        arr = self.matrix(field)[rows]
+        cols = self._cols(symbols)
+        return arr if isinstance(cols, slice) else arr[:, cols]
+
+    def frame(self, field: str, start=None, end=None, symbols=None) -> pd.DataFrame:
+        """:meth:`window` labelled with the date and symbol axes."""
+        rows = self._rows(start, end)
+        cols = self._cols(symbols)
+        return pd.DataFrame(
+            self.window(field, start, end, symbols),
+            index=self.dates[rows],
+            columns=self.symbols[cols],
+        )
+
+    def context(self, names: Iterable[str], start=None, end=None, symbols=None):
+        """Build a :class:`backtest.dsl.MatrixContext` over a date window."""
+        from backtest.dsl import MatrixContext
+
+        rows = self._rows(start, end)
+        cols = self._cols(symbols)
+        values = {n: self.window(n, start, end, symbols) for n in names}
+        return MatrixContext(values, index=self.dates[rows], columns=self.symbols[cols])
+
+    def to_long(self, fields=None, start=None, end=None, symbols=None) -> pd.DataFrame:
+        """Rebuild a long ``date, symbol, <fields>`` frame; all-NaN cells are dropped."""
+        fields = list(self.fields if fields is None else fields)
+        rows = self._rows(start, end)
+        cols = self._cols(symbols)
+        dates = self.dates[rows]
+        syms = self.symbols[cols]
+        data = {f: np.asarray(self.window(f, start, end, symbols)).ravel() for f in fields}
+        out = pd.DataFrame(
+            {
+                "date": np.repeat(dates.to_numpy(), len(syms)),
+                "symbol": np.tile(syms.to_numpy(dtype=object), len(dates)),
+                **data,
+            }
+        )
+        if fields:
+            out = out[out[fields].notna().any(axis=1)]
+        return out.reset_index(drop=True)
+
+
+__all__ = ["PanelStore", "write_panel_store"]
@@ -1,77 +1,70 @@
+import logging
 import re
+from pathlib import Path
 from typing import Set
 
 import pandas as pd
-import pandas_ta as ta
+
+from backtest.indicators import batch
+from backtest.indicators.cache import IndicatorCache
 
 from .errors import PrecomputeError
 
 # regex: rsi_14, ema_50, sma_20, macd_12_26_9, bbh_20_2
 _SIMPLE_RE = re.compile(r"^(?P<name>[a-z]+)_([0-9_]+)$")
 
+logger = logging.getLogger(__name__)
+
 
 class Precomputer:
-    def __init__(self):
+    """Add indicator columns to price frames.
+
+    ``store`` (an :class:`~backtest.indicators.cache.IndicatorCache` or its
+    directory) persists panel results keyed by symbol, indicator and input
+    fingerprint; without it ``cache`` only remembers names already added.
+    """
+
+    def __init__(self, by: str = "symbol", store: IndicatorCache | str | Path | None = None):
         self.cache: Set[str] = set()
+        self.by = by
+        if store is not None and not isinstance(store, IndicatorCache):
+            store = IndicatorCache(store)
+        self.store = store
 
     def precompute(self, df: pd.DataFrame, indicators: Set[str]) -> pd.DataFrame:
-        out = df.copy()
-        for ind in sorted(indicators):
-            if ind in self.cache:
-                continue
-            try:
-                out = self._compute_one(out, ind)
-                self.cache.add(ind)
-            except Exception as e:
-                raise PrecomputeError(f"Gösterge hesaplanamadı: {ind} | {e}", code="PC001")
-        return out
+        """Add *indicators* to *df*.
 
-    def _compute_one(self, df: pd.DataFrame, ind: str) -> pd.DataFrame:
-        if ind.startswith("rsi_"):
-            length = int(ind.split("_")[1])
-            df[ind] = ta.rsi(df["close"], length=length)
-        elif ind.startswith("ema_"):
-            length = int(ind.split("_")[1])
-            df[ind] = ta.ema(df["close"], length=length)
-        elif ind.startswith("sma_"):
-            length = int(ind.split("_")[1])
-            df[ind] = ta.sma(df["close"], length=length)
-        elif ind.startswith("wma_"):
-            length = int(ind.split("_")[1])
-            df[ind] = ta.wma(df["close"], length=length)
-        elif ind.startswith("adx_"):
-            length = int(ind.split("_")[1])
-            df[ind] = ta.adx(df["high"], df["low"], df["close"], length=length)[
-                "ADX_" + str(length)
-            ]
-        elif ind.startswith("dmp_"):
-            length = int(ind.split("_")[1])
-            df[ind] = ta.adx(df["high"], df["low"], df["close"], length=length)[
-                "DMP_" + str(length)
-            ]
-        elif ind.startswith("dmn_"):
-            length = int(ind.split("_")[1])
-            df[ind] = ta.adx(df["high"], df["low"], df["close"], length=length)[
-                "DMN_" + str(length)
-            ]
-        elif ind.startswith("macd_"):
-            parts = ind.split("_")[1:]
-            if len(parts) != 3:
+        The requested names are expanded into one dependency graph of
+        primitives (:mod:`backtest.indicators.plan`) so shared intermediates
+        are computed once. A long frame with a ``by`` column is evaluated per
+        symbol in one vectorized pass
+        (:func:`backtest.indicators.batch.compute_panel`); a frame without it
+        is treated as a single series in row order.
+        """
+        # depo varken isim kümesi atlama yapmaz: farklı veri farklı parmak izi
+        pending = [
+            ind for ind in sorted(indicators) if self.store is not None or ind not in self.cache
+        ]
+        for ind in pending:
+            if batch.parse_spec(ind) is not None:
+                continue
+            if ind.startswith("macd_"):
                 raise PrecomputeError(f"macd parametre hatası: {ind}", code="PC002")
-            fast, slow, sig = map(int, parts)
-            macd = ta.macd(df["close"], fast=fast, slow=slow, signal=sig)
-            df[f"macd_{fast}_{slow}_{sig}"] = macd[f"MACD_{fast}_{slow}_{sig}"]
-            df[f"macd_signal_{fast}_{slow}_{sig}"] = macd[f"MACDs_{fast}_{slow}_{sig}"]
-            df[f"macd_hist_{fast}_{slow}_{sig}"] = macd[f"MACDh_{fast}_{slow}_{sig}"]
-        elif ind.startswith("bbh_") or ind.startswith("bbm_") or ind.startswith("bbl_"):
-            parts = ind.split("_")[1:]
-            if len(parts) != 2:
+            if ind.startswith(("bbh_", "bbm_", "bbl_")):
                 raise PrecomputeError(f"bollinger parametre hatası: {ind}", code="PC002")
-            length, mult = map(int, parts)
-            bb = ta.bbands(df["close"], length=length, std=mult)
-            df[f"bbl_{length}_{mult}"] = bb[f"BBL_{length}_{mult}.0"]
-            df[f"bbm_{length}_{mult}"] = bb[f"BBM_{length}_{mult}.0"]
-            df[f"bbh_{length}_{mult}"] = bb[f"BBU_{length}_{mult}.0"]
-        else:
             raise PrecomputeError(f"Desteklenmeyen gösterge: {ind}", code="PC001")
-        return df
+        store = self.store
+        before = (store.hits, store.misses) if store is not None else (0, 0)
+        try:
+            out = batch.compute_panel(df, pending, by=self.by, store=store)
+        except Exception as e:
+            raise PrecomputeError(f"Gösterge hesaplanamadı: {pending} | {e}", code="PC001")
+        if store is not None:
+            logger.info(
+                "PRECOMPUTE store hits=%d misses=%d dir=%s",
+                store.hits - before[0],
+                store.misses - before[1],
+                store.cache_dir,
+            )
+        self.cache.update(pending)
+        return out
@@ -132,6 +132,23 @@ def _handle_overwrite(path: Path, policy: Literal["replace", "fail", "timestamp"
     return path
 
 
+def write_range_event(rows_total: int, out_dir) -> None:
+    """Emit the range-level ``WRITE_RANGE`` event/log for per-day output."""
+    event = {
+        "event": "WRITE_RANGE",
+        "rows_total": rows_total,
+        "out_dir": str(out_dir),
+    }
+    _append_event(event)
+    logger.info(
+        "WRITE_RANGE rows_total=%d out_dir=%s",
+        rows_total,
+        out_dir,
+    )
+    if rows_total == 0:
+        logger.info("ZERO_RESULT_RANGE out_dir=%s", out_dir)
+
+
 def write_reports(
     trades_all: pd.DataFrame,
     dates: Optional[Iterable] = None,
@@ -153,8 +170,14 @@ def write_reports(
     filename_pattern: str = "{date}.xlsx",
     csv_filename_pattern: str = "{date}.csv",
     separate_dir_for_range: bool = False,
+    range_event: bool = True,
 ):
     """Write daily/summary and optional sheets and return output paths.
+
+    With ``per_day_output`` and ``range_event=False`` only the day files and
+    ``WRITE_DAY`` events are written; a caller writing a range day by day
+    emits the range event once via :func:`write_range_event`.
+
     - SUMMARY: ReturnPct ortalamaları (sayısal 0.00 -> yüzde puan)
     - SUMMARY_WINRATE: Win-rate (0..1) (% format)
     - SUMMARY_DIFF: Filtre − BIST
@@ -260,20 +283,8 @@ def write_reports(
         outputs["excel"] = excel_paths
         if csv_paths:
             outputs["csv"] = csv_paths
-        rows_total = len(trades_all)
-        event = {
-            "event": "WRITE_RANGE",
-            "rows_total": rows_total,
-            "out_dir": str(base_dir),
-        }
-        _append_event(event)
-        logger.info(
-            "WRITE_RANGE rows_total=%d out_dir=%s",
-            rows_total,
-            base_dir,
-        )
-        if rows_total == 0:
-            logger.info("ZERO_RESULT_RANGE out_dir=%s", base_dir)
+        if range_event:
+            write_range_event(len(trades_all), base_dir)
         return outputs
     if summary_wide is None:
         summary_wide = pd.DataFrame()
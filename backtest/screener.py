@@ -35,43 +35,87 @@ def _log_event(event: dict) -> None:
         fh.write(json.dumps(event, ensure_ascii=False) + "\n")
 
 
+class ScreenerPanel:
+    """Canonicalised, date-indexed indicator panel for repeated screening.
+
+    Column canonicalisation, ``date`` normalisation and a stable sort by
+    date are done once; :meth:`day` then slices the rows of a single day via
+    ``searchsorted`` offsets, so each :func:`run_screener` call only touches
+    that day's rows.
+    """
+
+    def __init__(self, df_ind: pd.DataFrame):
+        if not isinstance(df_ind, pd.DataFrame):
+            raise TypeError("df_ind must be a DataFrame")
+        if df_ind.empty:
+            logger.error("df_ind is empty")
+            raise ValueError("df_ind is empty")
+        df_ind = df_ind.copy()
+        colmap = canonical_map(df_ind.columns)
+        for canon, original in colmap.items():
+            if canon != original and canon not in df_ind.columns:
+                df_ind[canon] = df_ind[original]
+
+        req_df = {"symbol", "date", "open", "high", "low", "close", "volume"}
+        missing_df = req_df.difference(df_ind.columns)
+        if missing_df:
+            msg = f"df_ind missing columns: {', '.join(sorted(missing_df))}"
+            logger.error(msg)
+            raise ValueError(msg)
+
+        df_ind["date"] = pd.to_datetime(df_ind["date"]).dt.normalize()
+        df_ind = df_ind.sort_values("date", kind="mergesort").reset_index(drop=True)
+        self.df = df_ind
+        self._dates = pd.DatetimeIndex(df_ind["date"])
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        """Unique trading days present in the panel."""
+        return self._dates.unique()
+
+    def day(self, day) -> pd.DataFrame:
+        """Return the rows of *day* (normalised) with a fresh ``RangeIndex``."""
+        day = pd.to_datetime(day).normalize()
+        lo = self._dates.searchsorted(day, side="left")
+        hi = self._dates.searchsorted(day, side="right")
+        return self.df.iloc[lo:hi].reset_index(drop=True)
+
+    def between(self, start, end) -> pd.DataFrame:
+        """Return the rows dated ``start`` through ``end`` (inclusive)."""
+        lo = self._dates.searchsorted(pd.to_datetime(start).normalize(), side="left")
+        hi = self._dates.searchsorted(pd.to_datetime(end).normalize(), side="right")
+        return self.df.iloc[lo:hi]
+
+
 def run_screener(
-    df_ind: pd.DataFrame,
+    df_ind: pd.DataFrame | ScreenerPanel,
     filters_df: pd.DataFrame,
     date,
     stop_on_filter_error: bool = False,
     raise_on_error: bool = True,
 ) -> pd.DataFrame:
-    if not isinstance(df_ind, pd.DataFrame):
+    """Screen *date* with every filter in *filters_df*.
+
+    ``df_ind`` may be a prepared :class:`ScreenerPanel`; callers screening
+    many days should build it once and pass it to every call.
+    """
+    if not isinstance(df_ind, (pd.DataFrame, ScreenerPanel)):
         raise TypeError("df_ind must be a DataFrame")
     if not isinstance(filters_df, pd.DataFrame):
         raise TypeError("filters_df must be a DataFrame")
-    if df_ind.empty:
+    if isinstance(df_ind, pd.DataFrame) and df_ind.empty:
         logger.error("df_ind is empty")
         raise ValueError("df_ind is empty")
     if filters_df.empty:
         logger.error("filters_df is empty")
         raise ValueError("filters_df is empty")
 
-    df_ind = df_ind.copy()
-    colmap = canonical_map(df_ind.columns)
-    for canon, original in colmap.items():
-        if canon != original and canon not in df_ind.columns:
-            df_ind[canon] = df_ind[original]
-
-    req_df = {"symbol", "date", "open", "high", "low", "close", "volume"}
-    missing_df = req_df.difference(df_ind.columns)
-    if missing_df:
-        msg = f"df_ind missing columns: {', '.join(sorted(missing_df))}"
-        logger.error(msg)
-        raise ValueError(msg)
+    panel = df_ind if isinstance(df_ind, ScreenerPanel) else ScreenerPanel(df_ind)
     if not {"FilterCode", "PythonQuery"}.issubset(filters_df.columns):
         msg = "filters_df missing required columns"
         logger.error(msg)
         raise ValueError(msg)
 
-    df_ind["date"] = pd.to_datetime(df_ind["date"]).dt.normalize()
-
     def _empty_output() -> pd.DataFrame:
         cols = ["FilterCode"]
         if "Group" in filters_df.columns:
@@ -84,11 +128,10 @@ def run_screener(
         return pd.DataFrame(data, columns=cols)
 
     day = pd.to_datetime(date).normalize()
-    d = df_ind[df_ind["date"] == day].copy()
+    d = panel.day(day)
     if d.empty:
         logger.warning("No data for date {day}", day=day)
         return _empty_output()
-    d = d.reset_index(drop=True)
     filters_df = filters_df.copy()
     dups = filters_df["FilterCode"].duplicated()
     if dups.any():
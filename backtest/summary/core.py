@@ -5,11 +5,39 @@ from pathlib import Path
 import numpy as np
 import pandas as pd
 
+from backtest.batch.io import read_signals
+
 from .benchmark import load_benchmark
 
 
-def load_signals_glob(out_dir: str | Path) -> pd.DataFrame:
+SIGNAL_SOURCES = ("auto", "parquet", "csv")
+
+
+def _newest(paths) -> int:
+    return max((p.stat().st_mtime_ns for p in paths), default=-1)
+
+
+def load_signals_glob(out_dir: str | Path, source: str = "auto") -> pd.DataFrame:
+    """Load the signals of a scan output directory.
+
+    ``source`` selects the month-partitioned Parquet store
+    (``signals/part-*.parquet``) or the per-day ``YYYY-MM-DD.csv`` files.
+    ``"auto"`` reads whichever of the two was written last, so a stale store
+    left next to newer CSV output (or the reverse) is not picked up; on a
+    tie the store wins.
+    """
+    if source not in SIGNAL_SOURCES:
+        raise ValueError(f"Bilinmeyen sinyal kaynağı: {source}")
     root = Path(out_dir)
+    if source == "auto":
+        parts = list((root / "signals").glob("part-*.parquet"))
+        days = list(root.glob("????-??-??.csv"))
+        source = "parquet" if parts and _newest(parts) >= _newest(days) else "csv"
+    if source == "parquet":
+        df = read_signals(root)
+        if df.empty:
+            raise FileNotFoundError("SM003: sinyal dosyası yok")
+        return df.astype({"symbol": str, "filter_code": str})
     rows = []
     for p in sorted(root.glob("*.csv")):
         try:
@@ -104,9 +132,10 @@ def summarize_range(
     *,
     horizon: int = 1,
     write_dir: str | Path = "raporlar/ozet",
+    source: str = "auto",
 ) -> dict:
     bench = load_benchmark(bench_path)
-    all_signals = load_signals_glob(out_dir)
+    all_signals = load_signals_glob(out_dir, source)
     days = sorted(all_signals["date"].unique())
 
     daily_rows = []
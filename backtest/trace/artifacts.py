@@ -19,7 +19,8 @@ def list_output_files(root: str | Path) -> list[Path]:
     r = Path(root)
     if not r.exists():
         return []
-    return sorted([p for p in r.glob("*.csv") if p.is_file()])
+    files = sorted([p for p in r.glob("*.csv") if p.is_file()])
+    return files + sorted(r.glob("signals/part-*.parquet"))
 
 
 class ArtifactWriter:
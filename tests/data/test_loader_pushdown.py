@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from backtest.data.backends import pandas_backend
+from backtest.data.loader import load_prices
+
+
+def _write_parts(root, sym, dates, base):
+    sym_dir = root / f"symbol={sym}"
+    sym_dir.mkdir(parents=True)
+    df = pd.DataFrame(
+        {
+            "Date": dates,
+            "Close": [base + i for i in range(len(dates))],
+            "Volume": [10.0 * i for i in range(len(dates))],
+        }
+    )
+    for month, g in df.groupby(df["Date"].dt.strftime("%Y%m")):
+        g.to_parquet(sym_dir / f"part-{month}.parquet", index=False)
+    return sym_dir
+
+
+def test_pandas_backend_prunes_months_and_pushes_down(tmp_path):
+    dates = pd.date_range("2024-01-25", "2024-04-05", freq="B")
+    for i, sym in enumerate(["AAA", "BBB"]):
+        sym_dir = _write_parts(tmp_path, sym, dates, 100.0 * (i + 1))
+        # aralık dışındaki ay hiç açılmamalı
+        (sym_dir / "part-202401.parquet").write_bytes(b"not parquet")
+
+    out = load_prices(
+        ["AAA", "BBB"],
+        start="2024-02-10",
+        end="2024-03-05",
+        cols=["Date", "Close"],
+        backend="pandas",
+        parquet_dir=tmp_path,
+    )
+    assert list(out.columns) == ["Date", "Close", "Symbol"]
+    assert out["Date"].min() == pd.Timestamp("2024-02-12")
+    assert out["Date"].max() == pd.Timestamp("2024-03-05")
+    assert out["Symbol"].tolist() == ["AAA"] * 17 + ["BBB"] * 17
+    assert out["Date"].dtype == "datetime64[ns]"
+
+
+def test_pandas_backend_matches_legacy_loop(tmp_path):
+    dates = pd.date_range("2024-01-25", "2024-04-05", freq="B")
+    for i, sym in enumerate(["AAA", "BBB"]):
+        _write_parts(tmp_path, sym, dates, 100.0 * (i + 1))
+    args = (tmp_path, ["BBB", "AAA"], "2024-02-01", "2024-03-29", None)
+    got = pandas_backend.load_prices(*args)
+    expected = pandas_backend._load_legacy(*args)
+    pd.testing.assert_frame_equal(got, expected)
+
+    with pytest.raises(FileNotFoundError):
+        pandas_backend.load_prices(tmp_path, ["ZZZ"], None, None, None)
+
+
+@pytest.mark.parametrize("col", ["symbol", "Symbol"])
+def test_pandas_backend_ignores_physical_symbol_column(tmp_path, col):
+    dates = pd.date_range("2024-01-25", "2024-02-09", freq="B")
+    for i, sym in enumerate(["AAA", "BBB"]):
+        sym_dir = tmp_path / f"symbol={sym}"
+        sym_dir.mkdir()
+        close = [100.0 * (i + 1) + j for j in range(len(dates))]
+        df = pd.DataFrame({"Date": dates, "Close": close})
+        df[col] = pd.Categorical(["stale"] * len(dates))
+        df.to_parquet(sym_dir / "part-202401.parquet", index=False)
+
+    for cols in (None, ["Date", "Close", col]):
+        out = pandas_backend.load_prices(tmp_path, ["AAA", "BBB"], None, None, cols)
+        assert list(out.columns) == ["Date", "Close", "Symbol"]
+        assert out["Symbol"].tolist() == ["AAA"] * len(dates) + ["BBB"] * len(dates)
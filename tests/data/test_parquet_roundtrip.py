@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import pandas as pd
+import pytest
 
 from backtest.cli import convert_to_parquet
 from backtest.data.loader import load_prices
@@ -22,3 +23,61 @@ def test_parquet_roundtrip(tmp_path):
     assert list(loaded.columns) == ["Date", "Close", "Symbol"]
     assert loaded["Close"].dtype == "float64"
     assert loaded["Date"].dtype == "datetime64[ns]"
+
+
+def test_convert_month_parts_and_dtypes(tmp_path):
+    import pyarrow.parquet as pq
+
+    dates = pd.bdate_range("2024-01-25", periods=10)
+    excel_dir = tmp_path / "data"
+    excel_dir.mkdir()
+    for sym in ("AAA", "BBB"):
+        pd.DataFrame(
+            {
+                "Date": dates,
+                "Close": [1.5 + i for i in range(10)],
+                "Volume": list(range(100, 110)),
+            }
+        ).to_excel(excel_dir / f"{sym}.xlsx", index=False)
+    out_dir = tmp_path / "out"
+    (out_dir / "symbol=AAA").mkdir(parents=True)
+    (out_dir / "symbol=AAA" / "AAA.parquet").write_bytes(b"eski")
+
+    summary = convert_to_parquet(
+        excel_dir, out_dir, workers=2, float32=True, int_volume=True, row_group_size=4
+    )
+    assert summary["files"] == 2 and summary["rows"] == 20 and summary["parts"] == 4
+    assert summary["bytes_in"] > 0 and summary["bytes_out"] > 0
+    names = sorted(p.name for p in (out_dir / "symbol=AAA").iterdir())
+    assert names == ["part-202401.parquet", "part-202402.parquet"]
+    meta = pq.ParquetFile(out_dir / "symbol=AAA" / "part-202402.parquet").metadata
+    assert meta.num_rows == 5 and meta.num_row_groups == 2
+    stored = pq.read_table(out_dir / "symbol=AAA" / "part-202402.parquet").to_pandas()
+    assert isinstance(stored["symbol"].dtype, pd.CategoricalDtype)
+    assert stored["symbol"].unique().tolist() == ["AAA"]
+
+    loaded = load_prices(["AAA", "BBB"], backend="pandas", parquet_dir=out_dir)
+    assert loaded["Close"].dtype == "float32"
+    assert loaded["Volume"].dtype == "int64"
+    assert len(loaded) == 20
+    assert list(loaded.columns) == ["Date", "Close", "Volume", "Symbol"]
+    first = loaded[loaded["Symbol"] == "AAA"]
+    assert first["Date"].tolist() == list(dates)
+
+
+def test_converted_symbol_column_is_ignored_by_loaders(tmp_path):
+    pytest.importorskip("polars")
+
+    excel_dir = tmp_path / "data"
+    excel_dir.mkdir()
+    pd.DataFrame(
+        {"Date": pd.bdate_range("2024-01-30", periods=4), "Close": [1.0, 2.0, 3.0, 4.0]}
+    ).to_excel(excel_dir / "AAA.xlsx", index=False)
+    out_dir = tmp_path / "out"
+    convert_to_parquet(excel_dir, out_dir)
+
+    loaded = load_prices(["AAA"], backend="pandas", parquet_dir=out_dir, start="2024-02-01")
+    assert list(loaded.columns) == ["Date", "Close", "Symbol"]
+    assert loaded["Symbol"].tolist() == ["AAA", "AAA"]
+    via_polars = load_prices(["AAA"], backend="polars", parquet_dir=out_dir)
+    assert list(via_polars.columns) == ["Date", "Close", "Symbol"]
@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from backtest.batch import iter_scan_range
+from backtest.data.backends.polars_lazy import run_signals
+from backtest.data.loader import load_prices
+from backtest.dsl.polars_expr import to_polars_expr
+
+FILTERS = pd.DataFrame(
+    {
+        "FilterCode": ["F1", "F2", "F3", "F4"],
+        "PythonQuery": [
+            "CROSSUP(close, ema_20)",
+            "close > open and volume > 150",
+            "cross_down(close, sma_20) or rsi_14 > 60",
+            "not (rsi_14 < 50)",
+        ],
+    }
+)
+
+
+def _write(tmp_path):
+    n = 60
+    dates = pd.date_range("2024-01-01", periods=n, freq="B")
+    rng = np.random.default_rng(7)
+    wide = {}
+    for sym in ["AAA", "BBB", "CCC"]:
+        close = 10 + rng.normal(0, 1, n).cumsum()
+        df = pd.DataFrame(
+            {
+                "Date": dates,
+                "Open": close + rng.normal(0, 0.3, n),
+                "High": close + 1,
+                "Low": close - 1,
+                "Close": close,
+                "Volume": rng.integers(100, 200, n).astype(float),
+            }
+        )
+        sym_dir = tmp_path / f"symbol={sym}"
+        sym_dir.mkdir()
+        df.to_parquet(sym_dir / f"{sym}.parquet", index=False)
+        for c in ["Open", "High", "Low", "Close", "Volume"]:
+            wide[f"{sym}_{c.lower()}"] = df[c].to_numpy()
+    return pd.DataFrame(wide, index=dates)
+
+
+def test_polars_lazy_signals_match_batch_runner(tmp_path):
+    wide = _write(tmp_path)
+    start, end = "2024-01-15", str(wide.index[-1].date())
+    got = run_signals(tmp_path, ["AAA", "BBB", "CCC"], FILTERS, start, end)
+    frames = [sig for _, sig in iter_scan_range(wide, start, end, FILTERS)]
+    expected = pd.concat(frames, ignore_index=True).sort_values(["date", "symbol", "filter_code"])
+    assert len(expected) > 0
+    pd.testing.assert_frame_equal(
+        got.reset_index(drop=True), expected.reset_index(drop=True), check_dtype=False
+    )
+
+
+def test_polars_lazy_backend_stays_lazy(tmp_path):
+    _write(tmp_path)
+    lf = load_prices(
+        ["AAA", "BBB"], start="2024-02-01", backend="polars-lazy", parquet_dir=tmp_path
+    )
+    assert isinstance(lf, pl.LazyFrame)
+    df = lf.filter(to_polars_expr("close > open")).collect()
+    assert set(df["symbol"].unique()) <= {"AAA", "BBB"}
+    assert {"date", "close", "symbol"} <= set(df.columns)
@@ -0,0 +1,47 @@
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from backtest.downloader.core import DataDownloader
+from backtest.downloader.providers.stub import StubProvider
+
+
+def _dl(tmp_path, prov, **kw):
+    return DataDownloader(
+        prov, data_dir=tmp_path / "parquet", manifest_path=tmp_path / "manifest.json", **kw
+    )
+
+
+def test_concurrent_fetch_batches_manifest(tmp_path, monkeypatch):
+    symbols = [f"S{i:02d}" for i in range(12)]
+    prov = StubProvider(latency=0.05)
+    dl = _dl(tmp_path, prov, workers=6, batch_size=5)
+    saves = []
+    orig = dl._save_manifest
+    monkeypatch.setattr(dl, "_save_manifest", lambda: saves.append(1) or orig())
+    t0 = time.perf_counter()
+    dl.fetch_range(symbols, "2024-01-01", "2024-02-15")
+    elapsed = time.perf_counter() - t0
+    assert elapsed < 12 * 0.05  # seri yol en az 0.6s sürerdi
+    assert len(saves) == 3  # 12 sembol / 5'lik parti
+    manifest = json.loads((tmp_path / "manifest.json").read_text())
+    assert sorted(manifest) == symbols
+    assert manifest["S00"]["last_date"] == "2024-02-15"
+    parts = sorted(p.name for p in (tmp_path / "parquet" / "symbol=S07").glob("*.parquet"))
+    assert parts == ["part-202401.parquet", "part-202402.parquet"]
+    assert len(pd.read_parquet(tmp_path / "parquet" / "symbol=S07" / "part-202402.parquet")) == 11
+
+
+def test_fetch_retries_then_reports_failures(tmp_path):
+    prov = StubProvider(fail_first=1)
+    dl = _dl(tmp_path, prov, workers=2, retries=1, retry_backoff=0)
+    dl.fetch_range(["AAA", "BBB"], "2024-01-01", "2024-01-05")
+    assert len(prov.calls) == 4
+
+    prov = StubProvider(fail_first=5)
+    dl = _dl(tmp_path / "x", prov, workers=2, retries=1, retry_backoff=0)
+    with pytest.raises(RuntimeError, match="CCC"):
+        dl.fetch_range(["CCC"], "2024-01-01", "2024-01-05")
+    assert not (tmp_path / "x" / "manifest.json").exists()
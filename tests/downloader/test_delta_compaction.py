@@ -0,0 +1,159 @@
+import pandas as pd
+
+from backtest.data.loader import load_prices
+from backtest.downloader.core import DataDownloader
+from backtest.downloader.providers.stub import StubProvider
+from backtest.downloader.schema import CANON_COLS
+
+
+def test_delta_writes_merged_view_and_compaction(tmp_path):
+    data_dir = tmp_path / "parquet"
+    dl = DataDownloader(StubProvider(), data_dir=data_dir, manifest_path=tmp_path / "m.json")
+    dl.fetch_range(["AAA"], "2024-01-01", "2024-01-15")
+    dl.fetch_range(["AAA"], "2024-01-10", "2024-02-09")
+    sym_dir = data_dir / "symbol=AAA"
+    names = sorted(p.name for p in sym_dir.glob("*.parquet"))
+    assert names[0].startswith("delta-202401-")
+    assert names[1:] == ["part-202401.parquet", "part-202402.parquet"]
+    # mevcut parça yeniden yazılmadı, delta yalnızca yeni günleri taşır
+    assert len(pd.read_parquet(sym_dir / "part-202401.parquet")) == 11
+    assert pd.read_parquet(sym_dir / names[0])["date"].min() == pd.Timestamp("2024-01-16")
+
+    before = load_prices(["AAA"], start="2024-01-05", backend="pandas", parquet_dir=data_dir)
+    assert before["date"].is_unique and before["date"].is_monotonic_increasing
+    # çakışan günlerde ilk yazılan satır kazanır (eski yazma yolu gibi)
+    assert before.loc[before["date"] == "2024-01-10", "volume"].item() == 7
+    polars_view = load_prices(["AAA"], backend="polars", parquet_dir=data_dir)
+    assert polars_view["date"].is_unique and len(polars_view) == 30
+    assert dl.integrity_check(["AAA"])["AAA"] == {"issues": []}
+
+    assert dl.compact_cache() == {"AAA": 1}
+    assert sorted(p.name for p in sym_dir.glob("*.parquet")) == [
+        "part-202401.parquet",
+        "part-202402.parquet",
+    ]
+    after = load_prices(["AAA"], start="2024-01-05", backend="pandas", parquet_dir=data_dir)
+    pd.testing.assert_frame_equal(before, after)
+    assert dl.compact_cache() == {}
+
+
+def test_fast_integrity_check_reads_only_suspicious(tmp_path, monkeypatch):
+    data_dir = tmp_path / "parquet"
+    dl = DataDownloader(StubProvider(), data_dir=data_dir, manifest_path=tmp_path / "m.json")
+    dl.fetch_range(["AAA", "BBB", "CCC"], "2024-01-01", "2024-03-29")
+    # BBB: ocak parçasından bir gün silinir (boşluk), CCC: NaN
+    p = data_dir / "symbol=BBB" / "part-202401.parquet"
+    pd.read_parquet(p).drop(index=[5]).to_parquet(p, index=False)
+    p = data_dir / "symbol=CCC" / "part-202402.parquet"
+    df = pd.read_parquet(p)
+    df.loc[3, "close"] = float("nan")
+    df.to_parquet(p, index=False)
+
+    full = dl.integrity_check(["AAA", "BBB", "CCC", "ZZZ"])
+    read = []
+    orig = pd.read_parquet
+    monkeypatch.setattr(
+        pd, "read_parquet", lambda path, *a, **k: read.append(path) or orig(path, *a, **k)
+    )
+    fast = dl.integrity_check(["AAA", "BBB", "CCC", "ZZZ"], fast=True, workers=4)
+    assert fast == full
+    assert fast["AAA"] == {"issues": []}
+    assert "gaps" in fast["BBB"]["issues"] and "nan_values" in fast["CCC"]["issues"]
+    assert fast["ZZZ"] == {"missing": True}
+    assert not any("symbol=AAA" in str(x) for x in read)
+
+
+def _write(path, dates):
+    n = len(dates)
+    df = pd.DataFrame({c: [1.0] * n for c in CANON_COLS if c != "date"})
+    df.insert(0, "date", pd.to_datetime(dates))
+    df.to_parquet(path, index=False)
+
+
+def test_fast_integrity_check_rejects_duplicate_with_gap(tmp_path):
+    data_dir = tmp_path / "parquet"
+    dl = DataDownloader(StubProvider(), data_dir=data_dir, manifest_path=tmp_path / "m.json")
+    sym_dir = data_dir / "symbol=AAA"
+    sym_dir.mkdir(parents=True)
+    # satır sayısı iş günü sayısına eşit: 01-09 iki kez, 01-10 eksik
+    dates = ["2024-01-08", "2024-01-09", "2024-01-09", "2024-01-11", "2024-01-12"]
+    _write(sym_dir / "part-202401.parquet", dates)
+
+    full = dl.integrity_check(["AAA"])
+    assert full["AAA"]["issues"] == ["duplicate_dates", "gaps"]
+    assert dl.integrity_check(["AAA"], fast=True) == full
+
+
+def test_integrity_check_finds_duplicates_across_part_and_delta(tmp_path):
+    data_dir = tmp_path / "parquet"
+    dl = DataDownloader(StubProvider(), data_dir=data_dir, manifest_path=tmp_path / "m.json")
+    sym_dir = data_dir / "symbol=AAA"
+    sym_dir.mkdir(parents=True)
+    _write(sym_dir / "part-202401.parquet", pd.bdate_range("2024-01-08", "2024-01-12"))
+    _write(sym_dir / "delta-202401-1.parquet", ["2024-01-12", "2024-01-15"])
+    _write(sym_dir / "part-202402.parquet", ["2024-01-15", "2024-02-01"])
+
+    full = dl.integrity_check(["AAA"])
+    assert "duplicate_dates" in full["AAA"]["issues"]
+    assert dl.integrity_check(["AAA"], fast=True) == full
+
+
+def test_compaction_waits_for_lock_and_readers_relist(tmp_path, monkeypatch):
+    import threading
+
+    from backtest.data.backends import pandas_backend
+
+    data_dir = tmp_path / "parquet"
+    dl = DataDownloader(StubProvider(), data_dir=data_dir, manifest_path=tmp_path / "m.json")
+    dl.fetch_range(["AAA"], "2024-01-01", "2024-01-15")
+    dl.fetch_range(["AAA"], "2024-01-10", "2024-01-31")
+    sym_dir = data_dir / "symbol=AAA"
+    delta = next(sym_dir.glob("delta-*.parquet"))
+    before = load_prices(["AAA"], backend="pandas", parquet_dir=data_dir)
+
+    # kilit başka işlemdeyken sıkıştırma bekler
+    dl.lock_path.write_text("")
+    worker = threading.Thread(target=dl.compact_cache)
+    worker.start()
+    worker.join(0.2)
+    assert worker.is_alive() and delta.exists()
+    dl.lock_path.unlink()
+    worker.join(5)
+    assert not worker.is_alive() and not delta.exists()
+
+    # sıkıştırmadan önce listelenmiş delta artık yok: okuyucu yeniden listeler
+    listed = []
+    orig = pandas_backend._symbol_files
+
+    def stale_listing(root, sym, start, end):
+        files = orig(root, sym, start, end)
+        listed.append(files)
+        return files + [delta] if len(listed) == 1 else files
+
+    monkeypatch.setattr(pandas_backend, "_symbol_files", stale_listing)
+    after = load_prices(["AAA"], backend="pandas", parquet_dir=data_dir)
+    assert len(listed) == 2
+    pd.testing.assert_frame_equal(before, after)
+
+
+def test_vacuum_expires_whole_months(tmp_path):
+    import os
+
+    data_dir = tmp_path / "parquet"
+    dl = DataDownloader(StubProvider(), data_dir=data_dir, manifest_path=tmp_path / "m.json")
+    dl.fetch_range(["AAA"], "2024-01-01", "2024-01-15")
+    dl.fetch_range(["AAA"], "2024-01-10", "2024-02-09")
+    sym_dir = data_dir / "symbol=AAA"
+    old = 0
+    for p in sym_dir.glob("part-*.parquet"):
+        os.utime(p, (old, old))
+    # Ocak'ın deltası yeni: parçası da kalır; Şubat yalnız eski parçadan ibaret
+    dl.vacuum_cache(older_than_days=30)
+    names = sorted(p.name for p in sym_dir.glob("*.parquet"))
+    assert len(names) == 2 and names[0].startswith("delta-202401-")
+    assert names[1] == "part-202401.parquet"
+
+    for p in sym_dir.glob("*.parquet"):
+        os.utime(p, (old, old))
+    dl.vacuum_cache(older_than_days=30)
+    assert list(sym_dir.glob("*.parquet")) == []
@@ -1,16 +1,23 @@
 import pandas as pd
+import pytest
 
 import backtest.cli as cli
 
 
-def test_cli_scan_range_smoke(monkeypatch, tmp_path):
+@pytest.mark.parametrize(
+    "opts, mode, workers",
+    [([], "range", 1), (["--mode", "stream"], "stream", 1), (["--workers", "3"], "range", 3)],
+)
+def test_cli_scan_range_smoke(monkeypatch, tmp_path, opts, mode, workers):
     df = pd.DataFrame({"close": [1]}, index=pd.to_datetime(["2025-03-07"]))
     monkeypatch.setattr(cli, "read_excels_long", lambda src: df)
 
     called = {}
 
-    def fake_run_scan_range(df_arg, start, end, filters_df, out_dir=None, alias_csv=None):
-        called["ran"] = True
+    def fake_run_scan_range(
+        df_arg, start, end, filters_df, out_dir=None, alias_csv=None, mode="range", workers=1
+    ):
+        called["ran"] = (mode, workers)
         assert start == "2025-03-07"
         assert end == "2025-03-09"
         assert not filters_df.empty
@@ -30,10 +37,123 @@ def test_cli_scan_range_smoke(monkeypatch, tmp_path):
         "--no-preflight",
         "--out",
         str(tmp_path),
+        *opts,
     ]
-    import pytest
 
     with pytest.raises(SystemExit) as exc:
         cli.main(args)
     assert exc.value.code == 0
-    assert called.get("ran")
+    assert called.get("ran") == (mode, workers)
+
+
+def test_cli_scan_range_streams_days(monkeypatch, tmp_path):
+    from backtest.batch import runner
+
+    idx = pd.date_range("2024-01-01", periods=45, freq="B")
+    df = pd.DataFrame(
+        {
+            "symbol": "AAA",
+            "open": 10.0,
+            "high": 11.0,
+            "low": 9.0,
+            "close": [10.0 + i % 3 for i in range(len(idx))],
+            "volume": 100.0,
+        },
+        index=idx,
+    )
+    data = tmp_path / "prices.csv"
+    df.to_csv(data)
+    filters = pd.DataFrame({"FilterCode": ["F1"], "PythonQuery": ["close > 10"]})
+    monkeypatch.setattr(cli, "load_filters_from_module", lambda *a, **k: filters)
+    monkeypatch.setattr(cli, "list_output_files", lambda *a, **k: [])
+    out = tmp_path / "out"
+    # her blok taranırken önceki blokların günleri diske yazılmış olmalı
+    written = []
+    orig = runner._range_hits
+    monkeypatch.setattr(
+        runner,
+        "_range_hits",
+        lambda *a, **k: written.append(len(list(out.glob("*.csv")))) or orig(*a, **k),
+    )
+
+    with pytest.raises(SystemExit) as exc:
+        cli.main(
+            [
+                "scan-range",
+                "--config",
+                "config/colab_config.yaml",
+                "--data",
+                str(data),
+                "--start",
+                str(idx[0].date()),
+                "--end",
+                str(idx[-1].date()),
+                "--no-preflight",
+                "--out",
+                str(out),
+                "--mode",
+                "stream",
+            ]
+        )
+    assert exc.value.code == 0
+    assert written == [0, 20, 40]
+    assert len(list(out.glob("*.csv"))) == len(idx)
+
+
+def test_run_scan_writes_each_day_before_scanning_on(monkeypatch, tmp_path):
+    from types import SimpleNamespace as NS
+
+    import backtest.calendars as calendars
+    import backtest.data_loader as data_loader
+    import backtest.indicators as indicators
+
+    days = pd.date_range("2024-01-01", periods=6, freq="B")
+    df = pd.DataFrame({"symbol": "AAA", "date": days})
+    df[["open", "high", "low", "close", "volume"]] = 1.0
+    monkeypatch.setattr(cli, "read_excels_long", lambda cfg: df)
+    monkeypatch.setattr(data_loader, "canonicalize_columns", lambda df: df)
+    monkeypatch.setattr(calendars, "add_next_close_calendar", lambda df, t: df)
+    monkeypatch.setattr(indicators, "compute_indicators", lambda df, params, engine=None: df)
+    monkeypatch.setattr(
+        cli,
+        "load_filters_from_module",
+        lambda mod, inc: pd.DataFrame([{"FilterCode": "F1", "PythonQuery": "close>0"}]),
+    )
+    monkeypatch.setattr(cli, "dataset_summary", lambda df: pd.DataFrame())
+    monkeypatch.setattr(cli, "quality_warnings", lambda df: pd.DataFrame())
+    order = []
+
+    def fake_screener(panel, filters, d, stop_on_filter_error, raise_on_error):
+        order.append(("scan", pd.Timestamp(d)))
+        return pd.DataFrame({"FilterCode": ["F1"], "Symbol": ["AAA"], "Date": [pd.Timestamp(d)]})
+
+    def fake_returns(prices, sigs, **kwargs):
+        return sigs.assign(EntryClose=1.0, ExitClose=1.0, ReturnPct=0.0, Win=False)
+
+    def fake_write_reports(trades, *, dates, per_day_output, range_event, **kwargs):
+        assert per_day_output and len(dates) == 1 and not range_event
+        assert trades["Date"].eq(dates[0]).all()
+        order.append(("write", pd.Timestamp(dates[0])))
+        return {}
+
+    monkeypatch.setattr(cli, "run_screener", fake_screener)
+    monkeypatch.setattr(cli, "run_1g_returns", fake_returns)
+    monkeypatch.setattr(cli, "write_reports", fake_write_reports)
+    monkeypatch.setattr(
+        cli, "write_range_event", lambda rows, out_dir: order.append(("range", rows))
+    )
+    cfg = NS(
+        project=NS(out_dir=str(tmp_path / "out")),
+        data=NS(),
+        report=NS(),
+        filters=NS(module="io_filters", include=["*"]),
+    )
+    cli._run_scan(cfg)
+
+    # bir günün yazımı en geç iki gün sonrasının taramasından önce biter
+    assert [d for kind, d in order if kind == "write"] == list(days)
+    # aralık olayı tüm günler yazıldıktan sonra bir kez
+    assert order[-1] == ("range", len(days))
+    assert sum(kind == "range" for kind, _ in order) == 1
+    for i, d in enumerate(days[:-2]):
+        assert order.index(("write", d)) < order.index(("scan", days[i + 2]))
@@ -59,3 +59,157 @@ def test_run_scan_range_writes_files(tmp_path: Path):
     # 5 gün dosyası
     files = list(out_dir.glob("*.csv"))
     assert len(files) == 5
+
+
+def _df_wide():
+    n = 30
+    dates = pd.date_range("2024-01-01", periods=n, freq="B")
+    rng = np.random.default_rng(1)
+    data = {}
+    for sym in ["AAA", "BBB", "CCC"]:
+        close = 10 + rng.normal(0, 1, n).cumsum()
+        data[f"{sym}_open"] = close + rng.normal(0, 0.1, n)
+        data[f"{sym}_high"] = close + 1
+        data[f"{sym}_low"] = close - 1
+        data[f"{sym}_close"] = close
+        data[f"{sym}_volume"] = rng.integers(100, 200, n)
+    return pd.DataFrame(data, index=dates)
+
+
+def test_run_scan_range_modes_identical(tmp_path: Path):
+    df = _df_wide()
+    filters_df = pd.DataFrame(
+        {
+            "FilterCode": ["F1", "F2", "F3"],
+            "PythonQuery": [
+                "CROSSUP(close, ema_20)",
+                "close > open and volume > 150",
+                "rsi_14 < 50",
+            ],
+        }
+    )
+    start, end = str(df.index[5].date()), str(df.index[-1].date())
+    run_scan_range(df, start, end, filters_df, out_dir=str(tmp_path / "r"), chunk_size=2)
+    run_scan_range(
+        df, start, end, filters_df, out_dir=str(tmp_path / "d"), chunk_size=2, mode="daily"
+    )
+    range_files = sorted((tmp_path / "r").glob("*.csv"))
+    daily_files = sorted((tmp_path / "d").glob("*.csv"))
+    assert [p.name for p in range_files] == [p.name for p in daily_files]
+    assert len(range_files) == len(df.index) - 5
+    total = 0
+    for a, b in zip(range_files, daily_files):
+        assert a.read_text() == b.read_text()
+        total += len(pd.read_csv(a))
+    assert total > 0
+
+
+def test_run_scan_range_shared_pool_matches_serial(tmp_path: Path, caplog):
+    df = _df_wide()
+    filters_df = pd.DataFrame(
+        {
+            "FilterCode": ["F1", "F2"],
+            "PythonQuery": ["close > open and volume > 150", "rsi_14 < 50"],
+        }
+    )
+    start, end = str(df.index[5].date()), str(df.index[-1].date())
+    run_scan_range(df, start, end, filters_df, out_dir=str(tmp_path / "s"), chunk_size=2)
+    with caplog.at_level("INFO", logger="runner"):
+        for mode in ("range", "daily"):
+            run_scan_range(
+                df,
+                start,
+                end,
+                filters_df,
+                out_dir=str(tmp_path / mode),
+                chunk_size=2,
+                workers=2,
+                mode=mode,
+            )
+    assert any(r.getMessage().startswith("WORKER pid=") for r in caplog.records)
+    serial = sorted((tmp_path / "s").glob("*.csv"))
+    for mode in ("range", "daily"):
+        pooled = sorted((tmp_path / mode).glob("*.csv"))
+        assert [p.name for p in pooled] == [p.name for p in serial]
+        for a, b in zip(serial, pooled):
+            assert a.read_text() == b.read_text()
+
+
+def test_shared_panel_symbol_views():
+    from backtest.batch.shm import SharedPanel
+
+    a = pd.DataFrame({"close": [1.0, 2.0], "volume": [10, 20]}, index=idx[:2])
+    b = pd.DataFrame({"close": [3.0, 4.0, 5.0], "flag": [True, False, True]}, index=idx[:3])
+    with SharedPanel.create([("AAA", a), ("BBB", b)]) as panel:
+        assert panel.spec.symbols == ("AAA", "BBB")
+        assert panel.spec.offsets == (0, 2, 5)
+        peer = SharedPanel.attach(panel.spec)
+        got = peer.symbol_frame(1)
+        assert got.index.equals(b.index)
+        # her sembol kendi kolonları ve dtype'larıyla geri gelir
+        pd.testing.assert_frame_equal(got, b, check_freq=False)
+        pd.testing.assert_frame_equal(peer.symbol_frame(0), a, check_freq=False)
+        del got
+        peer.close()
+
+
+def test_shared_pool_matches_serial_on_mixed_dtypes(tmp_path: Path):
+    import pytest
+
+    df = _df_wide()
+    n = len(df)
+    for sym in ["AAA", "BBB", "CCC"]:
+        df[f"{sym}_halted"] = np.arange(n) % 3 == 0
+    df["AAA_vwap"] = df["AAA_close"] + 0.1  # yalnız AAA'da
+    df["BBB_sector"] = np.where(np.arange(n) % 2 == 0, "BANK", "IND")
+    filters_df = pd.DataFrame(
+        {
+            "FilterCode": ["H", "VOL"],
+            "PythonQuery": ["close > open and not halted", "volume > 150"],
+        }
+    )
+    start, end = str(df.index[0].date()), str(df.index[-1].date())
+    run_scan_range(df, start, end, filters_df, out_dir=str(tmp_path / "s"), chunk_size=1)
+    run_scan_range(df, start, end, filters_df, out_dir=str(tmp_path / "p"), chunk_size=1, workers=2)
+    serial = sorted((tmp_path / "s").glob("*.csv"))
+    assert [p.name for p in sorted((tmp_path / "p").glob("*.csv"))] == [p.name for p in serial]
+    for a in serial:
+        assert a.read_text() == (tmp_path / "p" / a.name).read_text()
+
+    # eksik kolon havuzda da NaN ile doldurulmaz: iki yol aynı hatayı verir
+    missing = pd.DataFrame({"FilterCode": ["V"], "PythonQuery": ["close > vwap"]})
+    for workers in (1, 2):
+        with pytest.raises(ValueError, match="vwap"):
+            run_scan_range(df, start, end, missing, out_dir=str(tmp_path / "m"), workers=workers)
+
+
+def test_iter_scan_range_streams_same_signals(tmp_path: Path):
+    from backtest.batch import iter_scan_range
+
+    df = _df_wide()
+    filters_df = pd.DataFrame(
+        {
+            "FilterCode": ["F1", "F2", "F3"],
+            "PythonQuery": [
+                "CROSSUP(close, ema_20)",
+                "close > open and volume > 150",
+                "cross_down(close, sma_20)",
+            ],
+        }
+    )
+    start, end = str(df.index[0].date()), str(df.index[-1].date())
+    out_dir = tmp_path / "range"
+    run_scan_range(df, start, end, filters_df, out_dir=str(out_dir))
+    batches = list(iter_scan_range(df, start, end, filters_df, batch_days=7))
+    assert [d for d, _ in batches] == list(df.index)
+    for day, sig in batches:
+        expected = pd.read_csv(out_dir / f"{day.date()}.csv")
+        got = sig.assign(date=sig["date"].dt.strftime("%Y-%m-%d"))
+        pd.testing.assert_frame_equal(
+            got.reset_index(drop=True), expected, check_dtype=False, check_index_type=False
+        )
+
+    stream_dir = tmp_path / "stream"
+    run_scan_range(df, start, end, filters_df, out_dir=str(stream_dir), mode="stream")
+    for p in sorted(out_dir.glob("*.csv")):
+        assert p.read_bytes() == (stream_dir / p.name).read_bytes()
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from backtest.data_loader import canonicalize_columns
+
+
+def _reference(df: pd.DataFrame) -> pd.DataFrame:
+    """Pairwise ``Series.equals`` dedup (the previous loop, renaming by position)."""
+    seen = {}
+    i = 0
+    while i < df.shape[1]:
+        col = df.columns[i]
+        if col not in seen:
+            seen[col] = df.iloc[:, i]
+            i += 1
+            continue
+        if seen[col].equals(df.iloc[:, i]):
+            logging.info("Dropping duplicate column '%s'", col)
+            df = df.iloc[:, [j for j in range(df.shape[1]) if j != i]]
+            continue
+        new_name = f"{col}_alt"
+        j = 1
+        while new_name in df.columns:
+            j += 1
+            new_name = f"{col}_alt{j}"
+        logging.info("Column '%s' conflicts with existing; renamed to '%s'", col, new_name)
+        cols = list(df.columns)
+        cols[i] = new_name
+        df = df.set_axis(cols, axis=1)
+        seen[new_name] = df.iloc[:, i]
+        i += 1
+    return df
+
+
+def test_hash_dedup_matches_pairwise_equals(caplog):
+    frame = pd.DataFrame(
+        [
+            [1.0, 1.0, 2.0, 1.0, 3.0, 1, "x", "x", 1.0],
+            [np.nan, np.nan, 2.0, np.nan, 3.0, 2, "y", "y", 5.0],
+            [0.0, -0.0, 2.0, 0.0, 3.0, 3, None, None, 0.0],
+        ],
+        columns=["RSI_14"] * 3 + ["RSI_14.1", "RSI_14_alt", "EMA_5", "s", "s", "EMA_5"],
+    )
+    # NaN ve -0.0 hücreleri equals ile eşit sayılır; int ve float EMA_5 farklıdır
+    renamed = frame.copy()
+    renamed.columns = ["RSI_14"] * 4 + ["RSI_14_alt", "EMA_5", "s", "s", "EMA_5"]
+    caplog.set_level(logging.INFO)
+    expected = _reference(renamed)
+    ref_logs = [r.getMessage() for r in caplog.records]
+    caplog.clear()
+
+    out = canonicalize_columns(frame)
+    logs = [r.getMessage() for r in caplog.records if "renamed to 'RSI_14'" not in r.getMessage()]
+    pd.testing.assert_frame_equal(out, expected)
+    assert logs == ref_logs
+    assert list(out.columns) == ["RSI_14", "RSI_14_alt2", "RSI_14_alt", "EMA_5", "s", "EMA_5_alt"]
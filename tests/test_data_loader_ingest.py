@@ -0,0 +1,96 @@
+import pandas as pd
+import pytest
+
+from backtest.data_loader import read_excels_long
+
+
+def _write_book(path, symbols):
+    with pd.ExcelWriter(path) as xw:
+        for i, sym in enumerate(symbols):
+            pd.DataFrame(
+                {
+                    "date": pd.date_range("2024-01-01", periods=4).strftime("%Y-%m-%d"),
+                    "open": [1.0 + i, 2.0, 3.0, 4.0],
+                    "high": [2.0 + i, 3.0, 4.0, 5.0],
+                    "low": [0.5, 1.5, 2.5, 3.5],
+                    "close": [1.5 + i, 2.5, 3.5, 4.5],
+                    "volume": [100, 200, 300, 400],
+                }
+            ).to_excel(xw, sheet_name=sym, index=False)
+        pd.DataFrame({"note": ["x"]}).to_excel(xw, sheet_name="INFO", index=False)
+
+
+def test_process_ingest_matches_thread(tmp_path):
+    _write_book(tmp_path / "a.xlsx", ["AAA", "BBB"])
+    _write_book(tmp_path / "b.xlsx", ["CCC"])
+    cfg = {"data": {"excel_dir": str(tmp_path), "enable_cache": False}}
+    threaded = read_excels_long(cfg)
+    processed = read_excels_long(cfg, ingest="process", workers=2)
+    assert sorted(processed["symbol"].unique()) == ["AAA", "BBB", "CCC"]
+    pd.testing.assert_frame_equal(threaded, processed)
+
+
+def test_process_ingest_opens_each_book_once_per_task(tmp_path, monkeypatch):
+    import backtest.data_loader as dl
+
+    _write_book(tmp_path / "a.xlsx", ["AAA", "BBB", "CCC"])
+    opened = []
+    orig = pd.ExcelFile
+    monkeypatch.setattr(dl.pd, "ExcelFile", lambda p, *a, **k: opened.append(p) or orig(p, *a, **k))
+    fpath, batches, n_sheets, _ = dl._ingest_sheets_task(
+        (str(tmp_path / "a.xlsx"), None, "openpyxl", None, False)
+    )
+    assert opened == [str(tmp_path / "a.xlsx")]
+    assert n_sheets == 4 and len(batches) == 3
+    monkeypatch.undo()
+
+    # tek kitap, dört işçi: sayfalar gruplara bölünür, sonuç aynı kalır
+    cfg = {"data": {"excel_dir": str(tmp_path), "enable_cache": False}}
+    pd.testing.assert_frame_equal(
+        read_excels_long(cfg), read_excels_long(cfg, ingest="process", workers=4)
+    )
+
+
+def test_unknown_ingest_mode(tmp_path):
+    with pytest.raises(ValueError):
+        read_excels_long(tmp_path, ingest="fork")
+
+
+def test_aggregate_cache_refreshes_only_changed_books(tmp_path, monkeypatch):
+    import os
+
+    import backtest.data_loader as dl
+
+    src = tmp_path / "src"
+    src.mkdir()
+    _write_book(src / "a.xlsx", ["AAA", "BBB"])
+    _write_book(src / "b.xlsx", ["CCC"])
+    cache = tmp_path / "agg.parquet"
+    cfg = {"data": {"excel_dir": str(src), "enable_cache": True, "cache_parquet_path": str(cache)}}
+    first = read_excels_long(cfg)
+    assert (tmp_path / "agg.parquet.manifest.json").exists()
+
+    parsed = []
+    orig = dl._parse_sheet
+
+    def parse(xls, sheet, *a, **k):
+        parsed.append(sheet)
+        return orig(xls, sheet, *a, **k)
+
+    monkeypatch.setattr(dl, "_parse_sheet", parse)
+    # yalnız mtime değişti: içerik özeti aynı, yeniden okunmaz
+    os.utime(src / "a.xlsx", None)
+    assert read_excels_long(cfg).equals(first)
+    assert parsed == []
+
+    _write_book(src / "b.xlsx", ["CCC", "DDD"])
+    refreshed = read_excels_long(cfg)
+    assert sorted(set(parsed)) == ["CCC", "DDD", "INFO"]
+    assert sorted(refreshed["symbol"].unique()) == ["AAA", "BBB", "CCC", "DDD"]
+
+    cache.unlink()
+    full = read_excels_long(cfg)
+    assert set(full.columns) == set(refreshed.columns)
+    pd.testing.assert_frame_equal(
+        refreshed.reset_index(drop=True), full[refreshed.columns].reset_index(drop=True)
+    )
@@ -74,3 +74,29 @@ def test_nan_policy():
     ev = Evaluator(ctx)
     out = ev.eval("x > y")
     assert out.tolist() == [True, False, True, True, True]
+
+
+def test_filter_plan_shares_subexpressions():
+    from backtest.dsl import FilterPlan
+
+    ctx = _ctx(
+        close=[11, 9, 11, 12, 8],
+        sma_20=[10, 10, 10, 10, 10],
+        rsi_14=[25, 35, 28, 40, 20],
+        a=[9, 10, 11, 10, 12],
+        b=[10, 10, 10, 10, 10],
+    )
+    filters = {
+        "F1": "close > sma_20",
+        "F2": "close > sma_20 or rsi_14 < 30",
+        "F3": "rsi_14 < 30 or cross_up(a, b)",
+        "F4": "cross_up(a, b) or close > sma_20",
+    }
+    plan = FilterPlan(filters)
+    masks = plan.evaluate(ctx)
+    ev = Evaluator(ctx)
+    for code, expr in filters.items():
+        assert masks[code].tolist() == ev.eval(expr).tolist()
+    # 10 operator nodes in total; 3 shared terms + 3 distinct ORs are unique
+    assert plan.stats == {"filters": 4, "ops": 10, "unique_ops": 6, "saved": 4}
+    assert plan.last_evaluations == 6
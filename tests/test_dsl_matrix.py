@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.dsl import Evaluator, MatrixContext, MatrixEvaluator, SeriesContext
+
+EXPRS = [
+    "close > sma_20",
+    "rsi_14 < 30 or close >= sma_20 * 1.02",
+    "rsi_14 > 55 and close > sma_20",
+    "not (close > sma_20)",
+    "20 < rsi_14 <= 70",
+    "(close - sma_20) / sma_20 > 0.01",
+    "close % 3 != 1",
+    "-rsi_14 + 50",
+    "cross_up(close, sma_20)",
+    "cross_down(close, sma_20)",
+    "cross_up(rsi_14, 30)",
+    "cross_down(rsi_14, 70)",
+    "cross_down(close, level)",
+]
+
+
+def _wide():
+    rng = np.random.default_rng(3)
+    dates = pd.bdate_range("2024-01-01", periods=60)
+    syms = [f"S{i}" for i in range(8)]
+
+    def frame(lo, hi):
+        vals = rng.uniform(lo, hi, size=(len(dates), len(syms)))
+        vals[rng.random(vals.shape) < 0.05] = np.nan
+        return pd.DataFrame(vals, index=dates, columns=syms)
+
+    close = frame(9, 11).round(1)
+    sma = frame(9.5, 10.5).round(1)
+    rsi = frame(0, 100)
+    level = pd.DataFrame(10.0, index=dates, columns=syms)
+    level["S1"] = sma["S1"]  # non-constant column takes the general branch
+    level.iloc[:, 2] = np.nan
+    return {"close": close, "sma_20": sma, "rsi_14": rsi, "level": level}
+
+
+@pytest.mark.parametrize("expr", EXPRS)
+def test_matrix_matches_series_evaluator(expr):
+    frames = _wide()
+    got = MatrixEvaluator(MatrixContext(frames)).eval_frame(expr)
+    for sym in got.columns:
+        ctx = SeriesContext({k: v[sym] for k, v in frames.items()})
+        expected = Evaluator(ctx).eval(expr)
+        assert got[sym].tolist() == expected.tolist(), sym
+
+
+def test_matrix_context_from_long():
+    frames = _wide()
+    long = (
+        pd.concat({k: v.stack(dropna=False) for k, v in frames.items()}, axis=1)
+        .rename_axis(["date", "symbol"])
+        .reset_index()
+    )
+    ctx = MatrixContext.from_long(long, ["close", "sma_20"])
+    assert ctx.shape == (60, 8)
+    mask = MatrixEvaluator(ctx).eval_frame("close > sma_20")
+    expected = (frames["close"] > frames["sma_20"]).rename_axis(index="date", columns="symbol")
+    pd.testing.assert_frame_equal(mask, expected, check_freq=False)
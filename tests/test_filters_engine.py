@@ -24,3 +24,13 @@ def test_macd_names():
     df = _df()
     s = evaluate(df, "macd_line > macd_signal")
     assert s.tolist() == [True, False, True]
+
+
+def test_compiled_filter_cached_and_binds_referenced_columns():
+    from backtest.filters.engine import compile_filter
+
+    cf = compile_filter("MACD_line > macd-signal AND true")
+    assert compile_filter("MACD_line > macd-signal AND true") is cf
+    assert cf.names == ("macd_line", "macd_signal")
+    df = _df()
+    assert cf.evaluate(df).tolist() == evaluate(df, "macd_line > macd_signal").tolist()
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.indicators import batch
+from backtest.indicators.compute import ensure_cci, ensure_mom, ensure_roc, ensure_stochrsi
+from backtest.precompute import Precomputer
+
+
+def _panel(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for sym, n in (("AAA", 160), ("BBB", 90), ("CCC", 12)):
+        close = 20 + rng.normal(0, 1, n).cumsum()
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": pd.bdate_range("2024-01-01", periods=n),
+                    "symbol": sym,
+                    "open": close,
+                    "high": close + rng.random(n),
+                    "low": close - rng.random(n),
+                    "close": close,
+                }
+            )
+        )
+    # satır sırası karışık: motor sembol/tarih sırasını kendisi kurar
+    return pd.concat(frames).sample(frac=1, random_state=seed).reset_index(drop=True)
+
+
+def _by_symbol(df: pd.DataFrame):
+    for sym, g in df.groupby("symbol"):
+        yield sym, g.sort_values("date").reset_index(drop=True)
+
+
+def test_panel_matches_compute_helpers_per_symbol():
+    df = _panel()
+    names = ["stochrsi_k_14_14_3_3", "cci_20", "mom_10", "roc_12"]
+    out = batch.compute_panel(df, names)
+    assert out.index.equals(df.index)
+    for sym, g in _by_symbol(out):
+        ref = g[["high", "low", "close"]].copy()
+        ref = ensure_cci(ensure_roc(ensure_mom(ensure_stochrsi(ref, 14, 14, 3, 3), 10), 12), 20)
+        for col in ["stochrsi_k_14_14_3_3", "stochrsi_d_14_14_3_3", "cci_20", "mom_10", "roc_12"]:
+            pd.testing.assert_series_equal(g[col], ref[col], check_names=False, rtol=1e-9)
+
+
+def test_panel_windows_do_not_leak_across_symbols():
+    df = _panel(1)
+    out = batch.compute_panel(df, ["sma_5", "ema_5", "rsi_5"])
+    for sym, g in _by_symbol(out):
+        assert g["sma_5"].iloc[:4].isna().all()
+        assert g["ema_5"].iloc[:4].isna().all()
+        assert g["rsi_5"].iloc[:5].isna().all()
+        expected = g["close"].rolling(5).mean()
+        pd.testing.assert_series_equal(g["sma_5"], expected, check_names=False, rtol=1e-9)
+
+
+def test_precomputer_uses_panel_engine():
+    df = _panel(2)
+    out = Precomputer().precompute(df, {"macd_12_26_9", "bbh_20_2", "adx_14"})
+    assert {"macd_signal_12_26_9", "macd_hist_12_26_9", "bbl_20_2", "bbm_20_2"} <= set(out.columns)
+    assert "dmp_14" not in out.columns
+    single = batch.compute_panel(df[df["symbol"] == "BBB"], ["adx_14"])
+    pd.testing.assert_series_equal(
+        out.loc[df["symbol"] == "BBB", "adx_14"], single["adx_14"], rtol=1e-12
+    )
+
+
+PANDAS_TA_CASES = [
+    ("sma_10", lambda ta, g: ta.sma(g["close"], length=10)),
+    ("ema_10", lambda ta, g: ta.ema(g["close"], length=10)),
+    ("wma_10", lambda ta, g: ta.wma(g["close"], length=10)),
+    ("rsi_14", lambda ta, g: ta.rsi(g["close"], length=14)),
+    ("adx_14", lambda ta, g: ta.adx(g["high"], g["low"], g["close"], length=14)["ADX_14"]),
+    ("dmp_14", lambda ta, g: ta.adx(g["high"], g["low"], g["close"], length=14)["DMP_14"]),
+    ("dmn_14", lambda ta, g: ta.adx(g["high"], g["low"], g["close"], length=14)["DMN_14"]),
+    ("macd_12_26_9", lambda ta, g: ta.macd(g["close"], 12, 26, 9)["MACD_12_26_9"]),
+    ("macd_signal_12_26_9", lambda ta, g: ta.macd(g["close"], 12, 26, 9)["MACDs_12_26_9"]),
+    ("macd_hist_12_26_9", lambda ta, g: ta.macd(g["close"], 12, 26, 9)["MACDh_12_26_9"]),
+    ("bbl_20_2", lambda ta, g: ta.bbands(g["close"], length=20, std=2)["BBL_20_2.0"]),
+    ("bbm_20_2", lambda ta, g: ta.bbands(g["close"], length=20, std=2)["BBM_20_2.0"]),
+    ("bbh_20_2", lambda ta, g: ta.bbands(g["close"], length=20, std=2)["BBU_20_2.0"]),
+]
+
+
+@pytest.mark.parametrize("name,ref", PANDAS_TA_CASES, ids=[c[0] for c in PANDAS_TA_CASES])
+def test_parity_with_pandas_ta(name, ref):
+    ta = pytest.importorskip("pandas_ta")
+    df = _panel(3)
+    out = batch.compute_panel(df, [name])
+    for sym, g in _by_symbol(out[out["symbol"] != "CCC"]):
+        pd.testing.assert_series_equal(g[name], ref(ta, g), check_names=False, rtol=1e-8)
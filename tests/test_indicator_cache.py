@@ -0,0 +1,173 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtest.batch import run_scan_range
+from backtest.indicators.cache import IndicatorCache, fingerprint
+from backtest.indicators.precompute import precompute_for_chunk
+
+idx = pd.date_range("2024-01-01", periods=40, freq="B")
+
+
+def _df(seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 10 + rng.normal(0, 1, len(idx)).cumsum()
+    df = pd.DataFrame(
+        {
+            "open": close,
+            "high": close + 1,
+            "low": close - 1,
+            "close": close,
+            "volume": rng.integers(100, 200, len(idx)),
+        },
+        index=idx,
+    )
+    df.attrs["symbol"] = "SYM"
+    return df
+
+
+def test_fingerprint_tracks_input_columns_only():
+    df = _df()
+    fp = fingerprint(df, ["close"])
+    other = df.copy()
+    other["volume"] = 0
+    assert fingerprint(other, ["close"]) == fp
+    other.iloc[-1, other.columns.get_loc("close")] += 1
+    assert fingerprint(other, ["close"]) != fp
+
+
+def test_cache_reuses_series_across_instances(tmp_path: Path):
+    df = _df()
+    cache = IndicatorCache(tmp_path)
+    out1 = precompute_for_chunk(df, {"sma", "rsi"}, cache=cache)
+    assert cache.stats == {"hits": 0, "misses": 2}
+    precompute_for_chunk(df, {"sma", "rsi"}, cache=cache)
+    assert cache.stats == {"hits": 2, "misses": 2}
+
+    fresh = IndicatorCache(tmp_path)
+    out2 = precompute_for_chunk(df, {"sma", "rsi"}, cache=fresh)
+    assert fresh.stats == {"hits": 2, "misses": 0}
+    pd.testing.assert_frame_equal(out1, out2)
+
+    changed = _df(seed=1)
+    precompute_for_chunk(changed, {"sma"}, cache=fresh)
+    assert fresh.misses == 1
+
+
+def test_run_scan_range_honours_ind_cache(tmp_path: Path, caplog):
+    df = _df()
+    filters_df = pd.DataFrame({"FilterCode": ["F1"], "PythonQuery": ["close > sma_20"]})
+    start, end = str(idx[20].date()), str(idx[-1].date())
+    cache_dir = tmp_path / "ind"
+    with caplog.at_level("INFO", logger="runner"):
+        run_scan_range(
+            df, start, end, filters_df, out_dir=str(tmp_path / "a"), ind_cache=str(cache_dir)
+        )
+        run_scan_range(
+            df,
+            start,
+            end,
+            filters_df,
+            out_dir=str(tmp_path / "b"),
+            ind_cache=str(cache_dir),
+            mode="daily",
+        )
+    msgs = [r.getMessage() for r in caplog.records if r.getMessage().startswith("INDICATOR_CACHE")]
+    assert msgs[0].startswith("INDICATOR_CACHE hits=0 misses=1")
+    assert msgs[1].startswith(f"INDICATOR_CACHE hits={len(idx) - 20} misses=0")
+    assert any(cache_dir.rglob("sma_20-*.parquet"))
+
+
+def _panel(seed: int = 0) -> pd.DataFrame:
+    frames = []
+    for sym in ("AAA", "BBB"):
+        sub = _df(seed if sym == "AAA" else seed + 10).reset_index(names="date")
+        frames.append(sub.assign(symbol=sym))
+    return pd.concat(frames, ignore_index=True)
+
+
+def test_precomputer_store_skips_unchanged_symbols(tmp_path: Path):
+    from backtest.indicators import batch
+    from backtest.indicators.plan import Plan
+    from backtest.precompute import Precomputer
+
+    df = _panel()
+    names = {"rsi_14", "macd_12_26_9"}
+    first = Precomputer(store=tmp_path / "store")
+    out1 = first.precompute(df, names)
+    assert first.store.stats == {"hits": 0, "misses": 4}
+
+    calls = []
+    orig = Plan.run
+
+    def spy(self, mats):
+        kinds = tuple(sorted(s.kind for s in self.specs))
+        calls.append((kinds, next(iter(mats.values())).shape[1]))
+        return orig(self, mats)
+
+    again = Precomputer(store=tmp_path / "store")
+    try:
+        Plan.run = spy
+        out2 = again.precompute(df, names)
+        assert calls == [] and again.store.stats == {"hits": 4, "misses": 0}
+        pd.testing.assert_frame_equal(out1, out2)
+
+        changed = df.copy()
+        changed.loc[changed["symbol"] == "BBB", "close"] += 1.0
+        out3 = again.precompute(changed, names)
+    finally:
+        Plan.run = orig
+    # yalnız BBB yeniden hesaplanır (tek plan geçişi), sonuç depo olmadan hesaplananla aynı
+    assert calls == [(("macd", "rsi"), 1)]
+    pd.testing.assert_frame_equal(out3, batch.compute_panel(changed, sorted(names)))
+
+
+def test_store_lru_eviction_and_vacuum(tmp_path: Path):
+    import os
+
+    cache = IndicatorCache(tmp_path)
+    series = pd.Series(np.arange(200, dtype="float64"))
+    cache.put("AAA", "SMA_20", "fp1", series)
+    one = cache.disk_bytes
+    cache.put("BBB", "sma_20", "fp1", series)
+    old = tmp_path / "AAA" / "sma_20-fp1.parquet"
+    assert old.exists()
+    os.utime(old, (1, 1))  # AAA en eski kullanılmış
+    (tmp_path / "BBB" / "junk.parquet.tmp").write_bytes(b"x")
+    (tmp_path / "CCC").mkdir()
+    (tmp_path / "CCC" / "bad-fp.parquet").write_bytes(b"bozuk")
+
+    stats = IndicatorCache(tmp_path).vacuum(max_bytes=int(one * 1.5))
+    assert stats["removed"] == 3 and stats["entries"] == 1
+    assert not old.exists() and not (tmp_path / "CCC").exists()
+
+    bounded = IndicatorCache(tmp_path, max_bytes=int(one * 1.5))
+    assert bounded.get("bbb", "SMA_20", "fp1") is None  # sembol anahtarı büyük/küçük harf duyarlı
+    assert bounded.get("BBB", "SMA_20", "fp1").name == "SMA_20"
+    bounded.put("DDD", "ema_5", "fp2", series)
+    assert bounded.evicted == 1
+    assert not (tmp_path / "BBB" / "sma_20-fp1.parquet").exists()
+    assert bounded.get("DDD", "ema_5", "fp2") is not None
+
+
+def test_memory_level_is_lru_bounded(tmp_path: Path):
+    series = [pd.Series(np.arange(100, dtype="float64") + i) for i in range(5)]
+    one = int(series[0].memory_usage(index=True))
+    cache = IndicatorCache(tmp_path, mem_max_bytes=2 * one)
+    for i, s in enumerate(series):
+        cache.put("SYM", "sma_5", f"fp{i}", s)
+        if i == 3:
+            cache.get("SYM", "sma_5", "fp2")  # fp2 yeniden kullanıldı: yerine fp3 düşer
+    assert [k[2] for k in cache._mem] == ["fp2", "fp4"]
+    assert cache._mem_bytes == 2 * one
+    # bellekten düşen giriş diskten okunur
+    pd.testing.assert_series_equal(
+        cache.get("SYM", "sma_5", "fp0"), series[0].rename("sma_5"), check_freq=False
+    )
+    assert len(cache._mem) <= 2
+
+    unbounded = IndicatorCache(mem_max_bytes=None)
+    for i, s in enumerate(series):
+        unbounded.put("SYM", "sma_5", f"fp{i}", s)
+    assert len(unbounded._mem) == 5
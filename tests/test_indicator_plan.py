@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.indicators import batch
+from backtest.indicators.plan import Plan, build_plan
+from backtest.precompute import Precomputer
+
+NAMES = [
+    "sma_20",
+    "ema_12",
+    "ema_26",
+    "wma_10",
+    "rsi_14",
+    "adx_14",
+    "dmp_14",
+    "dmn_14",
+    "macd_12_26_9",
+    "bbm_20_2",
+    "cci_20",
+    "stochrsi_k_14_14_3_3",
+    "mom_10",
+    "roc_10",
+]
+
+
+def _mats(seed: int = 0, n: int = 200):
+    rng = np.random.default_rng(seed)
+    close = 50 + rng.normal(0, 1, (n, 3)).cumsum(axis=0)
+    close[:40, 2] = np.nan  # geç başlayan sembol
+    return {
+        "close": close,
+        "high": close + rng.random((n, 3)),
+        "low": close - rng.random((n, 3)),
+    }
+
+
+def test_plan_matches_compute_spec_exactly():
+    mats = _mats()
+    res = build_plan(NAMES).run(mats)
+    for name in NAMES:
+        spec = batch.parse_spec(name)
+        ref = batch.compute_spec(spec, mats)
+        for col in spec.outputs:
+            np.testing.assert_array_equal(res[col], ref[col], err_msg=col)
+
+
+def test_shared_intermediates_are_single_nodes():
+    plan = build_plan(["adx_14", "dmp_14", "dmn_14", "rsi_14", "stochrsi_k_14_14_3_3"])
+    keys = list(plan.nodes)
+    assert keys.count("tr") == 1
+    assert sum(k.startswith("dx(") for k in keys) == 1
+    # rsi_14 ve stochrsi aynı Wilder ortalamalarını kullanır
+    assert sum(k.startswith("ewm(gain(") for k in keys) == 1
+    assert "rsi(close,14)" in plan.shared()
+
+    plan = build_plan(["macd_12_26_9", "ema_12", "bbh_20_2", "sma_20"])
+    assert "ema(close,12)" in plan.shared() and "sma(close,20)" in plan.shared()
+    assert set(plan.inputs) == {"close"}
+
+
+def test_plan_logs_order_and_node_timings(caplog):
+    plan = build_plan(["macd_12_26_9", "ema_26"])
+    with caplog.at_level(logging.INFO, logger="backtest.indicators.plan"):
+        plan.run(_mats())
+    msgs = [r.getMessage() for r in caplog.records]
+    assert any(m.startswith("PLAN specs=2 nodes=5 shared=3") for m in msgs)
+    assert any(m.startswith("PLAN took=") and "ema(close,26)=" in m for m in msgs)
+    assert set(plan.timings) == {k for k, (fn, _) in plan.nodes.items() if fn is not None}
+
+
+def test_unknown_name_rejected():
+    with pytest.raises(ValueError):
+        build_plan(["foo_3"])
+    assert isinstance(build_plan([]), Plan)
+
+
+def test_precomputer_single_series_uses_plan():
+    mats = _mats(1)
+    df = pd.DataFrame({f: m[:, 0] for f, m in mats.items()})
+    out = Precomputer().precompute(df, {"adx_14", "dmp_14", "macd_12_26_9"})
+    ref = build_plan(["adx_14", "dmp_14", "macd_12_26_9"]).run(mats)
+    for col in ["adx_14", "dmp_14", "macd_signal_12_26_9"]:
+        np.testing.assert_array_equal(out[col].to_numpy(), ref[col][:, 0])
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.indicators import batch
+from backtest.indicators.cache import IndicatorCache
+from backtest.indicators.state import IndicatorState
+
+NAMES = [
+    "sma_10",
+    "ema_10",
+    "wma_10",
+    "rsi_14",
+    "adx_14",
+    "dmp_14",
+    "macd_12_26_9",
+    "bbh_20_2",
+    "cci_20",
+    "stochrsi_k_14_14_3_3",
+    "mom_10",
+    "roc_12",
+]
+
+
+def _panel(lengths=(("AAA", 120), ("BBB", 70)), seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    frames = []
+    for sym, n in lengths:
+        close = 20 + rng.normal(0, 1, n).cumsum()
+        frames.append(
+            pd.DataFrame(
+                {
+                    "date": pd.bdate_range("2023-01-02", periods=n),
+                    "symbol": sym,
+                    "high": close + rng.random(n),
+                    "low": close - rng.random(n),
+                    "close": close,
+                }
+            )
+        )
+    return pd.concat(frames, ignore_index=True)
+
+
+def _split(df: pd.DataFrame, last: int):
+    pos = df.groupby("symbol").cumcount()
+    size = df.groupby("symbol")["date"].transform("size")
+    head = pos < size - last
+    return df[head], df[~head]
+
+
+def test_advance_matches_full_recompute_bar_by_bar(tmp_path):
+    full = _panel()
+    hist, new = _split(full, 5)
+    state, first = IndicatorState.from_history(hist, NAMES)
+    pd.testing.assert_frame_equal(first, batch.compute_panel(hist, NAMES), check_like=True)
+
+    state.save(IndicatorCache(tmp_path))
+    state = IndicatorState.load(tmp_path)
+    seen = hist
+    for _, bars in new.groupby("date"):
+        seen = pd.concat([seen, bars])
+        out = state.advance(bars, verify=seen)
+        assert set(state.columns) <= set(out.columns)
+    assert state.history.tolist() == [120, 70]
+    with pytest.raises(ValueError):
+        state.advance(new.iloc[[0]])
+
+
+def test_short_history_and_new_symbols_switch_to_carried_state():
+    full = _panel((("AAA", 60), ("NEW", 45)), seed=1)
+    early = full[full["symbol"] == "AAA"].iloc[:3]
+    state, _ = IndicatorState.from_history(early, NAMES)
+    seen = early
+    rest = full.drop(early.index)
+    for _, bars in rest.groupby("date"):
+        seen = pd.concat([seen, bars])
+        state.advance(bars, verify=seen)
+    assert state.symbols == ["AAA", "NEW"]
+
+
+def test_verify_detects_divergence():
+    full = _panel((("AAA", 80),), seed=2)
+    hist, new = _split(full, 1)
+    state, _ = IndicatorState.from_history(hist, ["ema_10"])
+    tampered = pd.concat([hist, new])
+    tampered.loc[tampered.index[10], "close"] += 5.0
+    with pytest.raises(ValueError, match="ema_10"):
+        state.advance(new, verify=tampered)
@@ -0,0 +1,114 @@
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.batch import run_scan_day, run_scan_range
+from backtest.batch.runner import _bound_history
+from backtest.indicators import batch
+from backtest.indicators.precompute import required_warmup
+
+NAMES = [
+    "sma_50",
+    "wma_30",
+    "ema_20",
+    "ema_200",
+    "rsi_14",
+    "adx_14",
+    "macd_12_26_9",
+    "bbl_20_2",
+    "cci_20",
+    "stochrsi_k_14_14_3_3",
+    "roc_10",
+]
+
+
+def _prices(n: int = 1500, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = np.abs(50 + rng.normal(0, 1, n).cumsum()) + 5
+    return pd.DataFrame(
+        {
+            "open": close,
+            "high": close + rng.random(n),
+            "low": close - rng.random(n),
+            "close": close,
+        },
+        index=pd.bdate_range("2018-01-01", periods=n),
+    )
+
+
+def test_declared_warmups():
+    assert batch.warmup(batch.parse_spec("sma_20")) == 20
+    assert batch.warmup(batch.parse_spec("cci_20")) == 40
+    ema = batch.warmup(batch.parse_spec("ema_20"), 1e-3)
+    assert 3 * 20 <= ema <= 4 * 20
+    assert batch.warmup(batch.parse_spec("ema_20"), 1e-6) > ema
+    assert required_warmup({"close", "sma", "sma_50", "rsi_14"}, 1e-3) == 94
+    assert required_warmup({"close", "foo_3"}) == 0
+
+
+@pytest.mark.parametrize("tol", [1e-3, 1e-5])
+def test_truncated_history_matches_full_within_tolerance(tol):
+    df = _prices()
+    start = 1200
+    full = batch.compute_panel(df, NAMES)
+    for name in NAMES:
+        spec = batch.parse_spec(name)
+        part = batch.compute_panel(df.iloc[start - batch.warmup(spec, tol) :], [name])
+        for col in spec.outputs:
+            got, ref = part[col].iloc[-300:], full[col].iloc[start:]
+            assert got.index.equals(ref.index)
+            err = np.nanmax(np.abs(got - ref))
+            if spec.kind in ("sma", "wma", "bbands", "cci", "roc"):
+                assert err == 0, col
+            else:
+                assert err <= tol * np.nanmax(np.abs(ref)), col
+
+
+def test_bound_history_per_symbol_and_one_bar_after_end():
+    wide = _prices(40)
+    day = wide.index[30]
+    out = _bound_history(wide, day, day, 5)
+    assert out.index[0] == wide.index[25] and out.index[-1] == wide.index[31]
+
+    a = wide.iloc[::2].assign(symbol="A")  # seyrek sembol
+    b = wide.assign(symbol="B")
+    long = pd.concat([a, b])
+    out = _bound_history(long, day, day, 3)
+    assert (out["symbol"] == "A").sum() == 3 + 1
+    assert (out["symbol"] == "B").sum() == 3 + 2
+
+
+def test_scan_day_with_lookback_matches_full_history(caplog):
+    df = _prices(1200, seed=4)
+    df.attrs["symbol"] = "SYM"
+    filters = pd.DataFrame(
+        {
+            "FilterCode": ["F1", "F2", "F3"],
+            "PythonQuery": [
+                "close > ema_50",
+                "cross_up(sma_10, sma_30)",
+                "rsi_14 > 50 and adx_14 > 15",
+            ],
+        }
+    )
+    for day in df.index[-40::7]:
+        day = str(day.date())
+        with caplog.at_level(logging.INFO, logger="runner"):
+            bounded = run_scan_day(df, day, filters, lookback_tol=1e-6)
+        assert bounded == run_scan_day(df, day, filters)
+    msg = [r.getMessage() for r in caplog.records if r.getMessage().startswith("LOOKBACK")][-1]
+    rows = int(msg.split("rows=")[1].split("/")[0])
+    assert rows < len(df) // 3
+
+
+def test_scan_range_lookback_tol_keeps_outputs(tmp_path):
+    df = _prices(600, seed=5)
+    df.attrs["symbol"] = "SYM"
+    filters = pd.DataFrame({"FilterCode": ["F1"], "PythonQuery": ["close > sma_20"]})
+    start, end = str(df.index[-30].date()), str(df.index[-1].date())
+    run_scan_range(df, start, end, filters, out_dir=str(tmp_path / "a"))
+    run_scan_range(df, start, end, filters, out_dir=str(tmp_path / "b"), lookback_tol=1e-4)
+    for p in sorted((tmp_path / "a").glob("*.csv")):
+        assert p.read_text() == (tmp_path / "b" / p.name).read_text()
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.io import PanelStore, write_panel_store
+
+
+def _long():
+    dates = pd.date_range("2024-01-01", periods=6, freq="B")
+    rows = []
+    for i, d in enumerate(dates):
+        rows.append({"date": d, "symbol": "BBB", "close": 20.0 + i, "volume": 100 + i})
+        if i % 2 == 0:
+            rows.append({"date": d, "symbol": "AAA", "close": 10.0 + i, "volume": 50 + i})
+    return pd.DataFrame(rows)
+
+
+def test_panel_store_roundtrip_and_windows(tmp_path: Path):
+    df = _long()
+    write_panel_store(df, tmp_path, dtype="float32")
+    store = PanelStore(tmp_path)
+    assert store.fields == ["close", "volume"]
+    assert list(store.symbols) == ["AAA", "BBB"]
+    assert store.shape == (6, 2)
+
+    close = store.matrix("close")
+    assert isinstance(close, np.memmap)
+    assert close.dtype == np.float32
+    assert np.isnan(close[1, 0]) and close[1, 1] == 21.0
+
+    win = store.window("close", "2024-01-02", "2024-01-04", symbols=["BBB"])
+    assert win[:, 0].tolist() == [21.0, 22.0, 23.0]
+    frame = store.frame("volume", start="2024-01-05")
+    assert list(frame.index) == list(store.dates[4:])
+    assert frame.loc[pd.Timestamp("2024-01-05"), "AAA"] == 54
+
+    back = store.to_long()
+    exp = df.sort_values(["date", "symbol"]).reset_index(drop=True)
+    assert len(back) == len(exp)
+    assert back["close"].tolist() == exp["close"].tolist()
+    assert back["symbol"].tolist() == exp["symbol"].tolist()
+
+    with pytest.raises(KeyError):
+        store.window("close", symbols=["ZZZ"])
+
+
+def test_panel_store_matrix_context(tmp_path: Path):
+    from backtest.dsl import MatrixEvaluator
+
+    write_panel_store(_long(), tmp_path)
+    store = PanelStore(tmp_path)
+    ctx = store.context(["close", "volume"], start="2024-01-03")
+    mask = MatrixEvaluator(ctx).eval_frame("close > 21 and volume > 0")
+    assert mask.shape == (4, 2)
+    assert mask["BBB"].tolist() == [True, True, True, True]
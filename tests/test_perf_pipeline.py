@@ -28,4 +28,4 @@ def test_precompute_chunk():
 def test_collect_indicators():
     df = pd.DataFrame({"PythonQuery": ["sma_20 > close", "rsi_14 < 30"]})
     out = collect_required_indicators(df)
-    assert "sma" in out and "rsi" in out
+    assert out == {"sma_20", "rsi_14", "close"}
@@ -0,0 +1,93 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+from backtest.batch import run_scan_range
+from backtest.indicators import batch
+from backtest.indicators.precompute import (
+    collect_required_indicators,
+    precompute_for_chunk,
+    requirement_report,
+)
+
+idx = pd.date_range("2024-01-01", periods=60, freq="B")
+
+
+def _df() -> pd.DataFrame:
+    rng = np.random.default_rng(3)
+    close = 20 + rng.normal(0, 1, len(idx)).cumsum()
+    df = pd.DataFrame(
+        {"open": close, "high": close + 1, "low": close - 1, "close": close}, index=idx
+    )
+    df.attrs["symbol"] = "SYM"
+    return df
+
+
+def _filters(*exprs: str) -> pd.DataFrame:
+    return pd.DataFrame(
+        {"FilterCode": [f"F{i}" for i in range(len(exprs))], "PythonQuery": list(exprs)}
+    )
+
+
+def test_collect_keeps_exact_parameters():
+    filters = _filters(
+        "SMA50 > EMA12 and rsi_7 < 30",
+        "cross_up(macd_12_26_9, macd_signal_12_26_9)",
+        "close > bbu_20_2 or stochrsik_14_14_3_3 > 0.8",
+    )
+    assert collect_required_indicators(filters) == {
+        "sma_50",
+        "ema_12",
+        "rsi_7",
+        "macd_12_26_9",
+        "macd_signal_12_26_9",
+        "close",
+        "bbu_20_2",
+        "stochrsi_k_14_14_3_3",
+    }
+
+
+def test_chunk_computes_exactly_the_required_set():
+    df = _df()
+    df["rsi_7"] = 50.0  # veriden gelen seri korunur
+    required = {"close", "sma_50", "rsi_7", "macd_signal_12_26_9", "plus_di_14", "foo_3"}
+    out = precompute_for_chunk(df, required)
+    added = set(out.columns) - set(df.columns)
+    assert added == {"sma_50", "macd_signal_12_26_9", "plus_di_14"}
+    assert (out["rsi_7"] == 50.0).all()
+    assert out.attrs["indicator_report"] == {
+        "provided": ["close", "rsi_7"],
+        "derived": ["macd_signal_12_26_9", "plus_di_14", "sma_50"],
+        "missing": ["foo_3"],
+    }
+    ref = batch.compute_panel(df, ["macd_12_26_9", "dmp_14"])
+    np.testing.assert_array_equal(out["plus_di_14"], ref["dmp_14"])
+    np.testing.assert_array_equal(out["macd_signal_12_26_9"], ref["macd_signal_12_26_9"])
+
+
+def test_report_marks_underivable_inputs_missing():
+    df = _df()[["close"]]
+    out = precompute_for_chunk(df, {"adx_14", "ema_5"})
+    assert out.attrs["indicator_report"]["missing"] == ["adx_14"]
+    assert requirement_report({"ema_5", "close"}, df.columns) == {
+        "provided": ["close"],
+        "derived": ["ema_5"],
+        "missing": [],
+    }
+
+
+def test_scan_uses_filter_parameters(tmp_path, caplog):
+    df = _df()
+    with caplog.at_level(logging.INFO, logger="runner"):
+        run_scan_range(
+            df,
+            str(idx[30].date()),
+            str(idx[-1].date()),
+            _filters("close > sma_30"),
+            out_dir=str(tmp_path),
+        )
+    assert any(r.getMessage() == "INDICATORS required=close,sma_30" for r in caplog.records)
+    hits = pd.concat(pd.read_csv(p) for p in sorted(tmp_path.glob("*.csv")))
+    above = (df["close"] > df["close"].rolling(30).mean()).iloc[30:]
+    assert set(pd.to_datetime(hits["date"])) == set(above[above].index)
@@ -0,0 +1,106 @@
+import json
+import os
+
+import pandas as pd
+
+from backtest.batch import run_scan_range
+from backtest.batch.manifest import filter_lookback
+from tests.test_batch_runner import _df_wide
+
+
+def _run(df, out, filters, **kw):
+    start, end = str(df.index[0].date()), str(df.index[-1].date())
+    run_scan_range(df, start, end, filters, out_dir=str(out), **kw)
+
+
+def _touched(out):
+    return sorted(p.stem for p in out.glob("*.csv") if p.stat().st_mtime_ns != 0)
+
+
+def _reset_mtimes(out):
+    for p in out.glob("*.csv"):
+        os.utime(p, ns=(0, 0))
+
+
+def test_filter_lookback():
+    assert filter_lookback("close > open") == 0
+    assert filter_lookback("cross_up(close, sma_20)") == 21
+    assert filter_lookback("close > bbu_20_2 and volume > 100") == 20
+    assert filter_lookback("rsi_14 < 30") is None
+
+
+def test_incremental_recomputes_only_stale_days(tmp_path):
+    df = _df_wide()
+    filters = pd.DataFrame(
+        {"FilterCode": ["UP", "X"], "PythonQuery": ["close > open", "cross_up(close, sma_20)"]}
+    )
+    out = tmp_path / "inc"
+    _run(df, out, filters, incremental=True)
+    assert len(list(out.glob("*.csv"))) == len(df)
+    assert (out / "run_manifest.json").exists()
+
+    _reset_mtimes(out)
+    _run(df, out, filters, incremental=True)
+    assert _touched(out) == []
+
+    # revise one bar: that day and the sma_20 + cross lookback after it are stale
+    df2 = df.copy()
+    df2.loc[df2.index[5], "AAA_close"] += 5
+    _reset_mtimes(out)
+    _run(df2, out, filters, incremental=True)
+    assert _touched(out) == [str(d.date()) for d in df2.index[5:27]]
+
+    full = tmp_path / "full"
+    _run(df2, full, filters)
+    for p in sorted(full.glob("*.csv")):
+        pd.testing.assert_frame_equal(pd.read_csv(out / p.name), pd.read_csv(p))
+
+    # a missing output file and a changed filter set are also detected
+    (out / f"{df.index[3].date()}.csv").unlink()
+    _reset_mtimes(out)
+    _run(df2, out, filters, incremental=True)
+    assert _touched(out) == [str(df.index[3].date())]
+    _reset_mtimes(out)
+    _run(df2, out, filters.assign(PythonQuery=["close < open", "close > sma_20"]), incremental=True)
+    assert len(_touched(out)) == len(df)
+
+
+def test_stale_days_counts_lookback_in_each_symbols_bars(tmp_path):
+    from backtest.batch.manifest import RunManifest
+
+    days = pd.bdate_range("2024-01-01", periods=10)
+    keys = [str(d.date()) for d in days]
+    # AAA her gün, BBB gün aşırı işlem görüyor
+    old = {"AAA": {k: "a" for k in keys}, "BBB": {k: "b" for k in keys[::2]}}
+    manifest = RunManifest(tmp_path)
+    manifest.update(old, "f", days, lookback=2)
+
+    new = {"AAA": old["AAA"], "BBB": dict(old["BBB"], **{keys[2]: "changed"})}
+    stale = manifest.stale_days(days, new, "f", lookback=2)
+    # BBB'nin değişen barı kendi iki barı boyunca (keys[4], keys[6]) etkili;
+    # birleşik takvimde sayılsaydı keys[4]'te biterdi
+    assert [str(d.date()) for d in stale] == keys[2:8]
+    assert list(manifest.stale_days(days, old, "f", lookback=2)) == []
+
+
+def test_incremental_parquet_checks_days_inside_month_file(tmp_path):
+    import pyarrow.parquet as pq
+
+    from backtest.batch.io import stored_signal_days
+
+    df = _df_wide()
+    filters = pd.DataFrame({"FilterCode": ["NONE"], "PythonQuery": ["close < 0"]})
+    out = tmp_path / "pq"
+    _run(df, out, filters, incremental=True, signal_format="parquet")
+    part = sorted((out / "signals").glob("part-*.parquet"))[0]
+    month_days = [str(d.date()) for d in df.index if d.strftime("%Y%m") == part.stem[5:]]
+    # isabetsiz günler de taranmış olarak kayıtlı
+    assert stored_signal_days(part) == set(month_days)
+
+    # ay dosyası var ama bir gün hiç yazılmamış (ör. yarıda kalan koşu)
+    table = pq.read_table(part)
+    missing = month_days[3]
+    kept = sorted(set(month_days) - {missing})
+    pq.write_table(table.replace_schema_metadata({b"scanned_days": json.dumps(kept)}), part)
+    _run(df, out, filters, incremental=True, signal_format="parquet")
+    assert stored_signal_days(part) == set(month_days)
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.screener import ScreenerPanel, run_screener
+
+
+def _panel_df():
+    rng = np.random.default_rng(7)
+    dates = pd.bdate_range("2024-01-01", periods=6)
+    rows = []
+    for sym in ["CCC", "AAA", "BBB"]:
+        for d in dates:
+            c = float(rng.uniform(5, 15))
+            bar = {"open": c, "high": c, "low": c, "close": c, "volume": 100}
+            rows.append({"symbol": sym, "date": d, **bar})
+    # symbol-major order: the panel has to re-group rows by date itself
+    return pd.DataFrame(rows)
+
+
+def test_panel_matches_run_screener_per_day(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    df = _panel_df()
+    filters = pd.DataFrame(
+        {"FilterCode": ["HI", "LO"], "PythonQuery": ["close > 10", "close <= 10"]}
+    )
+    panel = ScreenerPanel(df)
+    days = list(pd.bdate_range("2023-12-29", "2024-01-09"))
+    for d in days:
+        expected = run_screener(df, filters, d)
+        got = run_screener(panel, filters, d)
+        pd.testing.assert_frame_equal(got, expected)
+
+
+def test_panel_day_slice():
+    df = _panel_df()
+    panel = ScreenerPanel(df)
+    assert len(panel.dates) == 6
+    day = panel.day("2024-01-03 15:30")
+    assert list(day["symbol"]) == ["CCC", "AAA", "BBB"]
+    assert day.index.equals(pd.RangeIndex(3))
+    assert panel.day("2024-02-01").empty
+
+
+def test_panel_validates_columns():
+    with pytest.raises(ValueError, match="missing columns"):
+        ScreenerPanel(pd.DataFrame({"symbol": ["A"], "date": ["2024-01-02"]}))
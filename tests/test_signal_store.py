@@ -0,0 +1,76 @@
+import pandas as pd
+
+from backtest.batch import run_scan_range
+from backtest.batch.io import OutputWriter, SignalStore, read_signals
+from backtest.summary import load_signals_glob
+from tests.test_batch_runner import _df_wide
+
+
+def _filters():
+    return pd.DataFrame({"FilterCode": ["UP", "HI"], "PythonQuery": ["close > open", "close > 10"]})
+
+
+def _csv_signals(out_dir):
+    frames = [pd.read_csv(p) for p in sorted(out_dir.glob("*.csv"))]
+    df = pd.concat([f for f in frames if not f.empty], ignore_index=True)
+    df["date"] = pd.to_datetime(df["date"])
+    return df.sort_values(["date", "symbol", "filter_code"]).reset_index(drop=True)
+
+
+def test_parquet_store_matches_csv(tmp_path):
+    df = _df_wide()
+    start, end = str(df.index[0].date()), str(df.index[-1].date())
+    run_scan_range(df, start, end, _filters(), out_dir=str(tmp_path / "csv"))
+    run_scan_range(
+        df, start, end, _filters(), out_dir=str(tmp_path / "pq"), signal_format="parquet"
+    )
+    expected = _csv_signals(tmp_path / "csv")
+    assert not list((tmp_path / "pq").glob("*.csv"))
+    got = read_signals(tmp_path / "pq").astype({"symbol": str, "filter_code": str})
+    pd.testing.assert_frame_equal(got, expected, check_dtype=False)
+    loaded = load_signals_glob(tmp_path / "pq")
+    assert len(loaded) == len(expected)
+
+
+def test_store_rewrites_days_and_pushdown(tmp_path):
+    store = SignalStore(tmp_path, csv=True)
+    store.write_day("2024-01-31", [("AAA", "F1"), ("AAA", "F1")])
+    store.write_day("2024-02-01", [("AAA", "F1"), ("BBB", "F2")])
+    store.close()
+    assert sorted(p.name for p in (tmp_path / "signals").iterdir()) == [
+        "part-202401.parquet",
+        "part-202402.parquet",
+    ]
+    assert (tmp_path / "2024-02-01.csv").exists()
+
+    store = SignalStore(tmp_path)
+    store.write_day("2024-02-01", [("CCC", "F2")])
+    store.close()
+    out = read_signals(tmp_path, start="2024-02-01", filter_codes=["F2"])
+    assert out["symbol"].astype(str).tolist() == ["CCC"]
+    assert isinstance(out["filter_code"].dtype, pd.CategoricalDtype)
+    assert len(read_signals(tmp_path, end="2024-01-31")) == 1
+
+
+def test_load_signals_glob_picks_latest_or_requested_source(tmp_path):
+    import os
+
+    import pytest
+
+    store = SignalStore(tmp_path)
+    store.write_day("2024-01-02", [("OLD", "F1")])
+    store.close()
+    OutputWriter(tmp_path).write_day("2024-01-02", [("NEW", "F1")])
+    part = tmp_path / "signals" / "part-202401.parquet"
+    day = tmp_path / "2024-01-02.csv"
+    os.utime(part, ns=(1_000, 1_000))
+
+    # eski depo daha yeni CSV çıktısını gizlememeli
+    assert load_signals_glob(tmp_path)["symbol"].tolist() == ["NEW"]
+    assert load_signals_glob(tmp_path, source="parquet")["symbol"].tolist() == ["OLD"]
+
+    os.utime(day, ns=(0, 0))
+    assert load_signals_glob(tmp_path)["symbol"].tolist() == ["OLD"]
+    assert load_signals_glob(tmp_path, source="csv")["symbol"].tolist() == ["NEW"]
+    with pytest.raises(ValueError):
+        load_signals_glob(tmp_path, source="xlsx")
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backtest.downloader.core import DataDownloader  # noqa: E402
+from backtest.downloader.providers.stub import StubProvider  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="DataDownloader eşzamanlılık ölçümü (StubProvider)")
+    ap.add_argument("--symbols", type=int, default=500)
+    ap.add_argument("--latency", type=float, default=0.2, help="Çağrı başına yapay gecikme (s)")
+    ap.add_argument("--workers", default="1,8,32")
+    ap.add_argument("--start", default="2024-01-01")
+    ap.add_argument("--end", default="2024-03-31")
+    ap.add_argument("--out", default="artifacts/bench/downloader.json")
+    args = ap.parse_args(argv)
+
+    symbols = [f"SYM{i:04d}" for i in range(args.symbols)]
+    results = {"symbols": args.symbols, "latency": args.latency, "runs": {}}
+    for workers in (int(w) for w in args.workers.split(",")):
+        with tempfile.TemporaryDirectory() as tmp:
+            dl = DataDownloader(
+                StubProvider(latency=args.latency),
+                data_dir=Path(tmp) / "parquet",
+                manifest_path=Path(tmp) / "manifest.json",
+                workers=workers,
+            )
+            t0 = perf_counter()
+            dl.fetch_range(symbols, args.start, args.end)
+            results["runs"][str(workers)] = perf_counter() - t0
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
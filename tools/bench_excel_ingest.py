@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from backtest.data_loader import read_excels_long  # noqa: E402
+
+SRC = "data/Bist 100 Tarihsel Veriler13.xlsx"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Excel ingest: thread vs process karşılaştırması")
+    ap.add_argument("--src", default=SRC, help="Kopyalanacak kaynak çalışma kitabı")
+    ap.add_argument("--copies", type=int, default=8, help="Kaç kopya ile ölçülecek")
+    ap.add_argument("--workers", type=int, default=None)
+    ap.add_argument("--repeat", type=int, default=1)
+    ap.add_argument("--out", default="artifacts/bench/excel_ingest.json")
+    args = ap.parse_args(argv)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(args.copies):
+            shutil.copy(args.src, Path(tmp) / f"book_{i:03d}.xlsx")
+        cfg = {"data": {"excel_dir": tmp, "enable_cache": False}}
+        frames = {}
+        for mode in ("thread", "process"):
+            times = []
+            for _ in range(args.repeat):
+                t0 = perf_counter()
+                frames[mode] = read_excels_long(cfg, ingest=mode, workers=args.workers)
+                times.append(perf_counter() - t0)
+            results[mode] = {"best_sec": min(times), "rows": int(len(frames[mode]))}
+        results["identical"] = bool(frames["thread"].equals(frames["process"]))
+    results["speedup"] = results["thread"]["best_sec"] / max(results["process"]["best_sec"], 1e-9)
+    results.update({"src": args.src, "copies": args.copies, "workers": args.workers})
+
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    Path(args.out).write_text(json.dumps(results, indent=2), encoding="utf-8")
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
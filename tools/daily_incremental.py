@@ -18,11 +18,16 @@ CONFIG = os.getenv("CONFIG", "config/colab_config.yaml")
 now_tr = datetime.now(tz=IST)
 target = (now_tr - timedelta(days=DAYS_BACK)).date().isoformat()
 
-# Çıktı klasörü (tarihe göre)
+# Koşu kaydı klasörü (tarihe göre)
 OUTDIR = Path(f"artifacts/daily/{target}")
 OUTDIR.mkdir(parents=True, exist_ok=True)
 
-# Komut: sadece bir gün tarıyoruz
+# Sinyal çıktıları ve run_manifest.json sabit klasörde kalır; --incremental
+# önceki koşuların manifestini ancak böyle bulur
+SCAN_OUT = Path(os.getenv("SCAN_OUT", "artifacts/daily/signals"))
+SCAN_OUT.mkdir(parents=True, exist_ok=True)
+
+# Komut: sadece bir gün tarıyoruz; --incremental girdisi değişmemiş günü atlar
 CMD = [
     sys.executable,
     "-m",
@@ -34,6 +39,9 @@ CMD = [
     target,
     "--end",
     target,
+    "--out",
+    str(SCAN_OUT),
+    "--incremental",
 ]
 
 res = subprocess.run(CMD, capture_output=True, text=True)